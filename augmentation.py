@@ -0,0 +1,152 @@
+"""Randomized landmark augmentation for training data, in batched NumPy.
+
+A sample is one hand as 21 MediaPipe landmarks (x, y in 0..1 of the image,
+z depth relative to the wrist), i.e. one row of an ``(N, 63)`` dataset.
+``Augmenter`` draws one random transform per row and applies a whole batch
+with a handful of array operations:
+
+  rotation     in-plane, about the hand's centre, uniform within ±``rotation`` degrees
+  scale        about the hand's centre, uniform in ``scale``
+  translation  uniform within ±``translation`` of the frame, in x and y
+  depth        z multiplied by 1 ± ``depth_jitter``
+  mirror       x flipped about the hand's centre with probability ``mirror`` (left ↔ right hand)
+  noise        Gaussian with std ``noise`` on every coordinate
+
+``augment_store`` streams augmented chunks into a feature store, so the
+augmented set is never held in memory; ``train_gesture_model.py --augment``
+trains on it memory-mapped.
+
+    python augmentation.py gesture_data.csv gesture_data.aug.svds --copies 100
+    python -m benchmarks.bench_augment      # samples per second
+"""
+import argparse
+import time
+
+import numpy as np
+
+from feature_store import FeatureStoreWriter, load_dataset
+from landmark_features import NUM_FEATURES, NUM_LANDMARKS
+
+
+class Augmenter:
+    """Random hand transforms applied to ``(N, 63)`` batches (see the module docstring)."""
+
+    def __init__(self, rotation=15.0, scale=(0.85, 1.15), translation=0.05, depth_jitter=0.1,
+                 mirror=0.5, noise=0.004, seed=None):
+        if not 0 < scale[0] <= scale[1]:
+            raise ValueError(f"scale must be a range of positive factors, got {scale}")
+        if not 0 <= mirror <= 1:
+            raise ValueError(f"mirror is a probability, got {mirror}")
+        self.rotation = np.radians(rotation)
+        self.scale = scale
+        self.translation = translation
+        self.depth_jitter = depth_jitter
+        self.mirror = mirror
+        self.noise = noise
+        self.rng = np.random.default_rng(seed)
+
+    def __call__(self, features, out=None):
+        """Augmented copy of ``features`` (written into ``out``, which may be ``features`` itself)."""
+        features = np.asarray(features, dtype=np.float32).reshape(-1, NUM_FEATURES)
+        n = len(features)
+        if out is None:
+            out = np.empty((n, NUM_FEATURES), dtype=np.float32)
+        rows = out[:n]
+        points = features.reshape(n, NUM_LANDMARKS, 3)
+        result = rows.reshape(n, NUM_LANDMARKS, 3)
+        rng = self.rng
+
+        # Per-sample 2x2 linear part: mirror, then rotate and scale
+        angle = rng.uniform(-self.rotation, self.rotation, n)
+        scale = rng.uniform(self.scale[0], self.scale[1], n)
+        cos = (np.cos(angle) * scale).astype(np.float32)[:, None]
+        sin = (np.sin(angle) * scale).astype(np.float32)[:, None]
+        flip = np.where(rng.random(n, dtype=np.float32) < self.mirror,
+                        np.float32(-1), np.float32(1))[:, None]
+        depth = (1 + rng.uniform(-self.depth_jitter, self.depth_jitter, n)).astype(np.float32)
+
+        centre = points[:, :, :2].mean(axis=1)
+        target = centre + rng.uniform(-self.translation, self.translation, (n, 2)).astype(np.float32)
+        x = (points[:, :, 0] - centre[:, :1]) * flip
+        y = points[:, :, 1] - centre[:, 1:]
+        np.multiply(points[:, :, 2], depth[:, None], out=result[:, :, 2])
+        result[:, :, 0] = cos * x - sin * y + target[:, :1]
+        result[:, :, 1] = sin * x + cos * y + target[:, 1:]
+        if self.noise:
+            noise = rng.standard_normal((n, NUM_FEATURES), dtype=np.float32)
+            noise *= self.noise
+            rows += noise
+        return rows
+
+
+def augmented_chunks(X, y, rows, augmenter, chunk_rows=16384):
+    """``(features, labels)`` chunks adding up to ``rows`` augmented samples of ``(X, y)``.
+
+    Each chunk draws its source rows at random (so every chunk mixes all
+    classes) and reuses one buffer: consume a chunk before asking for the
+    next.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    buf = np.empty((chunk_rows, NUM_FEATURES), dtype=np.float32)
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        index = augmenter.rng.integers(0, len(X), n)
+        np.take(X, index, axis=0, out=buf[:n])
+        yield augmenter(buf[:n], out=buf), y[index]
+
+
+def augment_store(X, y, path, copies, augmenter, chunk_rows=16384, include_original=True):
+    """Write ``copies`` augmented samples per row (plus the originals) to a new store at ``path``.
+
+    Returns ``(rows written, seconds)``.
+    """
+    start = time.perf_counter()
+    with FeatureStoreWriter(path, NUM_FEATURES) as writer:
+        if writer.rows:
+            raise ValueError(f"{path} already holds {writer.rows} rows; augment into a new store")
+        if include_original:
+            writer.append_batch(X, y)
+        for features, labels in augmented_chunks(X, y, copies * len(X), augmenter, chunk_rows):
+            writer.append_batch(features, labels)
+        rows = writer.total_rows
+    return rows, time.perf_counter() - start
+
+
+def add_augment_args(parser):
+    """Transform ranges, shared by this CLI and train_gesture_model.py."""
+    parser.add_argument("--rotation", type=float, default=15.0, help="max in-plane rotation, degrees")
+    parser.add_argument("--scale", type=float, nargs=2, default=(0.85, 1.15), metavar=("MIN", "MAX"))
+    parser.add_argument("--translation", type=float, default=0.05, help="max shift, fraction of frame")
+    parser.add_argument("--depth-jitter", type=float, default=0.1, help="max relative change of z")
+    parser.add_argument("--mirror", type=float, default=0.5, help="probability of a left/right flip")
+    parser.add_argument("--noise", type=float, default=0.004, help="per-coordinate noise std")
+    parser.add_argument("--chunk-rows", type=int, default=16384,
+                        help="samples generated per chunk (small chunks stay in cache)")
+
+
+def create_augmenter(args, seed=None):
+    return Augmenter(args.rotation, tuple(args.scale), args.translation, args.depth_jitter,
+                     args.mirror, args.noise, seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("data", help="feature store or CSV with 63 features per row")
+    parser.add_argument("out", help="new feature store for the augmented set")
+    parser.add_argument("--copies", type=int, default=100, help="augmented samples per original")
+    parser.add_argument("--no-original", action="store_true", help="leave the originals out")
+    parser.add_argument("--seed", type=int)
+    add_augment_args(parser)
+    args = parser.parse_args()
+
+    X, y = load_dataset(args.data)
+    rows, seconds = augment_store(X, y, args.out, args.copies, create_augmenter(args, args.seed),
+                                  args.chunk_rows, include_original=not args.no_original)
+    print(f"✅ {rows} samples written to {args.out} in {seconds:.2f}s "
+          f"({args.copies * len(X) / seconds:,.0f} augmented samples/s)")
+
+
+if __name__ == "__main__":
+    main()
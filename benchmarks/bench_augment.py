@@ -0,0 +1,56 @@
+"""Throughput of landmark augmentation: samples per second by chunk size, and streamed to disk.
+
+    python -m benchmarks.bench_augment [--data gesture_data.csv] [--samples 1000000]
+
+The transform rows time ``Augmenter`` alone on chunks drawn from the
+dataset, with and without per-landmark noise (the Gaussian draw is the
+largest single cost). The last row runs ``augment_store``, i.e. sampling
+source rows, augmenting and appending every chunk to a feature store.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from augmentation import Augmenter, augment_store, augmented_chunks
+from feature_store import load_dataset
+
+
+def throughput(X, y, samples, chunk_rows, augmenter):
+    start = time.perf_counter()
+    for _ in augmented_chunks(X, y, samples, augmenter, chunk_rows):
+        pass
+    return samples / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="gesture_data.csv")
+    parser.add_argument("--samples", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    X, y = load_dataset(args.data)
+    print(f"{len(X)} source rows, {args.samples:,} augmented samples per run\n")
+    print(f"{'run':<34} {'samples/s':>12}")
+    for noise in (0.004, 0.0):
+        for chunk_rows in (1024, 16384, 65536, 262144):
+            rate = throughput(X, y, args.samples, chunk_rows, Augmenter(noise=noise, seed=0))
+            name = f"chunks of {chunk_rows}" + ("" if noise else ", no noise")
+            print(f"{name:<34} {rate:>12,.0f}")
+
+    tmp = tempfile.mkdtemp()
+    try:
+        copies = max(1, args.samples // len(X))
+        rows, seconds = augment_store(X, y, os.path.join(tmp, "aug.svds"), copies,
+                                      Augmenter(seed=0), include_original=False)
+        size = os.path.getsize(os.path.join(tmp, "aug.svds", "features.f32"))
+        print(f"{'augment_store → feature store':<34} {rows / seconds:>12,.0f}"
+              f"   ({rows:,} rows, {size / 2**20:.0f} MiB)")
+    finally:
+        shutil.rmtree(tmp)
+
+
+if __name__ == "__main__":
+    main()
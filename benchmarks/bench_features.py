@@ -0,0 +1,65 @@
+"""Microbenchmark: feature_extractor.extract_features vs landmark_features.
+
+    python -m benchmarks.bench_features [--hands 2] [--repeat 20000]
+"""
+import argparse
+import timeit
+
+import numpy as np
+
+from feature_extractor import extract_features
+from landmark_features import NUM_FEATURES, extract_batch, extract_into, normalize
+from benchmarks.synthetic import random_hands, random_points
+
+
+def bench(label, fn, repeat):
+    best = min(timeit.repeat(fn, number=repeat, repeat=5)) / repeat
+    print(f"{label:<46} {best * 1e6:8.2f} µs")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hands", type=int, default=2, help="hands per batch")
+    parser.add_argument("--frames", type=int, default=256, help="frames for the bulk test")
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    hand = random_hands(1)[0]
+    hands = random_hands(args.hands, seed=1)
+    frames = random_hands(args.frames, seed=2)
+    points = random_points(args.frames, seed=2)
+    row = np.empty(NUM_FEATURES, dtype=np.float32)
+    buf = np.empty((max(args.hands, args.frames), NUM_FEATURES), dtype=np.float32)
+
+    # Same values either way
+    assert np.allclose(extract_features(hand), extract_into(hand, row))
+
+    print("— one hand —")
+    old = bench("extract_features(h).reshape(1, -1)",
+                lambda: extract_features(hand).reshape(1, -1), args.repeat)
+    new = bench("extract_into(h, buf)", lambda: extract_into(hand, row), args.repeat)
+    print(f"{'speedup':<46} {old / new:8.2f}x")
+
+    print(f"— {args.hands} hands —")
+    old = bench("[extract_features(h) for h] + vstack",
+                lambda: np.vstack([extract_features(h) for h in hands]), args.repeat)
+    new = bench("extract_batch(hands, out=buf)",
+                lambda: extract_batch(hands, out=buf), args.repeat)
+    print(f"{'speedup':<46} {old / new:8.2f}x")
+
+    repeat = max(1, args.repeat // args.frames)
+    print(f"— {args.frames} frames —")
+    old = bench("[extract_features(h) for h] + vstack",
+                lambda: np.vstack([extract_features(h) for h in frames]), repeat)
+    new = bench("extract_batch(frames, out=buf)",
+                lambda: extract_batch(frames, out=buf), repeat)
+    print(f"{'speedup':<46} {old / new:8.2f}x")
+    bench("extract_batch(ndarray, out=buf)", lambda: extract_batch(points, out=buf), repeat)
+    bench("extract_batch(frames, normalized=True)",
+          lambda: extract_batch(frames, out=buf, normalized=True), repeat)
+    bench("normalize(buf, out=buf)", lambda: normalize(buf, out=buf), repeat)
+
+
+if __name__ == "__main__":
+    main()
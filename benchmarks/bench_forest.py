@@ -0,0 +1,58 @@
+"""Side-by-side latency of sklearn predict vs the compiled flat-array forest.
+
+    python forest_compiler.py export
+    python -m benchmarks.bench_forest [--model gesture_classifier.pkl] [--compiled gesture_classifier.npz]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from compiled_forest import CompiledForest
+from forest_compiler import load_dataset, load_model
+
+
+def percentiles(fn, rows, repeat):
+    times = []
+    for i in range(repeat):
+        row = rows[i % len(rows)]
+        start = time.perf_counter()
+        fn(row)
+        times.append(time.perf_counter() - start)
+    return np.percentile(np.array(times) * 1e6, [50, 95, 99])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="gesture_classifier.pkl")
+    parser.add_argument("--compiled", default="gesture_classifier.npz")
+    parser.add_argument("--data", default="gesture_data.csv")
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    compiled = CompiledForest.load(args.compiled)
+    X, _ = load_dataset(args.data)
+    X = np.asarray(X, dtype=np.float32)
+    rows = [X[i:i + 1] for i in range(len(X))]
+
+    assert (np.asarray(model.predict(X)).astype(str) == compiled.predict(X)).all()
+
+    print(f"{'single row (µs)':<28} {'p50':>10} {'p95':>10} {'p99':>10}")
+    sk = percentiles(model.predict, rows, args.repeat)
+    cf = percentiles(compiled.predict, rows, args.repeat * 10)
+    print(f"{'sklearn predict':<28} {sk[0]:10.1f} {sk[1]:10.1f} {sk[2]:10.1f}")
+    print(f"{'compiled predict':<28} {cf[0]:10.1f} {cf[1]:10.1f} {cf[2]:10.1f}")
+    print(f"{'p50 speedup':<28} {sk[0] / cf[0]:10.1f}x")
+
+    print(f"\n{'batch of ' + str(len(X)) + ' rows (ms)':<28}")
+    for label, fn in (("sklearn predict", model.predict), ("compiled predict", compiled.predict)):
+        start = time.perf_counter()
+        for _ in range(10):
+            fn(X)
+        print(f"{label:<28} {(time.perf_counter() - start) / 10 * 1e3:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Update time vs dataset size: full 100-tree retrain vs incremental grow_forest.
+
+    python -m benchmarks.bench_incremental [--sizes 1000,10000,50000] [--new 200] [--add-trees 20]
+
+Datasets of each size are synthesized by jittering gesture_data.csv rows.
+
+The second table adds a gesture the model has never seen: each class in
+turn is left out of the old data and arrives only in the update. It
+compares that class's recall after a full retrain with incremental
+updates adding ``--new-class-trees`` trees.
+"""
+import argparse
+import copy
+
+import numpy as np
+
+from feature_store import load_dataset
+from incremental_training import grow_forest, timed
+
+
+def synthesize(X, y, n, rng, noise=0.01):
+    rows = rng.integers(0, len(X), n)
+    return X[rows] + rng.normal(0, noise, (n, X.shape[1])).astype(np.float32), y[rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", default="gesture_data.csv")
+    parser.add_argument("--sizes", default="1000,5000,20000")
+    parser.add_argument("--new", type=int, default=200, help="new samples per update")
+    parser.add_argument("--add-trees", type=int, default=20)
+    parser.add_argument("--trees", type=int, default=100, help="trees in the full model")
+    parser.add_argument("--new-class-size", type=int, default=5000,
+                        help="old rows in the new-gesture scenario")
+    parser.add_argument("--new-class-trees", default="20,50,100",
+                        help="trees added per update in the new-gesture scenario")
+    args = parser.parse_args()
+
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y = load_dataset(args.data)
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y).astype(str)
+    rng = np.random.default_rng(0)
+
+    print(f"{'rows':>10} {'full retrain s':>16} {'incremental s':>15} {'speedup':>9} "
+          f"{'full acc':>9} {'incr acc':>9}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        X_old, y_old = synthesize(X, y, n, rng)
+        X_new, y_new = synthesize(X, y, args.new, rng, noise=0.02)
+        X_test, y_test = synthesize(X, y, 2000, rng, noise=0.02)
+
+        base = RandomForestClassifier(n_estimators=args.trees, random_state=42).fit(X_old, y_old)
+
+        full = RandomForestClassifier(n_estimators=args.trees, random_state=42)
+        _, full_s = timed(full.fit, np.concatenate([X_old, X_new]), np.concatenate([y_old, y_new]))
+
+        grown, incr_s = timed(grow_forest, copy.deepcopy(base), X_old, y_old, X_new, y_new,
+                              n_trees=args.add_trees, random_state=0)
+
+        full_acc = (full.predict(X_test) == y_test).mean()
+        incr_acc = (grown.predict(X_test) == y_test).mean()
+        print(f"{n + args.new:>10} {full_s:>16.2f} {incr_s:>15.2f} {full_s / incr_s:>8.1f}x "
+              f"{full_acc:>9.3f} {incr_acc:>9.3f}")
+
+    # === New gesture: recall of a class the base model never saw ===
+    tree_counts = [int(s) for s in args.new_class_trees.split(",")]
+    print(f"\nRecall of a new gesture ({args.new} samples) added to {args.new_class_size} old rows")
+    print(f"{'new class':>10} {'full':>7}" + "".join(f"{f'+{t} trees':>11}" for t in tree_counts))
+    for gesture in np.unique(y):
+        seen = y != gesture
+        X_old, y_old = synthesize(X[seen], y[seen], args.new_class_size, rng)
+        X_new, y_new = synthesize(X[~seen], y[~seen], args.new, rng, noise=0.02)
+        X_test, _ = synthesize(X[~seen], y[~seen], 1000, rng, noise=0.02)
+
+        base = RandomForestClassifier(n_estimators=args.trees, random_state=42).fit(X_old, y_old)
+        full = RandomForestClassifier(n_estimators=args.trees, random_state=42)
+        full.fit(np.concatenate([X_old, X_new]), np.concatenate([y_old, y_new]))
+        row = f"{gesture:>10} {(full.predict(X_test) == gesture).mean():>7.3f}"
+        for t in tree_counts:
+            grown = grow_forest(copy.deepcopy(base), X_old, y_old, X_new, y_new,
+                                n_trees=t, random_state=0)
+            row += f"{(grown.predict(X_test) == gesture).mean():>11.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
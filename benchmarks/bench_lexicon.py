@@ -0,0 +1,88 @@
+"""Simulated text entry: letters per minute in word/phrase mode with and without word prediction.
+
+    python -m benchmarks.bench_lexicon [--lexicon lexicon.svlx] [--words 500] [--text sample.txt]
+
+Models the scanning selector as the sessions run it: letters scroll forward
+one per ``--scroll`` seconds, a fist confirms after ``--reaction`` seconds
+and confirmations are at least ``--cooldown`` apart. After a letter the
+scroll resumes from where it stopped. With prediction, the user takes a
+suggestion (``--hold`` seconds of an accept pose) as soon as the target word
+is among the offered ones; in word mode only words of the declared length
+are offered. Target words are drawn from the lexicon by Zipf frequency, or
+taken from ``--text``. Also reports how long ``Lexicon.complete`` takes.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from lexicon import Lexicon
+from scanning import LETTERS
+
+
+def entry_time(word, lexicon, args, mode):
+    """Seconds to enter ``word`` and the number of confirmations it took."""
+    t = 0.0
+    last_confirm = -args.cooldown
+    index = 0
+    for typed in range(len(word)):
+        if lexicon is not None and typed:
+            length = len(word) if mode == "word" else None
+            suggestions = lexicon.complete(word[:typed], args.suggestions, length)
+            if word in suggestions:
+                t = max(t + args.reaction + args.hold, last_confirm + args.cooldown)
+                return t, typed + 1
+        steps = (LETTERS.index(word[typed]) - index) % len(LETTERS)
+        t = max(t + steps * args.scroll + args.reaction, last_confirm + args.cooldown)
+        last_confirm = t
+        index = LETTERS.index(word[typed])
+    return t, len(word)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lexicon", default="lexicon.svlx")
+    parser.add_argument("--words", type=int, default=500, help="target words drawn from the lexicon")
+    parser.add_argument("--text", help="type the words of this file instead")
+    parser.add_argument("--suggestions", type=int, default=3)
+    parser.add_argument("--scroll", type=float, default=1.0, help="seconds per letter of scroll")
+    parser.add_argument("--reaction", type=float, default=0.4, help="seconds to make a fist")
+    parser.add_argument("--hold", type=float, default=0.6, help="seconds an accept pose is held")
+    parser.add_argument("--cooldown", type=float, default=1.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lexicon = Lexicon(args.lexicon)
+    if args.text:
+        with open(args.text) as f:
+            targets = [w.upper() for w in f.read().split() if w.isascii() and w.isalpha()]
+    else:
+        ranks = np.arange(1, lexicon.n_words + 1)
+        rng = random.Random(args.seed)
+        ids = rng.choices(range(lexicon.n_words), weights=1 / ranks, k=args.words)
+        targets = [lexicon.word(i) for i in ids]
+    letters = sum(len(w) for w in targets)
+
+    print(f"{len(targets)} words, {letters} letters, {args.suggestions} suggestions\n")
+    print(f"{'':<22} {'letters/min':>12} {'s/word':>8} {'confirms/word':>14}")
+    for mode in ("word", "phrase"):
+        for name, lex in (("no prediction", None), ("prediction", lexicon)):
+            results = [entry_time(w, lex, args, mode) for w in targets]
+            seconds = sum(r[0] for r in results)
+            confirms = sum(r[1] for r in results)
+            print(f"{mode + ', ' + name:<22} {letters / seconds * 60:>12.1f} "
+                  f"{seconds / len(targets):>8.1f} {confirms / len(targets):>14.2f}")
+
+    prefixes = [w[:i] for w in targets for i in range(1, len(w) + 1)]
+    start = time.perf_counter()
+    for prefix in prefixes:
+        lexicon.complete(prefix, args.suggestions)
+    per_call = (time.perf_counter() - start) / len(prefixes)
+    print(f"\nLexicon.complete: {per_call * 1e6:.1f} µs per call ({len(prefixes)} prefixes, "
+          f"{lexicon.n_words} words, {lexicon.n_nodes} nodes)")
+
+
+if __name__ == "__main__":
+    main()
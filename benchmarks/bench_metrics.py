@@ -0,0 +1,78 @@
+"""Microbenchmark: what runtime metrics cost per frame, off, on, and on with tracing.
+
+    python -m benchmarks.bench_metrics [--frames 20000] [--hands 1]
+
+Replays the hooks one frame goes through in sign_to_speech (capture,
+detect, classify, session and display timers, one confidence sample per
+hand, the per-frame counters) and reports the cost as µs per frame and as a
+share of a 33 ms (30 FPS) frame. "off" is the ``metrics is not None`` checks
+the loops keep when no metrics flag is given. Also fetches ``/metrics`` from
+a live endpoint and times a snapshot.
+"""
+import argparse
+import os
+import tempfile
+import time
+import urllib.request
+
+from metrics import Metrics, TraceWriter, serve_metrics
+
+STAGES = ("capture", "detect", "classify", "session", "display")
+FRAME_TIME = 1 / 30
+
+
+def run_frames(metrics, frames, hands):
+    hand_list = [object()] * hands
+    start = time.perf_counter()
+    for seq in range(frames):
+        for stage in STAGES:
+            t0 = time.perf_counter() if metrics is not None else None
+            if t0 is not None:
+                metrics.timed(stage, t0, seq=seq)
+        if metrics is not None:
+            for _ in hand_list:
+                metrics.observe("confidence", 0.9)
+            metrics.frame(hand_list, 0.02)
+            if seq % 60 == 0:
+                metrics.event("letter", "A")
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--hands", type=int, default=1)
+    args = parser.parse_args()
+
+    baseline = run_frames(None, args.frames, args.hands)
+    metrics = Metrics()
+    enabled = run_frames(metrics, args.frames, args.hands)
+    traced = Metrics()
+    path = os.path.join(tempfile.mkdtemp(), "trace.json")
+    writer = TraceWriter(path)
+    traced.add_span_hook(writer)
+    tracing = run_frames(traced, args.frames, args.hands)
+    writer.close()
+
+    print(f"{'metrics':<18} {'µs/frame':>9} {'% of 33 ms':>11}")
+    for name, seconds in (("off", baseline), ("on", enabled), ("on + --trace", tracing)):
+        print(f"{name:<18} {seconds * 1e6:>9.2f} {seconds / FRAME_TIME * 100:>10.3f}%")
+
+    metrics.snapshot()  # the first call pays numpy's percentile setup
+    start = time.perf_counter()
+    snap = metrics.snapshot()
+    print(f"\nsnapshot: {(time.perf_counter() - start) * 1e3:.2f} ms "
+          f"({len(snap['histograms'])} histograms, window {metrics.window})")
+    server = serve_metrics(metrics, 0)
+    url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+    with urllib.request.urlopen(url) as response:
+        body = response.read().decode()
+    server.shutdown()
+    print(f"GET /metrics: {len(body.splitlines())} lines, e.g.")
+    for line in body.splitlines()[:3]:
+        print("   ", line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Microbenchmark: per-frame HUD rendering, putText every frame vs the cached TextLayer.
+
+    python -m benchmarks.bench_overlay [--frames 2000] [--change-every 30]
+
+``--change-every`` is how many frames the HUD text stays the same (a letter
+scrolls once a second at 30 FPS); the cached layer is rebuilt on each change.
+Also times skeleton drawing: mediapipe-style per-edge ``line`` calls vs one
+``polylines`` call.
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic import random_hands
+from overlay import HAND_CONNECTIONS, TextLayer, draw_hand
+
+
+def hud_lines(i, change_every):
+    letter = chr(ord("A") + (i // change_every) % 26)
+    return [(f"Current: {letter}", (10, 60), 2, (0, 255, 0), 2),
+            (f"Word: CAT{letter}", (10, 130), 1.2, (255, 255, 0), 2),
+            ("Remaining: 2", (10, 170), 1, (100, 255, 255), 2)]
+
+
+def put_text(frame, lines):
+    for text, org, scale, color, thickness in lines:
+        cv2.putText(frame, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+
+
+def draw_lines(frame, handLms):
+    height, width = frame.shape[:2]
+    pixels = [(int(lm.x * width), int(lm.y * height)) for lm in handLms.landmark]
+    for a, b in HAND_CONNECTIONS:
+        cv2.line(frame, pixels[a], pixels[b], (224, 224, 224), 2)
+    for p in pixels:
+        cv2.circle(frame, p, 2, (0, 0, 255), 2)
+
+
+def per_frame(fn, frames):
+    start = time.perf_counter()
+    for i in range(frames):
+        fn(i)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--change-every", type=int, default=30)
+    args = parser.parse_args()
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    lines = [hud_lines(i, args.change_every) for i in range(args.frames)]
+    layer = TextLayer()
+    hand = random_hands(1)[0]
+
+    rows = [
+        ("putText per frame", per_frame(lambda i: put_text(frame, lines[i]), args.frames)),
+        ("TextLayer", per_frame(lambda i: layer.draw(frame, lines[i]), args.frames)),
+        ("skeleton, line per edge", per_frame(lambda i: draw_lines(frame, hand), args.frames)),
+        ("skeleton, polylines", per_frame(lambda i: draw_hand(frame, hand), args.frames)),
+    ]
+    print(f"{'renderer':<26} {'µs/frame':>9}")
+    for name, seconds in rows:
+        print(f"{name:<26} {seconds * 1e6:>9.1f}")
+    print(f"TextLayer rebuilds: {layer.rebuilds} of {args.frames} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Microbenchmark: hand-pose evaluation per hand, old per-landmark is_fist vs hand_pose.
+
+    python -m benchmarks.bench_poses [--batches 1 2 64 1024]
+
+The old test reads landmark attributes one by one and gives one pose for one
+hand. PoseEngine works on an ``(N, 21, 3)`` array: small batches (one frame,
+one or two hands) pay numpy call overhead, large ones (datasets, the server's
+cross-session batches) are far cheaper per hand and get every pose at once.
+"""
+import argparse
+import time
+
+from benchmarks.synthetic import random_hands
+from hand_pose import FIST, POSES, hand_points
+
+
+def legacy_is_fist(landmarks):
+    tips_ids = [4, 8, 12, 16, 20]
+    folded = 0
+    for i in range(1, 5):
+        if landmarks[tips_ids[i]].y > landmarks[tips_ids[i] - 2].y:
+            folded += 1
+    if landmarks[4].x < landmarks[3].x:
+        folded += 1
+    return folded >= 4
+
+
+def per_hand(fn, n, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / (repeat * n)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batches", type=int, nargs="+", default=[1, 2, 64, 1024])
+    parser.add_argument("--hands", type=int, default=20000, help="hands evaluated per measurement")
+    args = parser.parse_args()
+
+    print(f"{'batch':>6} {'legacy is_fist':>15} {'fist (array)':>13} {'fist (objects)':>15} "
+          f"{'all poses':>10}   µs/hand")
+    for n in args.batches:
+        hands = random_hands(n)
+        points = hand_points(hands)
+        repeat = max(1, args.hands // n)
+        legacy = per_hand(lambda: [legacy_is_fist(h.landmark) for h in hands], n, repeat)
+        fist = per_hand(lambda: FIST.matrix(points), n, repeat)
+        objects = per_hand(lambda: FIST.matrix(hand_points(hands)), n, repeat)
+        every = per_hand(lambda: POSES.matrix(points), n, repeat)
+        print(f"{n:>6} {legacy * 1e6:>15.2f} {fist * 1e6:>13.2f} {objects * 1e6:>15.2f} "
+              f"{every * 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
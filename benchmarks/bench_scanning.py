@@ -0,0 +1,100 @@
+"""Headless scanning simulator: mean time to enter a corpus of words with each scanning strategy.
+
+    python -m benchmarks.bench_scanning [--words 300] [--text corpus.txt] [--groups 6] [--suggestions 3]
+
+Drives a real SignSession (word mode, one word at a time) on a simulated
+clock with a simulated user: a fist ``--reaction`` seconds after the target
+letter (or the row holding it) is highlighted, and ``c`` ``--reaction``
+seconds after a confirmation when the A–Z loop waits for it. With
+``--suggestions`` the user also takes a suggested word once it has been on
+screen for reaction + hold time. Target words are drawn from the lexicon by
+Zipf frequency, or taken from ``--text``.
+"""
+import argparse
+import contextlib
+import io
+import random
+
+from lexicon import Lexicon
+from scanning import make_scanner
+from sign_modes import SignSession
+
+
+def type_word(word, scanner, lexicon, args):
+    """Simulated seconds and selections (fists and accepted suggestions) to enter ``word``."""
+    # Start the clock past the confirm cooldown of a fresh session
+    start = t = args.cooldown + 1.0
+    session = SignSession("word", len(word), scroll_interval=args.scroll,
+                          confirm_cooldown=args.cooldown, now=start, scanner=scanner,
+                          lexicon=lexicon if args.suggestions else None,
+                          suggestion_count=args.suggestions)
+    session.next_letter()
+    dt = 1.0 / args.fps
+    highlighted, since = None, t
+    offered, offered_since = [], t
+    selections = 0
+    while not session.finished and t - start < args.limit:
+        session.begin_frame(t)
+        if session.current_letter != highlighted:
+            highlighted, since = session.current_letter, t
+        if session.suggestions != offered:
+            offered, offered_since = session.suggestions, t
+        target = word[len(session.full_result)]
+        if word in offered and t - offered_since >= args.reaction + args.hold:
+            session.accept_suggestion(offered.index(word), t)
+            selections += 1
+        elif target in highlighted and t - since >= args.reaction \
+                and t - session.last_confirm_time > session.confirm_cooldown:
+            session.on_hand(None, now=t, fist=True)
+            selections += 1
+        elif (not session.auto_scroll and not scanner.restart
+              and t - session.last_confirm_time >= args.reaction):
+            session.on_key(ord('c'), t)
+        t += dt
+    return t - start, selections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lexicon", default="lexicon.svlx")
+    parser.add_argument("--words", type=int, default=300, help="target words drawn from the lexicon")
+    parser.add_argument("--text", help="type the words of this file instead")
+    parser.add_argument("--groups", type=int, default=6, help="row size for row-column scanning")
+    parser.add_argument("--suggestions", type=int, default=0, help="also offer word completions")
+    parser.add_argument("--scroll", type=float, default=1.0, help="seconds per scan step")
+    parser.add_argument("--reaction", type=float, default=0.4)
+    parser.add_argument("--hold", type=float, default=0.6)
+    parser.add_argument("--cooldown", type=float, default=1.5)
+    parser.add_argument("--fps", type=float, default=20)
+    parser.add_argument("--limit", type=float, default=600, help="give up on a word after this long")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lexicon = Lexicon(args.lexicon)
+    if args.text:
+        with open(args.text) as f:
+            targets = [w.upper() for w in f.read().split() if w.isascii() and w.isalpha()]
+    else:
+        rng = random.Random(args.seed)
+        ids = rng.choices(range(lexicon.n_words),
+                          weights=[1 / (i + 1) for i in range(lexicon.n_words)], k=args.words)
+        targets = [lexicon.word(i) for i in ids]
+    letters = sum(len(w) for w in targets)
+
+    print(f"{len(targets)} words, {letters} letters, {args.scroll:g}s per step"
+          f"{f', {args.suggestions} suggestions' if args.suggestions else ''}\n")
+    print(f"{'strategy':<24} {'s/word':>8} {'s/letter':>9} {'letters/min':>12} {'selects/word':>13}")
+    for strategy in ("alphabet", "frequency", "predictive"):
+        for groups in (0, args.groups):
+            scanner = make_scanner(strategy, lexicon, groups)
+            with contextlib.redirect_stdout(io.StringIO()):
+                results = [type_word(w, scanner, lexicon, args) for w in targets]
+            seconds = sum(r[0] for r in results)
+            name = strategy + (f", rows of {groups}" if groups else "")
+            print(f"{name:<24} {seconds / len(targets):>8.1f} {seconds / letters:>9.2f} "
+                  f"{letters / seconds * 60:>12.1f} {sum(r[1] for r in results) / len(targets):>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
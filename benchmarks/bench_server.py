@@ -0,0 +1,196 @@
+"""Load generator for sign_server.py: replay recorded streams from N concurrent clients.
+
+    python -m benchmarks.bench_server --replay session.svlm [--sessions 1 2 4 8] [--mode gesture]
+    python -m benchmarks.bench_server --video clip.mp4 --sessions 1 2 4     # MediaPipe in the pool
+    python -m benchmarks.bench_server --replay session.svlm --port 8765     # an already running server
+
+Every client streams the recording ``--loops`` times over its own socket
+and asks for per-frame acks. By default clients send as fast as the server
+accepts, which measures throughput (latency then includes time spent queued
+in the socket); ``--realtime`` sends at the recorded frame rate, which
+measures latency. The report shows aggregate frames/s, per-session frames/s,
+ack latency and, for the in-process server, how many frames each dispatch
+batch and each ``predict`` call covered.
+"""
+import argparse
+import contextlib
+import io
+import json
+import socket
+import threading
+import time
+
+import numpy as np
+
+from landmark_io import encode_header, encode_record, make_result, read_header, read_records
+
+
+def landmark_payload(path, loops):
+    """Header and per-frame records of a recording, repeated ``loops`` times."""
+    with open(path, "rb") as f:
+        data = f.read()
+    stream = io.BytesIO(data)
+    read_header(stream, path)
+    records = list(read_records(stream))
+    duration = records[-1][0] - records[0][0] + 1 / 30 if records else 0
+    frames = []
+    for loop in range(loops):
+        for t, key, points, labels in records:
+            t = t + loop * duration
+            frames.append((t, encode_record(t, make_result(points, labels), key)))
+    return encode_header(), frames
+
+
+def frame_payload(path, loops, max_frames=300):
+    """JPEG-encoded frames of a video in the server's frame-record layout."""
+    import cv2
+    from sign_server import FRAME_RECORD
+    cap = cv2.VideoCapture(path)
+    jpegs = []
+    while len(jpegs) < max_frames:
+        success, frame = cap.read()
+        if not success:
+            break
+        jpegs.append((cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0,
+                      cv2.imencode(".jpg", frame)[1].tobytes()))
+    cap.release()
+    frames = []
+    duration = len(jpegs) / 30.0
+    for loop in range(loops):
+        for t, jpeg in jpegs:
+            t = t + loop * duration
+            frames.append((t, FRAME_RECORD.pack(t, 255, len(jpeg)) + jpeg))
+    return b"", frames
+
+
+def run_client(host, port, hello, header, frames, realtime, out):
+    sock = socket.create_connection((host, port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    reader = sock.makefile("rb")
+    sent = {}
+    latencies = []
+    closed = {}
+
+    def read_events():
+        for line in reader:
+            event = json.loads(line)
+            if event["event"] == "ack":
+                latencies.append(time.perf_counter() - sent.pop(event["seq"]))
+            elif event["event"] in ("closed", "error"):
+                closed.update(event)
+                return
+
+    thread = threading.Thread(target=read_events, daemon=True)
+    thread.start()
+    sock.sendall((json.dumps(hello) + "\n").encode() + header)
+    start = time.perf_counter()
+    t0 = frames[0][0] if frames else 0
+    try:
+        for seq, (t, record) in enumerate(frames, 1):
+            if realtime:
+                delay = (t - t0) - (time.perf_counter() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            sent[seq] = time.perf_counter()
+            sock.sendall(record)
+    except OSError:
+        pass  # the server ended the session (finished word/phrase or 'q')
+    sock.shutdown(socket.SHUT_WR)
+    thread.join()
+    out.append({"seconds": time.perf_counter() - start, "frames": len(latencies),
+                "latencies": latencies, "closed": closed})
+    sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--replay", help="landmark recording (.svlm) streamed by every client")
+    source.add_argument("--video", help="video file streamed as JPEG frames by every client")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--loops", type=int, default=5, help="times each client repeats the stream")
+    parser.add_argument("--mode", choices=["letter", "word", "phrase", "gesture"], default="letter",
+                        help="session mode (default letter, which never finishes early)")
+    parser.add_argument("--count", type=int, default=3)
+    parser.add_argument("--realtime", action="store_true", help="send at the recorded frame rate")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="use a running server instead of an in-process one")
+    parser.add_argument("--workers", type=int, help="in-process server: MediaPipe workers")
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args()
+
+    if args.replay:
+        header, frames = landmark_payload(args.replay, args.loops)
+        kind = "landmarks"
+    else:
+        header, frames = frame_payload(args.video, args.loops)
+        kind = "frames"
+
+    server = None
+    port = args.port
+    quiet = contextlib.nullcontext()
+    if port is None:
+        from compiled_forest import load_classifier
+        from sign_server import RecognitionServer, serve_socket
+        server = RecognitionServer(load_classifier()[0], args.workers)
+        tcp = serve_socket(server, args.host, 0)
+        port = tcp.server_address[1]
+        threading.Thread(target=server.run, name="dispatcher", daemon=True).start()
+        quiet = contextlib.redirect_stdout(io.StringIO())  # sessions print every confirmation
+
+    print(f"{'sessions':>8} {'frames':>8} {'total fps':>10} {'fps/session':>12} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'per batch':>10} {'per predict':>12}")
+    rows = []
+    for n in args.sessions:
+        before = server.stats() if server else None
+        results = []
+        hello = {"mode": args.mode, "count": args.count, "kind": kind, "ack": True}
+        clients = [threading.Thread(target=run_client,
+                                    args=(args.host, port, dict(hello, name=f"client-{i}"),
+                                          header, frames, args.realtime, results))
+                   for i in range(n)]
+        start = time.perf_counter()
+        with quiet:
+            for c in clients:
+                c.start()
+            for c in clients:
+                c.join()
+        elapsed = time.perf_counter() - start
+
+        total = sum(r["frames"] for r in results)
+        latencies = np.concatenate([r["latencies"] for r in results]) * 1000 \
+            if total else np.zeros(1)
+        row = {
+            "sessions": n,
+            "frames": total,
+            "fps": round(total / elapsed, 1),
+            "fps_per_session": round(float(np.mean([r["frames"] / r["seconds"]
+                                                     for r in results])), 1),
+            "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+            "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        }
+        if server:
+            after = server.stats()
+            batches = after["batches"] - before["batches"]
+            calls = after["predict_calls"] - before["predict_calls"]
+            row["frames_per_batch"] = round((after["frames"] - before["frames"]) / batches, 2) \
+                if batches else None
+            row["predict_calls"] = calls
+            row["frames_per_predict"] = round((after["frames"] - before["frames"]) / calls, 2) \
+                if calls else None
+        rows.append(row)
+        print(f"{n:>8} {total:>8} {row['fps']:>10.1f} {row['fps_per_session']:>12.1f} "
+              f"{row['p50_ms']:>8.3f} {row['p95_ms']:>8.3f} "
+              f"{row.get('frames_per_batch') or '-':>10} {row.get('frames_per_predict') or '-':>12}")
+
+    if server:
+        server.stop()
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"source": args.replay or args.video, "mode": args.mode, "results": rows},
+                      f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
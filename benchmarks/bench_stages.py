@@ -0,0 +1,272 @@
+"""Per-stage latency benchmark: p50/p95/p99, throughput and peak memory per stage.
+
+    python -m benchmarks.bench_stages                          # synthetic input from gesture_data.csv
+    python -m benchmarks.bench_stages --video clip.mp4         # + decode / cvtColor / hands.process
+    python -m benchmarks.bench_stages --replay session.svlm    # landmarks from a recording
+    python -m benchmarks.bench_stages --model gesture_classifier.pkl --model rf:10 --model rf:100
+    python -m benchmarks.bench_stages --out run.json --compare baseline.json
+
+Stages that need something unavailable (MediaPipe, a video, a display) are
+reported as skipped. ``--model rf:N`` trains an N-tree forest on the dataset
+on the fly, so classifier variants can be compared in one run.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.synthetic import FakeHand
+from feature_extractor import extract_features
+from hand_pose import FIST, POSES, hand_points
+from landmark_features import NUM_FEATURES, extract_into
+
+FRAME_SIZE = (480, 640, 3)
+
+
+def measure(fn, inputs, repeat):
+    """Time ``fn(x)`` per input, then one more pass under tracemalloc for peak memory."""
+    times = np.empty(repeat)
+    n = len(inputs)
+    for i in range(repeat):
+        x = inputs[i % n]
+        start = time.perf_counter()
+        fn(x)
+        times[i] = time.perf_counter() - start
+
+    tracemalloc.start()
+    for i in range(min(repeat, n)):
+        fn(inputs[i])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    us = times * 1e6
+    return {
+        "n": repeat,
+        "mean_us": round(float(us.mean()), 2),
+        "p50_us": round(float(np.percentile(us, 50)), 2),
+        "p95_us": round(float(np.percentile(us, 95)), 2),
+        "p99_us": round(float(np.percentile(us, 99)), 2),
+        "throughput_per_s": round(float(repeat / times.sum()), 1),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+# === Inputs ===
+def dataset_hands(path, limit):
+    import pandas as pd
+    X = pd.read_csv(path).drop('label', axis=1).to_numpy(dtype=np.float32)[:limit]
+    return [FakeHand(row.reshape(21, 3)) for row in X]
+
+
+def replay_hands(path, limit):
+    from landmark_io import read_landmarks
+    hands = []
+    for _, _, result in read_landmarks(path):
+        hands.extend(result.multi_hand_landmarks or [])
+        if len(hands) >= limit:
+            break
+    return hands[:limit]
+
+
+def video_frames(path, limit):
+    import cv2
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while len(frames) < limit:
+        success, frame = cap.read()
+        if not success:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def load_classifier(spec, data_path):
+    """``path.pkl`` / ``path.npz`` / ``rf:N`` (N-tree forest trained on ``data_path``)."""
+    if spec.startswith("rf:"):
+        import pandas as pd
+        from sklearn.ensemble import RandomForestClassifier
+        df = pd.read_csv(data_path)
+        model = RandomForestClassifier(n_estimators=int(spec[3:]), random_state=42)
+        model.fit(df.drop('label', axis=1).to_numpy(dtype=np.float32), df['label'])
+        return model
+    if spec.endswith(".npz"):
+        from compiled_forest import CompiledForest
+        return CompiledForest.load(spec)
+    import pickle
+    with open(spec, "rb") as f:
+        return pickle.load(f)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# === Stages ===
+def run_stages(args):
+    stages = {}
+    skipped = {}
+
+    def stage(name, fn, inputs):
+        if not inputs:
+            skipped[name] = "no input"
+            return
+        stages[name] = measure(fn, inputs, args.repeat)
+        print(f"{name:<34} p50 {stages[name]['p50_us']:>10.1f} µs   "
+              f"p95 {stages[name]['p95_us']:>10.1f}   p99 {stages[name]['p99_us']:>10.1f}   "
+              f"{stages[name]['throughput_per_s']:>10.0f}/s   peak {stages[name]['peak_kib']} KiB")
+
+    # Frame stages
+    try:
+        import cv2
+    except ImportError:
+        cv2 = None
+        skipped["decode"] = skipped["cvtColor"] = skipped["overlay"] = "OpenCV not installed"
+
+    frames = []
+    if cv2 is not None:
+        if args.video:
+            cap = cv2.VideoCapture(args.video)
+
+            def decode(_):
+                if not cap.read()[0]:  # loop short clips
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+            stage("decode", decode, [None])
+            cap.release()
+            frames = video_frames(args.video, args.frames)
+        else:
+            skipped["decode"] = "no --video"
+            rng = np.random.default_rng(0)
+            frames = [rng.integers(0, 256, FRAME_SIZE, dtype=np.uint8) for _ in range(4)]
+        stage("cvtColor", lambda f: cv2.cvtColor(f, cv2.COLOR_BGR2RGB), frames)
+
+    hands_graph = None
+    if args.video:
+        try:
+            from frame_io import create_hands
+            hands_graph, mp_hands, mp_draw = create_hands()
+        except (ImportError, AttributeError) as e:
+            skipped["hands.process"] = f"MediaPipe unavailable ({e})"
+    elif "hands.process" not in skipped:
+        skipped["hands.process"] = "no --video"
+    if hands_graph is not None:
+        rgb = [cv2.cvtColor(f, cv2.COLOR_BGR2RGB) for f in frames]
+        stage("hands.process", hands_graph.process, rgb)
+
+    # Landmark stages
+    if args.replay:
+        hands = replay_hands(args.replay, args.frames)
+    else:
+        hands = dataset_hands(args.data, args.frames)
+    row = np.empty(NUM_FEATURES, dtype=np.float32)
+    stage("extract_features", lambda h: extract_features(h).reshape(1, -1), hands)
+    stage("extract_into", lambda h: extract_into(h, row), hands)
+    stage("fist pose", lambda h: FIST.matrix(hand_points([h])), hands)
+    stage("all poses", lambda h: POSES.matrix(hand_points([h])), hands)
+
+    features = [extract_features(h).reshape(1, -1).astype(np.float32) for h in hands]
+    for spec in args.model:
+        model = load_classifier(spec, args.data)
+        stage(f"predict[{spec}]", model.predict, features)
+
+    # Overlay / display
+    if cv2 is not None and frames:
+        canvas = frames[0].copy()
+
+        def overlay(_):
+            cv2.putText(canvas, "Current: A", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 2)
+            cv2.putText(canvas, "Word: HELLO", (10, 130), cv2.FONT_HERSHEY_SIMPLEX, 1.2,
+                        (255, 255, 0), 2)
+            if hands_graph is not None:
+                mp_draw.draw_landmarks(canvas, hand_result, mp_hands.HAND_CONNECTIONS)
+
+        hand_result = None
+        if hands_graph is not None:
+            result = hands_graph.process(cv2.cvtColor(frames[0], cv2.COLOR_BGR2RGB))
+            if result.multi_hand_landmarks:
+                hand_result = result.multi_hand_landmarks[0]
+            else:
+                hands_graph = None
+        stage("overlay", overlay, [None])
+
+        if args.display:
+            def display(f):
+                cv2.imshow("bench_stages", f)
+                cv2.waitKey(1)
+            stage("display", display, frames)
+            cv2.destroyAllWindows()
+        else:
+            skipped["display"] = "no --display"
+
+    return stages, skipped
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["stages"]
+    print(f"\n{'stage':<34} {'base p50':>10} {'p50':>10} {'change':>8}")
+    for name, stats in current.items():
+        if name not in baseline:
+            continue
+        before, after = baseline[name]["p50_us"], stats["p50_us"]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{name:<34} {before:>10.1f} {after:>10.1f} {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--video", help="video file for decode/cvtColor/hands.process/overlay")
+    parser.add_argument("--replay", help="landmark recording (.svlm) instead of synthetic hands")
+    parser.add_argument("--data", default="gesture_data.csv",
+                        help="dataset for synthetic hands and rf:N models")
+    parser.add_argument("--model", action="append",
+                        help="classifier: .pkl, .npz or rf:N (repeatable)")
+    parser.add_argument("--frames", type=int, default=200, help="distinct inputs per stage")
+    parser.add_argument("--repeat", type=int, default=1000, help="timed calls per stage")
+    parser.add_argument("--display", action="store_true", help="also time cv2.imshow + waitKey")
+    parser.add_argument("--label", default="", help="free-form run label stored in the output")
+    parser.add_argument("--out", help="write results as JSON")
+    parser.add_argument("--compare", help="previous --out file to compare p50s against")
+    args = parser.parse_args()
+    if not args.model:
+        args.model = ["gesture_classifier.pkl"]
+        if os.path.exists("gesture_classifier.npz"):
+            args.model.append("gesture_classifier.npz")
+
+    stages, skipped = run_stages(args)
+    for name, reason in skipped.items():
+        print(f"{name:<34} skipped: {reason}")
+
+    report = {
+        "label": args.label,
+        "commit": git_revision(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "input": args.video or args.replay or f"synthetic:{args.data}",
+        "stages": stages,
+        "skipped": skipped,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Saved {args.out}")
+    if args.compare:
+        compare(stages, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Microbenchmark: incremental WindowFeatures vs recomputing the whole window each frame.
+
+    python -m benchmarks.bench_temporal [--windows 10 30 60 120] [--frames 3000]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from landmark_features import NUM_FEATURES
+from temporal_features import WINDOW_FEATURES, WindowFeatures, window_features
+
+
+def per_frame(fn, frames):
+    start = time.perf_counter()
+    for i in range(len(frames)):
+        fn(i)
+    return (time.perf_counter() - start) / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--windows", type=int, nargs="+", default=[10, 30, 60, 120])
+    parser.add_argument("--frames", type=int, default=3000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = rng.random((args.frames, NUM_FEATURES)).astype(np.float32)
+    times = np.arange(args.frames) / 30.0
+    out = np.empty(WINDOW_FEATURES, dtype=np.float32)
+
+    print(f"{'window':>6} {'incremental':>14} {'recompute':>12} {'speedup':>8}")
+    for w in args.windows:
+        win = WindowFeatures(w)
+
+        def incremental(i):
+            win.push(frames[i], times[i])
+            win.features(out=out)
+
+        def recompute(i):
+            lo = max(0, i - w + 1)
+            window_features(frames[lo:i + 1], times[lo:i + 1])
+
+        fast = per_frame(incremental, frames)
+        slow = per_frame(recompute, frames)
+        print(f"{w:>6} {fast * 1e6:>11.1f} µs {slow * 1e6:>9.1f} µs {slow / fast:>7.1f}x")
+    print(f"(a 30 FPS camera leaves {1e6 / 30:.0f} µs per frame)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import numpy as np
+
+
+class FakeLandmark:
+    """Stand-in for a MediaPipe NormalizedLandmark (x, y, z attributes only)."""
+
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class FakeHand:
+    """Stand-in for a MediaPipe NormalizedLandmarkList (``handLms``)."""
+
+    def __init__(self, points):
+        self.landmark = [FakeLandmark(float(x), float(y), float(z)) for x, y, z in points]
+
+
+def random_points(n, seed=0):
+    """``(n, 21, 3)`` float32 landmark arrays roughly shaped like a hand in the frame."""
+    rng = np.random.default_rng(seed)
+    base = rng.uniform(0.3, 0.7, size=(n, 1, 3)).astype(np.float32)
+    base[:, :, 2] = 0.0
+    offsets = rng.normal(0.0, 0.08, size=(n, 21, 3)).astype(np.float32)
+    offsets[:, 0, :] = 0.0
+    return base + offsets
+
+
+def random_hands(n, seed=0):
+    return [FakeHand(points) for points in random_points(n, seed)]
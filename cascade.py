@@ -0,0 +1,250 @@
+"""Two-stage gesture classifier: a tiny linear model first, the forest only when it is unsure.
+
+Most frames show a clear, well-separated pose that a multinomial logistic
+regression over the wrist-relative features (``landmark_features.normalize``)
+gets right. Its softmax costs one ``(63, classes)`` matrix product. Rows whose
+top probability reaches ``threshold``, and which lie within the training
+spread of that class, take the linear model's answer. The rest fall through
+to the full forest's ``predict_proba``. The first stage is saved as
+``gesture_cascade.npz`` and needs only NumPy at runtime.
+
+    python cascade.py fit [--data gesture_data.csv] [--threshold 0.9]
+    python cascade.py evaluate [--data gesture_data.csv] [--folds 5]
+    python sign_to_speech.py --mode gesture --cascade [--cascade-threshold 0.95]
+
+``evaluate`` cross-validates both stages for a range of thresholds. For each
+threshold it reports the fall-through rate and the accuracy of the cascade
+next to the forest alone, then the mean per-frame latency of the deployed
+classifier with and without the cascade.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from landmark_features import normalize
+
+CASCADE_FILE = "gesture_cascade.npz"
+THRESHOLDS = (0.5, 0.7, 0.8, 0.9, 0.95, 0.98, 0.99)
+
+
+class LinearStage:
+    """Softmax over ``normalize(X) @ weights + bias``: a logistic regression in plain NumPy.
+
+    A softmax is confident far away from anything it was trained on, so the
+    stage also keeps each class's centroid and ``radius`` (the spread of its
+    training samples). A hand outside the radius of its predicted class is
+    reported as unfamiliar and left to the forest.
+    """
+
+    def __init__(self, weights, bias, classes, centroids, radius):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = np.asarray(bias, dtype=np.float32)
+        self.classes_ = np.asarray(classes)
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.radius = np.asarray(radius, dtype=np.float32)
+
+    @classmethod
+    def fit(cls, X, y, C=10.0, spread=99.0, margin=1.25):
+        """Fit on ``(X, y)``; ``radius`` is ``margin`` × the ``spread`` percentile distance."""
+        from sklearn.linear_model import LogisticRegression
+        Z = normalize(X)
+        y = np.asarray(y)
+        model = LogisticRegression(C=C, max_iter=5000).fit(Z, y)
+        weights, bias = model.coef_.T, model.intercept_
+        if len(model.classes_) == 2:
+            # sklearn keeps one column for binary problems; softmax needs both
+            weights = np.hstack([-weights / 2, weights / 2])
+            bias = np.array([-bias[0] / 2, bias[0] / 2])
+        centroids = np.stack([Z[y == c].mean(axis=0) for c in model.classes_])
+        radius = [margin * np.percentile(np.linalg.norm(Z[y == c] - centroid, axis=1), spread)
+                  for c, centroid in zip(model.classes_, centroids)]
+        return cls(weights, bias, model.classes_, centroids, radius)
+
+    def save(self, path=CASCADE_FILE, threshold=0.9):
+        np.savez(path, weights=self.weights, bias=self.bias, classes=self.classes_.astype(str),
+                 centroids=self.centroids, radius=self.radius, threshold=threshold)
+
+    def evaluate(self, X):
+        """``(proba, familiar)``: class probabilities and whether each row is inside its class radius."""
+        Z = normalize(X)
+        scores = Z @ self.weights
+        scores += self.bias
+        best = scores.argmax(axis=1)
+        scores -= scores[np.arange(len(best)), best][:, None]
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        Z -= self.centroids[best]
+        familiar = np.einsum("ij,ij->i", Z, Z) <= self.radius[best] ** 2
+        return scores, familiar
+
+    def predict_proba(self, X):
+        return self.evaluate(X)[0]
+
+
+class GestureCascade:
+    """``predict`` / ``predict_proba`` / ``classes_`` like the forest it wraps, so it drops in for it.
+
+    ``frames`` and ``fallthrough`` count the rows seen and the rows the forest
+    had to score.
+    """
+
+    def __init__(self, first, model, threshold=0.9):
+        if not np.array_equal(np.asarray(first.classes_).astype(str),
+                              np.asarray(model.classes_).astype(str)):
+            raise ValueError(f"Cascade classes {list(first.classes_)} don't match the model's "
+                             f"{list(model.classes_)}; refit it with cascade.py fit")
+        if not 0 <= threshold <= 1:
+            raise ValueError(f"threshold is a probability, got {threshold}")
+        self.first = first
+        self.model = model
+        self.threshold = threshold
+        self.classes_ = model.classes_
+        self.n_features_in_ = first.weights.shape[0]
+        self.frames = 0
+        self.fallthrough = 0
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32).reshape(-1, self.n_features_in_)
+        proba, familiar = self.first.evaluate(X)
+        unsure = (proba.max(axis=1) < self.threshold) | ~familiar
+        n_unsure = int(unsure.sum())
+        self.frames += len(X)
+        self.fallthrough += n_unsure
+        if n_unsure == len(X):
+            return self.model.predict_proba(X)
+        if n_unsure:
+            proba[unsure] = self.model.predict_proba(X[unsure])
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+    @property
+    def fallthrough_rate(self):
+        return self.fallthrough / self.frames if self.frames else 0.0
+
+    def stats(self):
+        return {"frames": self.frames, "fallthrough": self.fallthrough,
+                "fallthrough_rate": round(self.fallthrough_rate, 3), "threshold": self.threshold}
+
+
+def load_cascade(model, path=CASCADE_FILE, threshold=None):
+    """``model`` wrapped in the cascade saved at ``path`` (``threshold`` overrides the saved one)."""
+    with np.load(path, allow_pickle=False) as data:
+        first = LinearStage(data["weights"], data["bias"], data["classes"], data["centroids"],
+                            data["radius"])
+        saved = float(data["threshold"])
+    return GestureCascade(first, model, saved if threshold is None else threshold)
+
+
+def add_cascade_args(parser):
+    parser.add_argument("--cascade", action="store_true",
+                        help="gesture mode: answer confident frames with the linear first stage "
+                             f"in {CASCADE_FILE} and only run the forest on the rest")
+    parser.add_argument("--cascade-threshold", type=float,
+                        help="first-stage probability needed to skip the forest "
+                             "(default: the one saved by cascade.py fit)")
+
+
+def wrap_model(model, args):
+    """The cascade around ``model`` if ``--cascade`` was given and can be loaded, else ``model``."""
+    if not args.cascade or model is None:
+        return model
+    try:
+        cascade = load_cascade(model, threshold=args.cascade_threshold)
+    except FileNotFoundError:
+        print(f"⚠️ No {CASCADE_FILE}; build it with cascade.py fit. Using the forest alone")
+        return model
+    print(f"🪜 Cascade on: forest only below {cascade.threshold:.2f} first-stage confidence")
+    return cascade
+
+
+# === Evaluation ===
+def cross_validate(X, y, folds, thresholds):
+    """Out-of-fold forest and first-stage predictions, summarized per threshold."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import StratifiedKFold
+    forest_ok = np.zeros(len(y), dtype=bool)
+    first_ok = np.zeros(len(y), dtype=bool)
+    confidence = np.zeros(len(y))
+    for train, test in StratifiedKFold(folds, shuffle=True, random_state=0).split(X, y):
+        # Same forest as train_gesture_model.py
+        forest = RandomForestClassifier(n_estimators=100, random_state=42).fit(X[train], y[train])
+        forest_ok[test] = forest.predict(X[test]) == y[test]
+        first = LinearStage.fit(X[train], y[train])
+        proba, familiar = first.evaluate(X[test])
+        first_ok[test] = first.classes_[proba.argmax(axis=1)] == y[test]
+        confidence[test] = np.where(familiar, proba.max(axis=1), 0.0)
+    rows = []
+    for threshold in thresholds:
+        sure = confidence >= threshold
+        rows.append({"threshold": threshold, "fallthrough": float(1 - sure.mean()),
+                     "accuracy": float(np.where(sure, first_ok, forest_ok).mean()),
+                     "forest_accuracy": float(forest_ok.mean())})
+    return rows
+
+
+def frame_latency(model, X):
+    """Mean seconds per single-row ``predict`` over the rows of ``X`` (the per-frame call)."""
+    X = np.asarray(X, dtype=np.float32)
+    model.predict(X[:1])
+    start = time.perf_counter()
+    for i in range(len(X)):
+        model.predict(X[i:i + 1])
+    return (time.perf_counter() - start) / len(X)
+
+
+def main():
+    from compiled_forest import load_classifier
+    from feature_store import load_dataset
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["fit", "evaluate"])
+    parser.add_argument("--data", help="feature store or CSV "
+                                       "(default gesture_data.svds if present, else gesture_data.csv)")
+    parser.add_argument("--threshold", type=float, default=0.9,
+                        help="fit: first-stage probability saved as the default (default 0.9)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--out", default=CASCADE_FILE)
+    args = parser.parse_args()
+    data_path = args.data or ("gesture_data.svds" if os.path.isdir("gesture_data.svds")
+                              else "gesture_data.csv")
+    X, y = load_dataset(data_path)
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y).astype(str)
+
+    if args.command == "fit":
+        first = LinearStage.fit(X, y)
+        model, source = load_classifier()
+        if model is not None:
+            GestureCascade(first, model, args.threshold)  # raises if the classes don't match
+        first.save(args.out, args.threshold)
+        print(f"✅ Saved {args.out}: {X.shape[1]}×{len(first.classes_)} linear first stage, "
+              f"threshold {args.threshold}")
+        return
+
+    print(f"📂 {len(y)} samples from {data_path}, {args.folds}-fold cross-validation\n")
+    print(f"{'threshold':>9} {'fall-through':>13} {'cascade acc':>12} {'forest acc':>11}")
+    for row in cross_validate(X, y, args.folds, THRESHOLDS):
+        print(f"{row['threshold']:>9.2f} {row['fallthrough']:>12.1%} {row['accuracy']:>12.3f} "
+              f"{row['forest_accuracy']:>11.3f}")
+
+    model, source = load_classifier()
+    if model is None:
+        return
+    try:
+        cascade = load_cascade(model, args.out)
+    except FileNotFoundError:
+        print(f"\nNo {args.out} yet; run cascade.py fit to time the deployed cascade")
+        return
+    alone = frame_latency(model, X)
+    cascaded = frame_latency(cascade, X)
+    print(f"\nPer frame on {source}: forest {alone * 1e6:.1f} µs, cascade {cascaded * 1e6:.1f} µs "
+          f"at threshold {cascade.threshold:.2f} ({cascade.fallthrough_rate:.1%} fell through)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,25 @@
+import argparse
 import cv2
-import mediapipe as mp
+from feature_store import open_writer
+from frame_io import FrameIO, add_source_args
+from landmark_features import NUM_FEATURES, extract_into
 import numpy as np
-import pandas as pd
-from feature_extractor import extract_features
 
-# Setup MediaPipe Hands
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1)
-mp_draw = mp.solutions.drawing_utils
+parser = argparse.ArgumentParser(description="Collect A–Z hand sign data")
+parser.add_argument("--out", default="hand_data.svds",
+                    help="feature store to append to, or a .csv file (default hand_data.svds)")
+add_source_args(parser)
+args = parser.parse_args()
 
-# Setup camera
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
+# Setup camera / replay (MediaPipe Hands is created on the first live frame)
+io = FrameIO(args, "Collect Hand Sign Data")
+if not io.isOpened():
     print("❌ Error: Cannot access camera.")
     exit()
 
-# CSV data list
-data = []
-labels = []
+# Samples go straight to disk instead of piling up in memory
+writer = open_writer(args.out)
+features = np.empty(NUM_FEATURES, dtype=np.float32)
 
 print("🔡 Press a key A–Z to start recording that letter.")
 print("⏹ Press 's' to stop recording that letter.")
@@ -26,27 +28,19 @@ print("💾 Press 'q' to save and exit.")
 current_label = None
 recording = False
 
-while True:
-    success, frame = cap.read()
-    if not success:
-        break
-
-    img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(img_rgb)
+for packet in io.frames():
+    frame = packet.frame
 
-    if result.multi_hand_landmarks:
-        for handLms in result.multi_hand_landmarks:
-            mp_draw.draw_landmarks(frame, handLms, mp_hands.HAND_CONNECTIONS)
+    for handLms in packet.hands:
+        io.draw_landmarks(frame, handLms)
 
-            if recording and current_label is not None:
-                features = extract_features(handLms)
-                data.append(features)
-                labels.append(current_label)
+        if recording and current_label is not None:
+            writer.append(extract_into(handLms, features), current_label)
+            if not io.headless:
                 cv2.putText(frame, f"Recording: {current_label}", (10, 70),
                             cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 2)
 
-    cv2.imshow("Collect Hand Sign Data", frame)
-    key = cv2.waitKey(1) & 0xFF
+    key = io.show(packet)
 
     if key == ord('q'):
         break
@@ -59,11 +53,6 @@ while True:
         recording = True
         print(f"🎬 Started recording for: {current_label}")
 
-cap.release()
-cv2.destroyAllWindows()
-
-# Save to CSV
-df = pd.DataFrame(data)
-df['label'] = labels
-df.to_csv("hand_data.csv", index=False)
-print("✅ Saved hand_data.csv")
+writer.close()
+io.close({"samples": writer.total_rows})
+print(f"✅ Saved {args.out}")
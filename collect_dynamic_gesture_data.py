@@ -1,47 +1,44 @@
 # collect_dynamic_gesture_data.py
-import cv2
-import mediapipe as mp
-import csv
-import os
-import time
-from feature_extractor import extract_features
+import argparse
+import numpy as np
+from feature_store import open_writer
+from frame_io import FrameIO, add_source_args
+from landmark_features import NUM_FEATURES, extract_into
 
 GESTURES = ['hello', 'ok', 'stop', 'love', 'done']
 
-# Create CSV file
-with open('gesture_data.csv', 'w', newline='') as f:
-    writer = csv.writer(f)
-    writer.writerow(['label'] + [f'f{i}' for i in range(63)])  # 21 landmarks * 3 coords
+parser = argparse.ArgumentParser(description="Capture a fixed number of frames (--frames) per gesture")
+parser.add_argument("--out", default="gesture_data.svds",
+                    help="feature store to append to, or a .csv file (default gesture_data.svds)")
+parser.add_argument("--frames", type=int, default=100, help="frames per gesture (default 100)")
+add_source_args(parser)
+args = parser.parse_args()
 
-    cap = cv2.VideoCapture(0)
-    mp_hands = mp.solutions.hands
-    hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1)
-    mp_draw = mp.solutions.drawing_utils
+# Append-only feature store (21 landmarks * 3 coords per row)
+features = np.empty(NUM_FEATURES, dtype=np.float32)
+with open_writer(args.out) as writer:
+    io = FrameIO(args, "Collecting Gesture")
+    frames = io.frames()
 
     for gesture in GESTURES:
         print(f"\n✋ Show gesture: {gesture}")
-        input("👉 Press Enter when ready...")
+        if not io.headless:
+            input("👉 Press Enter when ready...")
 
         count = 0
-        while count < 100:  # Capture 100 frames per gesture
-            success, frame = cap.read()
-            if not success:
-                continue
-
-            img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            result = hands.process(img_rgb)
-
-            if result.multi_hand_landmarks:
-                for handLms in result.multi_hand_landmarks:
-                    mp_draw.draw_landmarks(frame, handLms, mp_hands.HAND_CONNECTIONS)
-                    features = extract_features(handLms)
-                    writer.writerow([gesture] + features.tolist())
-                    count += 1
-                    print(f"Captured {count}/100", end="\r")
-
-            cv2.imshow("Collecting Gesture", frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+        while count < args.frames:  # Capture --frames frames (default 100) per gesture
+            packet = next(frames, None)
+            if packet is None:
                 break
+            frame = packet.frame
 
-    cap.release()
-    cv2.destroyAllWindows()
+            for handLms in packet.hands:
+                io.draw_landmarks(frame, handLms)
+                writer.append(extract_into(handLms, features), gesture)
+                count += 1
+                print(f"Captured {count}/{args.frames}", end="\r")
+
+            if io.show(packet) == ord('q'):
+                break
+
+    io.close()
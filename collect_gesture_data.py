@@ -1,17 +1,20 @@
-import cv2
-import mediapipe as mp
-import csv
-import os
+import argparse
+import numpy as np
+from feature_store import open_writer
+from frame_io import FrameIO, add_source_args
+from landmark_features import NUM_FEATURES, extract_into
 
 GESTURES = ["hello", "stop", "ok", "love", "done"]
-DATA_FILE = "gesture_dataset.csv"
+DATA_FILE = "gesture_dataset.svds"
 
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1)
-mp_draw = mp.solutions.drawing_utils
+parser = argparse.ArgumentParser(description="Collect gesture samples on key press")
+parser.add_argument("--out", default=DATA_FILE,
+                    help=f"feature store to append to, or a .csv file (default {DATA_FILE})")
+add_source_args(parser)
+args = parser.parse_args()
 
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
+io = FrameIO(args, "Gesture Collector")
+if not io.isOpened():
     print("❌ Camera not available")
     exit()
 
@@ -21,43 +24,31 @@ for i, g in enumerate(GESTURES):
 print("💾 Press 's' to save dataset")
 print("❌ Press 'q' to quit\n")
 
-all_data = []
+writer = open_writer(args.out)
+features = np.empty(NUM_FEATURES, dtype=np.float32)
 
-while True:
-    success, frame = cap.read()
-    if not success:
-        break
-
-    img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(img_rgb)
+for packet in io.frames():
+    frame = packet.frame
+    result = packet.result
 
-    if result.multi_hand_landmarks:
-        for handLms in result.multi_hand_landmarks:
-            mp_draw.draw_landmarks(frame, handLms, mp_hands.HAND_CONNECTIONS)
+    for handLms in packet.hands:
+        io.draw_landmarks(frame, handLms)
 
-    cv2.imshow("Gesture Collector", frame)
-    key = cv2.waitKey(1) & 0xFF
+    key = io.show(packet)
 
     if key in [ord(str(i+1)) for i in range(len(GESTURES))]:
         gesture = GESTURES[int(chr(key)) - 1]
         if result.multi_hand_landmarks:
             for handLms in result.multi_hand_landmarks:
-                row = [gesture]
-                for lm in handLms.landmark:
-                    row.extend([lm.x, lm.y, lm.z])
-                all_data.append(row)
+                writer.append(extract_into(handLms, features), gesture)
                 print(f"✅ Captured: {gesture}")
 
     elif key == ord('s'):
-        with open(DATA_FILE, "w", newline="") as f:
-            writer = csv.writer(f)
-            header = ["label"] + [f"f{i}" for i in range(len(all_data[0])-1)]
-            writer.writerow(header)
-            writer.writerows(all_data)
-        print(f"💾 Saved to {DATA_FILE}")
+        writer.flush()
+        print(f"💾 Saved to {args.out}")
 
     elif key == ord('q'):
         break
 
-cap.release()
-cv2.destroyAllWindows()
+writer.close()
+io.close({"samples": writer.total_rows})
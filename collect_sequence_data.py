@@ -0,0 +1,65 @@
+# collect_sequence_data.py
+import argparse
+import numpy as np
+from feature_store import open_writer
+from frame_io import FrameIO, add_source_args
+from landmark_features import NUM_FEATURES, extract_into
+from temporal_features import WINDOW_FEATURES, WindowFeatures
+
+GESTURES = ['hello', 'ok', 'stop', 'love', 'done']
+
+parser = argparse.ArgumentParser(description="Record moving gestures as sliding-window samples")
+parser.add_argument("--out", default="sequence_data.svds",
+                    help="feature store to append to, or a .csv file (default sequence_data.svds)")
+parser.add_argument("--window", type=int, default=15,
+                    help="frames per window; must match sign_to_speech.py --window (default 15)")
+parser.add_argument("--stride", type=int, default=3,
+                    help="frames between consecutive samples once the window is full (default 3)")
+parser.add_argument("--samples", type=int, default=100, help="samples per gesture (default 100)")
+add_source_args(parser)
+args = parser.parse_args()
+
+# One row per window: 252 motion features (see temporal_features.WindowFeatures)
+features = np.empty(NUM_FEATURES, dtype=np.float32)
+row = np.empty(WINDOW_FEATURES, dtype=np.float32)
+window = WindowFeatures(args.window)
+with open_writer(args.out, WINDOW_FEATURES) as writer:
+    io = FrameIO(args, "Collecting Sequences")
+    frames = io.frames()
+    stop = False
+
+    for gesture in GESTURES:
+        if stop:
+            break
+        print(f"\n👋 Perform gesture: {gesture} (repeat it until capture finishes)")
+        if not io.headless:
+            input("👉 Press Enter when ready...")
+
+        window.reset()
+        count = 0
+        since_sample = 0
+        while count < args.samples:
+            packet = next(frames, None)
+            if packet is None:
+                stop = True
+                break
+            frame = packet.frame
+
+            if packet.hands:
+                handLms = packet.hands[0]
+                io.draw_landmarks(frame, handLms)
+                window.push(extract_into(handLms, features), packet.t_capture)
+                since_sample += 1
+                if window.ready and since_sample >= args.stride:
+                    writer.append(window.features(out=row), gesture)
+                    since_sample = 0
+                    count += 1
+                    print(f"Captured {count}/{args.samples}", end="\r")
+            else:
+                window.reset()  # a gap would splice two unrelated movements together
+
+            if io.show(packet) == ord('q'):
+                stop = True
+                break
+
+    io.close()
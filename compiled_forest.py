@@ -0,0 +1,105 @@
+import numpy as np
+
+
+class CompiledForest:
+    """Flat-array evaluator for a RandomForestClassifier exported by forest_compiler.py.
+
+    All trees live in shared contiguous arrays (``feature``, ``threshold``,
+    ``left``, ``right``, ``value``); ``roots`` holds each tree's first node.
+    Leaves point to themselves, so every row walks all trees in lock-step for
+    ``max_depth`` vectorized steps with no per-tree Python loop. Only NumPy is
+    needed at runtime.
+
+    Predictions match ``model.predict`` exactly: inputs are compared as
+    float32 against the float64 thresholds, per-tree probabilities are summed
+    in tree order and divided by the tree count before the argmax, as sklearn
+    does.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, classes, max_depth,
+                 n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features)
+        self.n_estimators = len(roots)
+        # Interleaved [left0, right0, left1, right1, ...]: one gather per step
+        self._children = np.stack([left, right], axis=1).ravel()
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data["feature"], data["threshold"], data["left"], data["right"],
+                       data["value"], data["roots"], data["classes"], data["max_depth"],
+                       data["n_features"])
+
+    def save(self, path):
+        np.savez(path, feature=self.feature, threshold=self.threshold, left=self.left,
+                 right=self.right, value=self.value, roots=self.roots, classes=self.classes_,
+                 max_depth=self.max_depth, n_features=self.n_features_in_)
+
+    def apply(self, X):
+        """Leaf node index reached in every tree, shape ``(n_rows, n_trees)``."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Expected {self.n_features_in_} features, got {X.shape[1]}")
+        children = self._children
+        if X.shape[0] == 1:
+            # Single row (the per-frame case): plain 1-D gathers
+            x = X[0]
+            node = self.roots
+            for _ in range(self.max_depth):
+                go_right = ~(x[self.feature[node]] <= self.threshold[node])
+                node = children[2 * node + go_right]
+            return node[None, :]
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_estimators))
+        for _ in range(self.max_depth):
+            go_right = ~(X[rows, self.feature[node]] <= self.threshold[node])
+            node = children[2 * node + go_right]
+        return node
+
+    def predict_proba(self, X):
+        leaf_values = self.value[self.apply(X)]  # (n_rows, n_trees, n_classes)
+        # cumsum adds trees one at a time, in order, like sklearn's accumulation
+        proba = np.cumsum(leaf_values, axis=1)[:, -1, :]
+        proba /= self.n_estimators
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def classifier_path(name="gesture_classifier"):
+    """The file ``load_classifier(name)`` loads: ``name.npz`` or ``name.pkl``, or None.
+
+    The flat-array export (python forest_compiler.py export) is preferred
+    when it is at least as new as the pickle: same predictions, no sklearn
+    per-call overhead.
+    """
+    import os
+    npz, pkl = f"{name}.npz", f"{name}.pkl"
+    if os.path.exists(npz) and (not os.path.exists(pkl)
+                                or os.path.getmtime(npz) >= os.path.getmtime(pkl)):
+        return npz
+    return pkl if os.path.exists(pkl) else None
+
+
+def load_classifier(name="gesture_classifier"):
+    """``(model, description)`` for ``name.npz`` or ``name.pkl`` (see ``classifier_path``),
+    or ``(None, None)``."""
+    path = classifier_path(name)
+    if path is None:
+        return None, None
+    if path.endswith(".npz"):
+        return CompiledForest.load(path), f"Compiled {name}"
+    import pickle
+    with open(path, "rb") as f:
+        return pickle.load(f), name
@@ -0,0 +1,241 @@
+"""Build a training set from labeled video clips and image folders, in parallel.
+
+    python extract_dataset.py clips/ [--out gesture_data.svds] [--workers 8] [--every 2]
+    python extract_dataset.py clips/ --window 15          # moving gestures → sequence_data.svds
+
+The first directory level under the input is the label:
+
+    clips/hello/take1.mp4               one job per video
+    clips/hello/take2/0001.jpg ...      one job per ``--chunk`` images of a folder
+    clips/stop/img_0042.png
+
+Frames are decoded and run through MediaPipe Hands in ``static_image_mode``
+(every frame detected on its own, no tracking between frames) in a process
+pool, one Hands graph per worker. Each finished job is appended to the
+feature store together with its name in the store's metadata, in one
+commit, so an interrupted run picks up where it stopped: run the same
+command again and finished clips are skipped. New clips added to the input
+are extracted on the next run. Image folders are split by ``--chunk``, so a
+store refuses to resume with a different ``--chunk`` (that would extract
+images already in it a second time).
+
+With ``--window`` every video (or image folder, in file-name order) is
+treated as one movement and written as sliding-window samples (see
+temporal_features.py), like collect_sequence_data.py does from the camera.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from feature_store import FeatureStoreWriter
+from landmark_features import NUM_FEATURES, extract_batch, extract_into
+from temporal_features import WINDOW_FEATURES, WindowFeatures
+
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mov", ".mkv", ".webm", ".m4v")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+# One MediaPipe graph per worker process, created by the pool initializer
+_hands = None
+
+
+def list_jobs(root, chunk=64, window=0):
+    """``(key, label, kind, paths)`` for every clip under ``root``, in a stable order.
+
+    ``key`` is the clip's path relative to ``root`` (plus ``@offset`` of the
+    first image for chunks of an image folder) and is what resuming matches
+    on, so resuming needs the same ``chunk``.
+    """
+    jobs = []
+    for label in sorted(os.listdir(root)):
+        label_dir = os.path.join(root, label)
+        if not os.path.isdir(label_dir):
+            continue
+        for folder, dirs, files in os.walk(label_dir):
+            dirs.sort()
+            rel = os.path.relpath(folder, root)
+            images = []
+            for name in sorted(files):
+                ext = os.path.splitext(name)[1].lower()
+                if ext in VIDEO_EXTENSIONS:
+                    jobs.append((os.path.join(rel, name), label, "video",
+                                 [os.path.join(folder, name)]))
+                elif ext in IMAGE_EXTENSIONS:
+                    images.append(os.path.join(folder, name))
+            size = len(images) if window else chunk
+            for i in range(0, len(images), max(size, 1)):
+                jobs.append((f"{rel}@{i}", label, "images", images[i:i + size]))
+    return jobs
+
+
+def _init_worker(max_num_hands):
+    global _hands
+    from frame_io import create_hands
+    _hands = create_hands(max_num_hands, static_image_mode=True)[0]
+
+
+def _frames(kind, paths, every, fps):
+    """``(timestamp, BGR frame)`` for every ``every``-th frame of a job."""
+    import cv2
+    if kind == "images":
+        for i, path in enumerate(paths[::every]):
+            frame = cv2.imread(path)
+            if frame is not None:
+                yield i * every / fps, frame
+        return
+    cap = cv2.VideoCapture(paths[0])
+    index = 0
+    try:
+        while True:
+            if index % every:
+                ok = cap.grab()  # skipped frames are not decoded
+            else:
+                ok, frame = cap.read()
+                if ok:
+                    yield cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0, frame
+            if not ok:
+                break
+            index += 1
+    finally:
+        cap.release()
+
+
+def extract_job(job, every=1, window=0, stride=3, fps=30.0):
+    """Run one job in a worker. Returns its rows and how long the worker spent on it."""
+    import cv2
+    key, label, kind, paths = job
+    start = time.perf_counter()
+    rows = []
+    frames = frames_with_hands = 0
+    if window:
+        features = np.empty(NUM_FEATURES, dtype=np.float32)
+        buffer = WindowFeatures(window)
+        since_sample = 0
+    for timestamp, frame in _frames(kind, paths, every, fps):
+        frames += 1
+        result = _hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        hands = result.multi_hand_landmarks or []
+        if hands:
+            frames_with_hands += 1
+        if not window:
+            if hands:
+                rows.append(extract_batch(hands))
+        elif hands:
+            buffer.push(extract_into(hands[0], features), timestamp)
+            since_sample += 1
+            if buffer.ready and since_sample >= stride:
+                rows.append(buffer.features()[None])
+                since_sample = 0
+        else:
+            buffer.reset()  # a gap would splice two unrelated movements together
+    n_features = WINDOW_FEATURES if window else NUM_FEATURES
+    return {"key": key, "label": label,
+            "features": np.concatenate(rows) if rows else np.empty((0, n_features), np.float32),
+            "frames": frames, "frames_with_hands": frames_with_hands,
+            "seconds": time.perf_counter() - start, "worker": os.getpid()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="directory with one sub-directory of clips per label")
+    parser.add_argument("--out", help="feature store to append to "
+                                      "(default gesture_data.svds, sequence_data.svds with --window)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--hands", type=int, choices=[1, 2], default=1,
+                        help="hands detected per frame; every hand becomes a sample (default 1)")
+    parser.add_argument("--every", type=int, default=1,
+                        help="use every N-th frame / image (default 1 = all)")
+    parser.add_argument("--chunk", type=int, default=64,
+                        help="images per job (default 64); keep it when resuming into a store")
+    parser.add_argument("--window", type=int, default=0,
+                        help="write sliding-window motion samples of this many frames "
+                             "(must match sign_to_speech.py --window)")
+    parser.add_argument("--stride", type=int, default=3,
+                        help="with --window: frames between consecutive samples (default 3)")
+    parser.add_argument("--fps", type=float, default=30.0,
+                        help="with --window: frame rate of image sequences (default 30)")
+    args = parser.parse_args()
+    if args.every < 1:
+        parser.error("--every must be at least 1")
+    if args.out and args.out.endswith(".csv"):
+        parser.error("--out must be a feature store directory, not a .csv file")
+    out = args.out or ("sequence_data.svds" if args.window else "gesture_data.svds")
+
+    writer = FeatureStoreWriter(out, WINDOW_FEATURES if args.window else NUM_FEATURES)
+    done = set(writer.extra.setdefault("extracted", []))
+    if not args.window:
+        # Image-folder job keys are chunk offsets; another --chunk would re-extract stored images
+        chunk = writer.extra.setdefault("chunk", args.chunk)
+        if chunk != args.chunk and done:
+            writer.close()
+            parser.error(f"{out} was extracted with --chunk {chunk}; resume with the same "
+                         f"--chunk or extract into a new --out")
+        writer.extra["chunk"] = args.chunk
+    jobs = list_jobs(args.input, args.chunk, args.window)
+    pending = [job for job in jobs if job[0] not in done]
+    print(f"🎞️ {len(jobs)} jobs in {args.input}, {len(jobs) - len(pending)} already in {out}; "
+          f"extracting {len(pending)} with {args.workers} workers")
+
+    per_worker = {}
+    failed = 0
+    added = frames_total = 0
+    start = time.perf_counter()
+    queue = iter(pending)
+    pool = ProcessPoolExecutor(args.workers, initializer=_init_worker, initargs=(args.hands,))
+    try:
+        # Keep a couple of jobs per worker in flight, so results stream to disk as they finish
+        running = {}
+        for job in queue:
+            running[pool.submit(extract_job, job, args.every, args.window, args.stride,
+                                args.fps)] = job
+            if len(running) == 2 * args.workers:
+                break
+        while running:
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                job = running.pop(future)
+                try:
+                    r = future.result()
+                except Exception as exc:
+                    failed += 1
+                    print(f"\n❌ {job[0]}: {exc}")
+                else:
+                    if not r["frames"]:
+                        print(f"\n⚠️ {r['key']}: no frames decoded")
+                    # The job is marked done in the same commit that adds its rows
+                    writer.extra["extracted"].append(r["key"])
+                    writer.append_batch(r["features"], r["label"])
+                    added += len(r["features"])
+                    frames_total += r["frames"]
+                    stats = per_worker.setdefault(r["worker"], [0, 0, 0.0])
+                    stats[0] += 1
+                    stats[1] += r["frames"]
+                    stats[2] += r["seconds"]
+                next_job = next(queue, None)
+                if next_job is not None:
+                    running[pool.submit(extract_job, next_job, args.every, args.window,
+                                        args.stride, args.fps)] = next_job
+            print(f"Extracted {len(writer.extra['extracted'])}/{len(jobs)} jobs, "
+                  f"{added} samples", end="\r")
+    except KeyboardInterrupt:
+        print("\n⏸ Interrupted; run the same command again to resume")
+        pool.shutdown(wait=False, cancel_futures=True)
+    else:
+        pool.shutdown()
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"\n\n{'worker':>8} {'jobs':>6} {'frames':>8} {'FPS':>8}")
+    for pid, (n_jobs, frames, seconds) in sorted(per_worker.items()):
+        print(f"{pid:>8} {n_jobs:>6} {frames:>8} {frames / seconds if seconds else 0:>8.1f}")
+    print(f"{'total':>8} {sum(s[0] for s in per_worker.values()):>6} {frames_total:>8} "
+          f"{frames_total / elapsed if elapsed else 0:>8.1f}")
+    print(f"✅ {added} samples added to {out} ({writer.rows} rows), {failed} jobs failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Chunked binary storage for landmark features and labels.
+
+A store is a directory (``gesture_data.svds``) holding
+
+    features.f32   float32 rows of ``n_features`` values, appended in chunks
+    labels.u16     uint16 index into the label table, one per row
+    meta.json      version, n_features, label table, committed row count and
+                   the writer's ``extra`` dict (tool state, e.g. extract_dataset.py's
+                   finished clips, committed together with the rows)
+
+``meta.json`` is rewritten atomically after every chunk, so a store stays
+readable if a collector is killed mid-session (rows past the committed count
+are ignored and overwritten by the next writer). Readers memory-map both
+files, and ``FeatureStore.features`` is a zero-copy ``(N, 63)`` array.
+
+    python feature_store.py convert gesture_data.csv gesture_data.svds
+    python feature_store.py info gesture_data.svds
+"""
+import argparse
+import csv
+import json
+import os
+
+import numpy as np
+
+VERSION = 1
+FEATURES_FILE = "features.f32"
+LABELS_FILE = "labels.u16"
+META_FILE = "meta.json"
+
+
+def _read_meta(path):
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    if meta.get("version") != VERSION:
+        raise ValueError(f"Unsupported feature store version in {path}: {meta.get('version')}")
+    return meta
+
+
+class FeatureStoreWriter:
+    """Append-only writer. Rows are buffered into a fixed chunk and written in one go."""
+
+    def __init__(self, path, n_features=63, chunk_rows=4096):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, META_FILE)):
+            meta = _read_meta(path)
+            if meta["n_features"] != n_features:
+                raise ValueError(f"{path} has {meta['n_features']} features, not {n_features}")
+            self.labels = meta["labels"]
+            self.rows = meta["rows"]
+            self.extra = meta.get("extra", {})
+        else:
+            self.labels = []
+            self.rows = 0
+            self.extra = {}
+        self.n_features = n_features
+        self._label_index = {label: i for i, label in enumerate(self.labels)}
+        self._buf = np.empty((chunk_rows, n_features), dtype="<f4")
+        self._buf_labels = np.empty(chunk_rows, dtype="<u2")
+        self._pending = 0
+        self._features = open(os.path.join(path, FEATURES_FILE), "r+b" if self.rows else "wb")
+        self._label_file = open(os.path.join(path, LABELS_FILE), "r+b" if self.rows else "wb")
+        # Drop anything written after the last commit
+        self._features.truncate(self.rows * n_features * 4)
+        self._label_file.truncate(self.rows * 2)
+        self._features.seek(0, os.SEEK_END)
+        self._label_file.seek(0, os.SEEK_END)
+        if not self.rows:
+            self._commit()
+
+    def label_id(self, label):
+        label = str(label)
+        index = self._label_index.get(label)
+        if index is None:
+            index = self._label_index[label] = len(self.labels)
+            self.labels.append(label)
+        return index
+
+    def append(self, features, label):
+        """Add one row (any 63-element array-like, e.g. ``extract_features(handLms)``)."""
+        self._buf[self._pending] = np.asarray(features).reshape(-1)
+        self._buf_labels[self._pending] = self.label_id(label)
+        self._pending += 1
+        if self._pending == self.chunk_rows:
+            self.flush()
+
+    def append_batch(self, features, labels):
+        """Add ``(N, n_features)`` rows with one label each (or one label for all)."""
+        features = np.asarray(features, dtype="<f4").reshape(-1, self.n_features)
+        if isinstance(labels, str) or np.ndim(labels) == 0:
+            ids = np.full(len(features), self.label_id(labels), dtype="<u2")
+        else:
+            ids = np.array([self.label_id(label) for label in labels], dtype="<u2")
+        self.flush()
+        self._features.write(features.tobytes())
+        self._label_file.write(ids.tobytes())
+        self.rows += len(features)
+        self._commit()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self._features.write(self._buf[:self._pending].tobytes())
+        self._label_file.write(self._buf_labels[:self._pending].tobytes())
+        self.rows += self._pending
+        self._pending = 0
+        self._commit()
+
+    def _commit(self):
+        self._features.flush()
+        self._label_file.flush()
+        meta = {"version": VERSION, "n_features": self.n_features, "labels": self.labels,
+                "rows": self.rows}
+        if self.extra:
+            meta["extra"] = self.extra
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+    @property
+    def total_rows(self):
+        return self.rows + self._pending
+
+    def close(self):
+        if self._features.closed:
+            return
+        self.flush()
+        self._features.close()
+        self._label_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FeatureStore:
+    """Memory-mapped, read-only view of a store."""
+
+    def __init__(self, path):
+        meta = _read_meta(path)
+        self.path = path
+        self.n_features = meta["n_features"]
+        self.label_table = np.array(meta["labels"])
+        self.rows = meta["rows"]
+        if self.rows:
+            self.features = np.memmap(os.path.join(path, FEATURES_FILE), dtype="<f4", mode="r",
+                                      shape=(self.rows, self.n_features))
+            self.label_ids = np.memmap(os.path.join(path, LABELS_FILE), dtype="<u2", mode="r",
+                                       shape=(self.rows,))
+        else:
+            self.features = np.empty((0, self.n_features), dtype="<f4")
+            self.label_ids = np.empty(0, dtype="<u2")
+
+    def __len__(self):
+        return self.rows
+
+    @property
+    def labels(self):
+        """Label strings per row (materialized; use ``label_ids`` to stay zero-copy)."""
+        return self.label_table[self.label_ids]
+
+
+# === CSV compatibility ===
+class CsvFeatureWriter:
+    """Same interface as FeatureStoreWriter, writing gesture_data.csv-style rows."""
+
+    def __init__(self, path, n_features=63):
+        self.path = path
+        self.rows = 0
+        self._f = open(path, "w", newline="")
+        self._writer = csv.writer(self._f)
+        self._writer.writerow(['label'] + [f'f{i}' for i in range(n_features)])
+
+    def append(self, features, label):
+        self._writer.writerow([label] + np.asarray(features).reshape(-1).tolist())
+        self.rows += 1
+
+    def append_batch(self, features, labels):
+        if isinstance(labels, str) or np.ndim(labels) == 0:
+            labels = [labels] * len(features)
+        for row, label in zip(features, labels):
+            self.append(row, label)
+
+    def flush(self):
+        self._f.flush()
+
+    @property
+    def total_rows(self):
+        return self.rows
+
+    def close(self):
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_writer(path, n_features=63):
+    """Writer for ``path``: a binary store unless the name ends in ``.csv``."""
+    if path.endswith(".csv"):
+        return CsvFeatureWriter(path, n_features)
+    return FeatureStoreWriter(path, n_features)
+
+
+def load_dataset(path):
+    """``(X, y)`` from a store (zero-copy X) or a CSV with a ``label`` column."""
+    if os.path.isdir(path):
+        store = FeatureStore(path)
+        return store.features, store.labels
+    import pandas as pd
+    df = pd.read_csv(path)
+    return df.drop('label', axis=1).to_numpy(dtype=np.float32), df['label'].to_numpy()
+
+
+def convert_csv(csv_path, store_path, chunk_rows=65536):
+    import pandas as pd
+    rows = 0
+    with FeatureStoreWriter(store_path) as writer:
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+            labels = chunk.pop('label').astype(str).to_numpy()
+            writer.append_batch(chunk.to_numpy(dtype=np.float32), labels)
+            rows += len(chunk)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="convert a CSV dataset to a binary store")
+    convert.add_argument("csv")
+    convert.add_argument("store")
+    info = sub.add_parser("info", help="show rows and label counts of a store")
+    info.add_argument("store")
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        if os.path.exists(os.path.join(args.store, META_FILE)):
+            print(f"❌ {args.store} already exists")
+            raise SystemExit(1)
+        rows = convert_csv(args.csv, args.store)
+        print(f"✅ Converted {rows} rows from {args.csv} to {args.store}")
+    else:
+        store = FeatureStore(args.store)
+        counts = np.bincount(store.label_ids, minlength=len(store.label_table))
+        print(f"{args.store}: {len(store)} rows × {store.n_features} features")
+        for label, count in zip(store.label_table, counts):
+            print(f"  {label}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,91 +1,91 @@
-import cv2
+import argparse
 import pickle
-import pyttsx3
-import mediapipe as mp
-import numpy as np
-import time
-from feature_extractor import extract_features
+from frame_io import FrameIO, add_source_args
+from landmark_features import NUM_FEATURES
+from overlay import TextLayer
 from dummy_model import DummyASLModel  # For loading dummy model
+from speech_queue import SpeechQueue
+from hand_pose import FIST, hand_points
+from model_registry import add_reload_args, create_registry
+
+parser = argparse.ArgumentParser(description="SilentVoice - fist confirmation mode")
+add_reload_args(parser)
+add_source_args(parser)
+args = parser.parse_args()
 
 # Load the model
 with open("gesture_model.pkl", "rb") as f:
     model = pickle.load(f)
+# With --reload, retrained versions of gesture_model.pkl are swapped in while running
+models = create_registry(args, model, "gesture_model.pkl", NUM_FEATURES)
 
-# TTS
-engine = pyttsx3.init()
-
-# MediaPipe setup
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1)
-mp_draw = mp.solutions.drawing_utils
-
-# Webcam
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
+# Webcam / replay
+io = FrameIO(args, "SilentVoice - Fist Confirmation Mode")
+if not io.isOpened():
     print("❌ Camera not available.")
     exit()
 
+# TTS (background thread, never blocks the camera loop; silent when headless)
+speech = None if io.headless else SpeechQueue()
+
 # Prediction control
 last_prediction_time = 0
 prediction_interval = 2  # seconds
 current_letter = ""
+letters_by_hand = {}  # latest prediction per hand side
 confirmed_text = ""
-
-def is_fist(landmarks):
-    """Check if hand is in a closed fist position using fingertip landmarks."""
-    tips_ids = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky tips
-    fingers_folded = 0
-
-    for tip_id in tips_ids[1:]:  # Skip thumb
-        if landmarks[tip_id].y > landmarks[tip_id - 2].y:
-            fingers_folded += 1
-
-    # Optional: check thumb as well
-    if landmarks[4].x < landmarks[3].x:  # Thumb folded across palm
-        fingers_folded += 1
-
-    return fingers_folded >= 4  # 4+ fingers folded = fist
+last_confirm_time = 0
+confirm_cooldown = 1.5  # seconds, to avoid double-confirmation
+hud = TextLayer()
 
 print("✊ Show hand signs. Close fist to confirm the letter. Press 'q' to quit.")
 
-while True:
-    success, frame = cap.read()
-    if not success:
-        break
-
-    img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result = hands.process(img_rgb)
-
-    if result.multi_hand_landmarks:
-        for handLms in result.multi_hand_landmarks:
-            mp_draw.draw_landmarks(frame, handLms, mp_hands.HAND_CONNECTIONS)
-
-            # Predict letter every few seconds
-            current_time = time.time()
-            if current_time - last_prediction_time >= prediction_interval:
-                features = extract_features(handLms).reshape(1, -1)
-                current_letter = model.predict(features)[0]
-                last_prediction_time = current_time
-
-            # Detect closed fist
-            if is_fist(handLms.landmark):
-                cv2.putText(frame, "✊ Fist Detected - Confirming", (10, 130),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+for packet in io.frames():
+    if models is not None and models.poll():
+        model = models.model
+    frame = packet.frame
+    current_time = packet.t_capture
+    sides = packet.sides
+    # Landmarks of all hands as one array: poses and predictions both read it
+    points = hand_points(packet.hands)
+    fists = FIST.matrix(points)[:, 0]
+
+    # Predict letters every few seconds: all hands in one batch, one predict call
+    if packet.hands and current_time - last_prediction_time >= prediction_interval:
+        letters_by_hand = dict(zip(sides, model.predict(points.reshape(-1, NUM_FEATURES))))
+        current_letter = letters_by_hand[sides[0]]
+        last_prediction_time = current_time
+
+    fist_seen = False
+    for handLms, side, fist in zip(packet.hands, sides, fists):
+        io.draw_landmarks(frame, handLms)
+
+        # Detect closed fist; with two hands, the fist confirms the other hand's letter
+        if fist:
+            other = [s for s in sides if s != side]
+            if other and other[0] in letters_by_hand:
+                current_letter = letters_by_hand[other[0]]
+            fist_seen = True
+            if current_time - last_confirm_time > confirm_cooldown:
                 confirmed_text += current_letter
                 print(f"✅ Confirmed Letter: {current_letter}")
-                engine.say(current_letter)
-                engine.runAndWait()
-                time.sleep(1.5)  # Pause to avoid double-confirmation
-
-    # Show prediction and confirmed text
-    cv2.putText(frame, f"Current Prediction: {current_letter}", (10, 70),
-                cv2.FONT_HERSHEY_SIMPLEX, 1.2, (0, 255, 0), 2)
-    cv2.putText(frame, f"Confirmed: {confirmed_text}", (10, 110),
-                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 0), 2)
-
-    cv2.imshow("SilentVoice - Fist Confirmation Mode", frame)
-    if cv2.waitKey(1) & 0xFF == ord('q'):
+                if speech:
+                    speech.say(current_letter)
+                last_confirm_time = current_time
+
+    # Show prediction and confirmed text (pre-rendered, rebuilt only when the text changes)
+    if not io.headless:
+        lines = [(f"Current Prediction: {current_letter}", (10, 70), 1.2, (0, 255, 0), 2),
+                 (f"Confirmed: {confirmed_text}", (10, 110), 1, (255, 255, 0), 2)]
+        if fist_seen:
+            lines.append(("✊ Fist Detected - Confirming", (10, 130), 1, (0, 0, 255), 2))
+        hud.draw(frame, lines)
+
+    if io.show(packet) == ord('q'):
         break
 
-cap.release()
-cv2.destroyAllWindows()
+if models is not None:
+    models.close()
+io.close({"confirmed": confirmed_text, "model": models.stats() if models is not None else None})
+if speech:
+    speech.close()
@@ -0,0 +1,116 @@
+"""Export a trained RandomForestClassifier to flat arrays and check the result.
+
+    python forest_compiler.py export [--model gesture_classifier.pkl] [--out gesture_classifier.npz]
+    python forest_compiler.py verify [--model ...] [--compiled ...] [--data gesture_data.csv]
+"""
+import argparse
+import pickle
+
+import numpy as np
+
+from compiled_forest import CompiledForest
+
+
+def _normalizes_leaf_values():
+    # sklearn < 1.4 stored raw class counts in tree_.value and normalized them
+    # in predict_proba; newer versions store the fractions directly.
+    import sklearn
+    major, minor = (int(p) for p in sklearn.__version__.split(".")[:2])
+    return (major, minor) < (1, 4)
+
+
+def compile_forest(model):
+    """Flatten ``model.estimators_`` into a CompiledForest."""
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise ValueError("Only single-output classifiers can be compiled")
+
+    n_classes = len(model.classes_)
+    normalize = _normalizes_leaf_values()
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        ids = np.arange(offset, offset + n)
+        is_leaf = tree.children_left == -1
+
+        feature = np.where(is_leaf, 0, tree.feature)
+        left = np.where(is_leaf, ids, tree.children_left + offset)
+        right = np.where(is_leaf, ids, tree.children_right + offset)
+        value = np.array(tree.value[:, 0, :n_classes], dtype=np.float64)
+        if normalize:
+            normalizer = value.sum(axis=1)[:, None]
+            normalizer[normalizer == 0.0] = 1.0
+            value /= normalizer
+
+        features.append(feature)
+        thresholds.append(tree.threshold)
+        lefts.append(left)
+        rights.append(right)
+        values.append(value)
+        roots.append(offset)
+        max_depth = max(max_depth, tree.max_depth)
+        offset += n
+
+    return CompiledForest(
+        feature=np.concatenate(features).astype(np.int32),
+        threshold=np.concatenate(thresholds).astype(np.float64),
+        left=np.concatenate(lefts).astype(np.int32),
+        right=np.concatenate(rights).astype(np.int32),
+        value=np.ascontiguousarray(np.concatenate(values)),
+        roots=np.array(roots, dtype=np.int32),
+        classes=np.asarray(model.classes_).astype(str),
+        max_depth=max_depth,
+        n_features=model.n_features_in_,
+    )
+
+
+def load_model(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def load_dataset(path):
+    import pandas as pd
+    df = pd.read_csv(path)
+    return df.drop('label', axis=1), df['label'].to_numpy()
+
+
+def verify(model, compiled, X):
+    """Return the number of rows where the compiled forest disagrees with ``model.predict``."""
+    expected = np.asarray(model.predict(X)).astype(str)
+    batch = compiled.predict(np.asarray(X))
+    single = np.array([compiled.predict(row)[0] for row in np.asarray(X)])
+    return int((batch != expected).sum() + (single != expected).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["export", "verify"])
+    parser.add_argument("--model", default="gesture_classifier.pkl")
+    parser.add_argument("--out", "--compiled", dest="compiled", default="gesture_classifier.npz")
+    parser.add_argument("--data", default="gesture_data.csv")
+    args = parser.parse_args()
+
+    model = load_model(args.model)
+    if args.command == "export":
+        compiled = compile_forest(model)
+        compiled.save(args.compiled)
+        print(f"✅ Exported {compiled.n_estimators} trees / {len(compiled.feature)} nodes "
+              f"(max depth {compiled.max_depth}) to {args.compiled}")
+    else:
+        compiled = CompiledForest.load(args.compiled)
+
+    X, _ = load_dataset(args.data)
+    mismatches = verify(model, compiled, X)
+    if mismatches:
+        print(f"❌ {mismatches} predictions differ from model.predict on {args.data}")
+        raise SystemExit(1)
+    print(f"✅ Compiled forest matches model.predict on all {len(X)} rows of {args.data}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import collections
+import threading
+
+ACTIVE = "active"
+IDLE = "idle"
+OVERLOADED = "overloaded"
+
+
+class FrameGovernor:
+    """Decide which camera frames are worth processing.
+
+    - ``active``: every frame is processed.
+    - ``idle``: no hand for ``idle_after`` seconds; frames are processed at
+      ``idle_fps`` only, until a hand shows up again.
+    - ``overloaded``: the smoothed interval between processed frames
+      exceeds ``frame_budget`` seconds, i.e. the loop cannot keep up with
+      the camera. A frame is then decoded only while fewer than ``depth``
+      processed frames are still on their way to the screen, so no work is
+      spent on frames the pipeline would drop anyway. Once the interval
+      fits the budget again the governor returns to ``active``.
+
+    Skipped frames should still be pulled from the camera (``cap.grab()``,
+    no decode) so the next processed frame is fresh. ``should_process`` may
+    run on the capture thread and ``update`` on the display thread.
+
+        if governor.should_process(now):
+            ...process, display...
+            governor.update(now, hand_present, t_capture)
+    """
+
+    def __init__(self, idle_after=10.0, idle_fps=2.0, frame_budget=None, smoothing=0.1, depth=2):
+        self.idle_after = idle_after
+        self.idle_fps = idle_fps
+        self.frame_budget = frame_budget
+        self.smoothing = smoothing
+        self.depth = depth
+        self.state = ACTIVE
+        self.interval = None
+        self.last_hand_time = None
+        self.last_processed = None
+        self.processed = 0
+        self.skipped = 0
+        self.state_seconds = {ACTIVE: 0.0, IDLE: 0.0, OVERLOADED: 0.0}
+        self._last_update = None
+        self._in_flight = collections.deque()  # decode times of frames not shown yet
+        self._lock = threading.Lock()
+
+    def should_process(self, now):
+        with self._lock:
+            if self.last_hand_time is None:
+                self.last_hand_time = now
+            if self.state == IDLE:
+                process = self.last_processed is None or now - self.last_processed >= 1.0 / self.idle_fps
+            elif self.state == OVERLOADED:
+                process = len(self._in_flight) < self.depth
+            else:
+                process = True
+
+            if process:
+                self.last_processed = now
+                self.processed += 1
+                self._in_flight.append(now)
+            else:
+                self.skipped += 1
+            return process
+
+    def update(self, now, hand_present, t_capture=None):
+        """Report a shown frame: whether a hand was seen and when it was captured."""
+        with self._lock:
+            if self.last_hand_time is None or hand_present:
+                self.last_hand_time = now
+            # The shown frame and any older ones (dropped on the way) are done
+            limit = now if t_capture is None else t_capture
+            while self._in_flight and self._in_flight[0] <= limit:
+                self._in_flight.popleft()
+
+            if self._last_update is not None:
+                elapsed = now - self._last_update
+                self.state_seconds[self.state] += elapsed
+                # Idle frames are slow on purpose; they say nothing about throughput
+                if self.state != IDLE:
+                    if self.interval is None:
+                        self.interval = elapsed
+                    else:
+                        self.interval += self.smoothing * (elapsed - self.interval)
+            self._last_update = now
+
+            if not hand_present and now - self.last_hand_time >= self.idle_after:
+                self.state = IDLE
+                self.interval = None
+            elif self.frame_budget and self.interval and self.interval > self.frame_budget:
+                self.state = OVERLOADED
+            else:
+                self.state = ACTIVE
+            return self.state
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "processed": self.processed,
+            "skipped": self.skipped,
+            "interval_ms": round(self.interval * 1000, 2) if self.interval else None,
+            "seconds": {k: round(v, 1) for k, v in self.state_seconds.items()},
+        }
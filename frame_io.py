@@ -0,0 +1,267 @@
+import json
+import time
+
+from landmark_io import NO_KEY, LandmarkRecorder, read_landmarks
+from frame_governor import ACTIVE, FrameGovernor
+from metrics import add_metrics_args, create_metrics
+from overlay import draw_hand
+from pipeline import FramePacket
+
+
+def add_source_args(parser):
+    """Command-line options shared by every entry point."""
+    parser.add_argument("--camera", type=int, default=0, help="camera index (default 0)")
+    parser.add_argument("--video", help="read frames from a video file instead of the camera")
+    parser.add_argument("--replay", help="replay a landmark recording (.svlm) instead of the camera")
+    parser.add_argument("--record", help="save landmarks and key presses to a .svlm recording")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window (implied by --replay); keys come from the recording")
+    parser.add_argument("--render", choices=["thread", "main", "off"], default="thread",
+                        help="thread: window and keyboard on their own thread (default); "
+                             "main: on the main loop (needed on macOS); off: same as --headless")
+    parser.add_argument("--hands", type=int, choices=[1, 2], default=1,
+                        help="hands to track (default 1)")
+    parser.add_argument("--roi", action="store_true",
+                        help="run MediaPipe on a downscaled crop around the last seen hand")
+    parser.add_argument("--roi-size", type=int, default=256,
+                        help="longest side of the --roi crop in pixels (default 256)")
+    parser.add_argument("--idle-after", type=float, default=10.0,
+                        help="camera: drop to --idle-fps after this many seconds without a hand "
+                             "(0 disables; default 10)")
+    parser.add_argument("--idle-fps", type=float, default=2.0,
+                        help="camera: frames processed per second while idle (default 2)")
+    parser.add_argument("--frame-budget-ms", type=float, default=0,
+                        help="camera: when frames are processed further apart than this, stop "
+                             "decoding frames the pipeline would drop (0 disables)")
+    parser.add_argument("--summary", help="write run statistics and results as JSON to this file")
+    add_metrics_args(parser)
+    return parser
+
+
+def create_hands(max_num_hands=1, static_image_mode=False):
+    """Build the MediaPipe hands graph. Imported lazily so replays don't need MediaPipe."""
+    import mediapipe as mp
+    mp_hands = mp.solutions.hands
+    hands = mp_hands.Hands(static_image_mode=static_image_mode, max_num_hands=max_num_hands)
+    return hands, mp_hands, mp.solutions.drawing_utils
+
+
+def create_warm_hands(max_num_hands=1, frame_shape=(480, 640, 3)):
+    """``create_hands`` plus one ``process`` call on a blank frame, so the first real frame is fast."""
+    import numpy as np
+    hands, mp_hands, mp_draw = create_hands(max_num_hands)
+    hands.process(np.zeros(frame_shape, dtype=np.uint8))
+    return hands, mp_hands, mp_draw
+
+
+class FrameIO:
+    """Frame source, MediaPipe, display, keyboard and recording for one script.
+
+    Frames come from the camera, a video file (``--video``) or a landmark
+    recording (``--replay``). Replays skip capture and MediaPipe entirely and
+    run as fast as the mode logic allows; their timestamps and key presses
+    come from the recording, so results are deterministic.
+
+        io = FrameIO(args, "Window title")
+        for packet in io.frames():
+            ...                      # packet.result, packet.t_capture, packet.frame
+            key = io.show(packet)    # imshow/waitKey, or the recorded key
+        io.close()
+    """
+
+    def __init__(self, args, window, max_num_hands=None):
+        self.args = args
+        self.window = window
+        self.replaying = bool(args.replay)
+        self.headless = args.headless or self.replaying or args.render == "off"
+        self.max_num_hands = max_num_hands or args.hands
+        self.cap = None
+        self.hands = None
+        self.mp_hands = None
+        self.mp_draw = None
+        self.roi_input = None
+        self.recorder = LandmarkRecorder(args.record) if args.record else None
+        self.frame_count = 0
+        self._seq = 0
+        self._start = None
+        self._replay = None
+        self._video_t0 = None
+        self.governor = None
+        self.display = None
+        # Runtime metrics (metrics.py); None unless a --metrics-*/--trace flag is set
+        self.metrics_runtime = create_metrics(args)
+        self.metrics = self.metrics_runtime.metrics if self.metrics_runtime else None
+        if not self.headless and args.render == "thread":
+            from overlay import DisplayThread
+            self.display = DisplayThread(window)
+
+        if self.replaying:
+            self._replay = read_landmarks(args.replay)
+        else:
+            import cv2
+            self.cap = cv2.VideoCapture(args.video if args.video else args.camera)
+            if args.video:
+                self._video_t0 = time.time()
+            elif args.idle_after > 0 or args.frame_budget_ms > 0:
+                # Only a live camera is governed; files are always processed in full
+                self.governor = FrameGovernor(
+                    idle_after=args.idle_after if args.idle_after > 0 else float("inf"),
+                    idle_fps=args.idle_fps,
+                    frame_budget=args.frame_budget_ms / 1000.0 or None)
+
+    @property
+    def live(self):
+        """True when reading a real camera (frames arrive in camera time)."""
+        return not self.replaying and not self.args.video
+
+    def isOpened(self):
+        return self.replaying or self.cap.isOpened()
+
+    # === Capture / detection ===
+    def capture(self):
+        """Next FramePacket (result still unset for camera/video), or None at end of stream."""
+        if self._start is None:
+            self._start = time.perf_counter()
+        self._seq += 1
+        if self.replaying:
+            record = next(self._replay, None)
+            if record is None:
+                return None
+            timestamp, key, result = record
+            packet = FramePacket(self._seq, None, timestamp)
+            packet.result = result
+            packet.key = key
+            return packet
+
+        import cv2
+        start = time.perf_counter() if self.metrics is not None else None
+        while self.governor is not None and not self.governor.should_process(time.time()):
+            if not self.cap.grab():  # keep the camera buffer fresh without decoding
+                return None
+        success, frame = self.cap.read()
+        if not success:
+            return None
+        if self._video_t0 is not None:
+            timestamp = self._video_t0 + self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        else:
+            timestamp = time.time()
+        if start is not None:
+            self.metrics.timed("capture", start, seq=self._seq)
+        return FramePacket(self._seq, frame, timestamp)
+
+    def detect(self, packet):
+        """Run MediaPipe on the packet's frame unless the result came from a replay."""
+        if packet.result is None:
+            import cv2
+            if self.hands is None:
+                self.attach_hands(*create_hands(self.max_num_hands))
+            start = time.perf_counter() if self.metrics is not None else None
+            if self.roi_input is not None:
+                packet.result = self.roi_input.process(packet.frame)
+            else:
+                img_rgb = cv2.cvtColor(packet.frame, cv2.COLOR_BGR2RGB)
+                packet.result = self.hands.process(img_rgb)
+            if start is not None:
+                self.metrics.timed("detect", start, seq=packet.seq)
+        return packet
+
+    def attach_hands(self, hands, mp_hands, mp_draw):
+        """Use an already built MediaPipe graph (e.g. one prewarmed on another thread)."""
+        self.hands, self.mp_hands, self.mp_draw = hands, mp_hands, mp_draw
+        if self.args.roi:
+            from roi_tracker import RoiHandInput
+            # Full-frame searches get their own static graph so they don't reset the
+            # tracking graph, which only ever sees the (mostly fixed) crop
+            search_hands = create_hands(self.max_num_hands, static_image_mode=True)[0]
+            self.roi_input = RoiHandInput(self.hands, search_hands, work_size=self.args.roi_size)
+
+    def frames(self):
+        """Capture and detect one frame at a time on the calling thread."""
+        while True:
+            packet = self.capture()
+            if packet is None:
+                return
+            yield self.detect(packet)
+
+    # === Display / keyboard ===
+    def draw_landmarks(self, frame, handLms):
+        if frame is None or self.headless:
+            return
+        draw_hand(frame, handLms)
+
+    def show(self, packet):
+        """Display the frame and return the key pressed (recorded key when replaying)."""
+        self.frame_count += 1
+        start = time.perf_counter() if self.metrics is not None else None
+        if self.replaying:
+            key = packet.key
+        elif self.headless:
+            key = NO_KEY
+        else:
+            import cv2
+            if self.governor is not None and self.governor.state != ACTIVE:
+                cv2.putText(packet.frame, self.governor.state.upper(),
+                            (10, packet.frame.shape[0] - 15),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
+            if self.display is not None:
+                self.display.show(packet.frame)
+                key = self.display.poll_key()
+            else:
+                cv2.imshow(self.window, packet.frame)
+                key = cv2.waitKey(1) & 0xFF
+        if self.governor is not None:
+            now = time.time()
+            self.governor.update(now, bool(packet.hands), packet.t_capture)
+        if self.recorder is not None:
+            self.recorder.write(packet.t_capture, packet.result, key)
+        if start is not None:
+            self.metrics.timed("display", start, seq=packet.seq)
+            self.metrics.frame(packet.hands, time.time() - packet.t_capture if self.live else None)
+        return key
+
+    def wait_key(self, delay=1):
+        """Poll the keyboard between frames (always 'no key' when headless)."""
+        if self.headless:
+            return NO_KEY
+        if self.display is not None:
+            return self.display.poll_key()
+        import cv2
+        return cv2.waitKey(delay) & 0xFF
+
+    # === Shutdown ===
+    def stats(self):
+        elapsed = time.perf_counter() - self._start if self._start is not None else 0.0
+        return {
+            "frames": self.frame_count,
+            "seconds": round(elapsed, 4),
+            "fps": round(self.frame_count / elapsed, 1) if elapsed > 0 else None,
+        }
+
+    def close(self, results=None):
+        """Release everything; print throughput and write ``--summary`` if requested."""
+        if self.cap is not None:
+            self.cap.release()
+        if self.recorder is not None:
+            self.recorder.close()
+            print(f"💾 Recorded {self.recorder.frames} frames to {self.args.record}")
+        if self.display is not None:
+            self.display.close()
+        elif not self.headless:
+            import cv2
+            cv2.destroyAllWindows()
+
+        stats = self.stats()
+        if self.roi_input is not None:
+            stats["roi"] = self.roi_input.stats()
+        if self.governor is not None:
+            stats["governor"] = self.governor.stats()
+        if self.display is not None:
+            stats["display"] = {"shown": self.display.shown, "dropped": self.display.dropped}
+        if self.metrics_runtime is not None:
+            self.metrics_runtime.close()
+            stats["metrics"] = self.metrics.snapshot()
+        if self.headless:
+            print(f"📊 {stats['frames']} frames in {stats['seconds']}s ({stats['fps']} FPS)")
+        if self.args.summary:
+            with open(self.args.summary, "w") as f:
+                json.dump(dict(stats, **(results or {})), f, indent=2)
@@ -0,0 +1,187 @@
+import json
+from functools import cached_property
+
+import numpy as np
+
+from landmark_features import NUM_LANDMARKS, extract_batch
+
+FINGERS = ("thumb", "index", "middle", "ring", "pinky")
+TIPS = np.array([4, 8, 12, 16, 20])
+JOINTS = np.array([3, 6, 10, 14, 18])  # thumb IP, finger PIPs
+WRIST, INDEX_MCP, MIDDLE_MCP, PINKY_MCP = 0, 5, 9, 17
+DIRECTIONS = ("up", "right", "down", "left")
+
+# Rule keys (all optional, all must hold):
+#   min_folded: at least this many fingers folded (image-axis test, as the old is_fist)
+#   extended / curled: fingers that must be straight / bent
+#   pinch: {finger: max thumb-tip distance, in palm lengths}
+#   direction: where the hand points (wrist -> middle MCP): up/right/down/left
+DEFAULT_POSES = {
+    "fist": {"min_folded": 4},
+    "open_palm": {"extended": ["thumb", "index", "middle", "ring", "pinky"]},
+    "point": {"extended": ["index"], "curled": ["middle", "ring", "pinky"]},
+    "victory": {"extended": ["index", "middle"], "curled": ["ring", "pinky"]},
+    "three": {"extended": ["index", "middle", "ring"], "curled": ["pinky"]},
+    "four": {"extended": ["index", "middle", "ring", "pinky"], "curled": ["thumb"]},
+    "ok": {"pinch": {"index": 0.35}, "extended": ["middle", "ring", "pinky"]},
+    "pinch": {"pinch": {"index": 0.35}},
+}
+
+
+def hand_points(hands, out=None):
+    """``(N, 21, 3)`` landmark array for N hands (``packet.hands``, ``.landmark`` lists or arrays)."""
+    if isinstance(hands, np.ndarray):
+        return hands.reshape(-1, NUM_LANDMARKS, 3)
+    return extract_batch(hands, out=out).reshape(-1, NUM_LANDMARKS, 3)
+
+
+class PosePrimitives:
+    """Per-hand geometry for N hands, each primitive one vectorized pass over all of them.
+
+    ``folded`` (N, 5): tip below its middle joint in the image (thumb: tip
+    left of its IP joint), the test the old ``is_fist`` used. ``extended``
+    (N, 5): tip farther from the wrist than its middle joint (thumb: from
+    the pinky MCP), which doesn't depend on how the hand is rotated.
+    ``pinch`` (N, 4): thumb tip to index/middle/ring/pinky tip, in palm
+    lengths. ``palm_normal`` (N, 3): unit normal of the palm plane.
+    ``direction`` (N,): index into ``DIRECTIONS`` of wrist -> middle MCP.
+
+    Primitives are computed on first use, so checking only the fist doesn't
+    pay for pinch distances and palm normals.
+    """
+
+    def __init__(self, points):
+        self.points = hand_points(points)
+        self.tips = self.points[:, TIPS]
+        self.joints = self.points[:, JOINTS]
+        self.wrist = self.points[:, WRIST]
+
+    @cached_property
+    def folded(self):
+        folded = np.empty(self.tips.shape[:2], dtype=bool)
+        folded[:, 1:] = self.tips[:, 1:, 1] > self.joints[:, 1:, 1]
+        folded[:, 0] = self.tips[:, 0, 0] < self.joints[:, 0, 0]
+        return folded
+
+    @cached_property
+    def extended(self):
+        # Squared distances are enough for the comparison
+        base = np.empty_like(self.tips)
+        base[:] = self.wrist[:, None, :]
+        base[:, 0] = self.points[:, PINKY_MCP]
+        tip_d = self.tips - base
+        joint_d = self.joints - base
+        return (tip_d * tip_d).sum(axis=2) > (joint_d * joint_d).sum(axis=2)
+
+    @cached_property
+    def pinch(self):
+        palm = self.points[:, MIDDLE_MCP] - self.wrist
+        palm = np.sqrt((palm * palm).sum(axis=1))
+        palm[palm == 0] = 1.0
+        pinch = self.tips[:, 1:] - self.tips[:, :1]
+        return np.sqrt((pinch * pinch).sum(axis=2)) / palm[:, None]
+
+    @cached_property
+    def palm_normal(self):
+        a = self.points[:, INDEX_MCP] - self.wrist
+        b = self.points[:, PINKY_MCP] - self.wrist
+        normal = np.stack([a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1],
+                           a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2],
+                           a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]], axis=1)
+        length = np.sqrt((normal * normal).sum(axis=1, keepdims=True))
+        length[length == 0] = 1.0
+        return normal / length
+
+    @cached_property
+    def direction(self):
+        dx, dy = (self.points[:, MIDDLE_MCP, :2] - self.wrist[:, :2]).T
+        vertical = np.abs(dy) >= np.abs(dx)
+        return np.where(vertical, np.where(dy < 0, 0, 2), np.where(dx > 0, 1, 3))
+
+
+def _fingers(rule, key, name):
+    mask = np.zeros(5, dtype=bool)
+    for finger in rule.get(key, ()):
+        if finger not in FINGERS:
+            raise ValueError(f"Pose '{name}': unknown finger '{finger}'")
+        mask[FINGERS.index(finger)] = True
+    return mask
+
+
+class PoseEngine:
+    """Evaluate a set of rule-based poses (see ``DEFAULT_POSES``) for a batch of hands.
+
+    The rules are compiled into one mask per condition, so ``evaluate``
+    checks every pose for every hand with a handful of array operations:
+    no per-landmark Python attribute lookups and no per-pose loop. An
+    engine only computes the primitives its rules use (``FIST`` below needs
+    just ``folded``).
+    """
+
+    def __init__(self, poses=None):
+        poses = DEFAULT_POSES if poses is None else poses
+        self.names = list(poses)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.extended = np.zeros((len(poses), 5), dtype=bool)
+        self.curled = np.zeros((len(poses), 5), dtype=bool)
+        self.min_folded = np.zeros(len(poses), dtype=int)
+        self.pinch = np.full((len(poses), 4), np.inf)
+        self.direction = np.full(len(poses), -1)
+        for i, (name, rule) in enumerate(poses.items()):
+            unknown = set(rule) - {"min_folded", "extended", "curled", "pinch", "direction"}
+            if unknown:
+                raise ValueError(f"Pose '{name}': unknown rule {sorted(unknown)}")
+            self.extended[i] = _fingers(rule, "extended", name)
+            self.curled[i] = _fingers(rule, "curled", name)
+            self.min_folded[i] = rule.get("min_folded", 0)
+            for finger, distance in rule.get("pinch", {}).items():
+                if finger not in FINGERS[1:]:
+                    raise ValueError(f"Pose '{name}': can't pinch the thumb with '{finger}'")
+                self.pinch[i, FINGERS.index(finger) - 1] = distance
+            if "direction" in rule:
+                if rule["direction"] not in DIRECTIONS:
+                    raise ValueError(f"Pose '{name}': direction must be one of {DIRECTIONS}")
+                self.direction[i] = DIRECTIONS.index(rule["direction"])
+
+    def matrix(self, points):
+        """``(N, poses)`` bool array: which poses each of N hands shows."""
+        p = points if isinstance(points, PosePrimitives) else PosePrimitives(points)
+        matches = np.ones((len(p.points), len(self.names)), dtype=bool)
+        # Only the conditions some rule uses are evaluated
+        if self.min_folded.any():
+            matches &= p.folded.sum(axis=1)[:, None] >= self.min_folded
+        if self.extended.any() or self.curled.any():
+            ext = p.extended[:, None, :]
+            matches &= (ext | ~self.extended).all(axis=2) & (~ext | ~self.curled).all(axis=2)
+        if np.isfinite(self.pinch).any():
+            matches &= (p.pinch[:, None, :] <= self.pinch).all(axis=2)
+        if (self.direction >= 0).any():
+            matches &= (self.direction < 0) | (p.direction[:, None] == self.direction)
+        return matches
+
+    def evaluate(self, points):
+        """``{pose: (N,) bool array}`` for N hands (or N frames of one hand)."""
+        matches = self.matrix(points)
+        return {name: matches[:, i] for i, name in enumerate(self.names)}
+
+    def classify(self, points):
+        """First matching pose name (in rule order) per hand, or None."""
+        matches = self.matrix(points)
+        first = matches.argmax(axis=1)
+        return [self.names[i] if row[i] else None for i, row in zip(first, matches)]
+
+
+def load_poses(path):
+    """Pose rules from a JSON file shaped like ``DEFAULT_POSES``."""
+    with open(path) as f:
+        return json.load(f)
+
+
+POSES = PoseEngine()
+FIST = PoseEngine({"fist": DEFAULT_POSES["fist"]})
+
+
+def is_fist(hand):
+    """Single-hand convenience: does ``hand`` (handLms, ``.landmark`` list or array) make a fist?"""
+    return bool(FIST.matrix(hand_points(hand if isinstance(hand, np.ndarray) else [hand]))[0, 0])
+
@@ -0,0 +1,200 @@
+import datetime
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+
+MODELS_DIR = "models"
+MANIFEST = "manifest.json"
+
+
+def _leaf_values_are_counts():
+    # sklearn < 1.4 keeps raw class counts in tree_.value, newer versions fractions
+    import sklearn
+    major, minor = (int(p) for p in sklearn.__version__.split(".")[:2])
+    return (major, minor) < (1, 4)
+
+
+def _rebuild_tree(tree, values, weighted):
+    """A copy of ``tree`` with new leaf ``values`` (node_count, 1, n_classes)."""
+    from sklearn.tree._tree import Tree
+    state = tree.__getstate__()
+    nodes = state["nodes"].copy()
+    nodes["weighted_n_node_samples"] = weighted
+    new_tree = Tree(tree.n_features, np.array([values.shape[2]], dtype=np.intp), 1)
+    new_tree.__setstate__({"max_depth": state["max_depth"], "node_count": state["node_count"],
+                           "nodes": nodes, "values": np.ascontiguousarray(values)})
+    return new_tree
+
+
+def update_trees(model, X, y, classes):
+    """Fold new samples into the existing trees' leaves, widening them to ``classes``.
+
+    The tree structure is kept; each new row is pushed down every tree and
+    counted in the leaf it reaches. Old trees therefore start voting for
+    new gestures, or new users' variants of old ones, without being rebuilt.
+    """
+    classes = np.asarray(classes)
+    old_classes = np.asarray(model.classes_)
+    column = np.searchsorted(classes, old_classes)
+    y_index = np.searchsorted(classes, np.asarray(y))
+    X = np.asarray(X, dtype=np.float32)
+    raw_counts = _leaf_values_are_counts()
+
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        weighted = tree.weighted_n_node_samples.copy()
+        values = tree.value[:, 0, :]
+        counts = np.zeros((tree.node_count, len(classes)))
+        counts[:, column] = values if raw_counts else values * weighted[:, None]
+
+        if len(X):
+            leaves = tree.apply(X)
+            np.add.at(counts, (leaves, y_index), 1.0)
+            np.add.at(weighted, leaves, 1.0)
+
+        if raw_counts:
+            new_values = counts
+        else:
+            totals = counts.sum(axis=1, keepdims=True)
+            totals[totals == 0] = 1.0
+            new_values = counts / totals
+        estimator.tree_ = _rebuild_tree(tree, new_values[:, None, :], weighted)
+        estimator.n_classes_ = len(classes)
+        estimator.classes_ = np.arange(len(classes), dtype=np.float64)
+
+    model.classes_ = classes
+    model.n_classes_ = len(classes)
+    return model
+
+
+def replay_sample(X, y, classes, per_class, rng):
+    """Indices of up to ``per_class`` rows per class (with replacement for small classes)."""
+    y = np.asarray(y)
+    picked = []
+    for label in classes:
+        rows = np.flatnonzero(y == label)
+        if len(rows):
+            picked.append(rng.choice(rows, per_class, replace=len(rows) < per_class))
+    return np.concatenate(picked) if picked else np.empty(0, dtype=np.intp)
+
+
+def grow_forest(model, X_old, y_old, X_new, y_new, n_trees=20, per_class=None,
+                random_state=None):
+    """Incrementally update a fitted RandomForestClassifier with new samples.
+
+    1. existing trees absorb the new rows into their leaf statistics (and
+       gain columns for new labels);
+    2. ``n_trees`` extra trees are trained on the new rows plus a
+       class-balanced replay sample of the old data, so rare and new
+       gestures get as many rows as common ones, and appended to the forest.
+
+    Only the new rows and the replay sample are touched; cost does not grow
+    with the full dataset beyond the replay sampling.
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(random_state)
+    y_new = np.asarray(y_new).astype(str)
+    y_old = np.asarray(y_old).astype(str)
+    classes = np.union1d(np.asarray(model.classes_).astype(str), np.unique(y_new))
+    update_trees(model, X_new, y_new, classes)
+
+    if n_trees > 0:
+        new_counts = np.array([(y_new == c).sum() for c in classes])
+        per_class = per_class or max(50, int(new_counts.max()))
+        # Top every class up to per_class rows from the old data
+        replay = replay_sample(X_old, y_old, classes, per_class, rng)
+        X_fit = np.concatenate([np.asarray(X_new, dtype=np.float32),
+                                np.asarray(X_old, dtype=np.float32)[replay]])
+        y_fit = np.concatenate([y_new, y_old[replay]])
+        missing = set(classes) - set(np.unique(y_fit))
+        if missing:
+            raise ValueError(f"No samples for {sorted(missing)}; cannot grow the forest")
+
+        extra = RandomForestClassifier(n_estimators=n_trees,
+                                       random_state=int(rng.integers(2 ** 31)))
+        extra.fit(X_fit, y_fit)
+        model.estimators_.extend(extra.estimators_)
+        model.n_estimators = len(model.estimators_)
+    return model
+
+
+# === Versioned artifacts ===
+def load_manifest(models_dir=MODELS_DIR):
+    path = os.path.join(models_dir, MANIFEST)
+    if not os.path.exists(path):
+        return {"versions": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def find_version(manifest, sha1, models_dir=MODELS_DIR):
+    """The manifest version whose file has content digest ``sha1``, or None."""
+    for entry in reversed(manifest["versions"]):
+        digest = entry.get("sha1")
+        path = os.path.join(models_dir, entry["file"])
+        if digest is None and os.path.exists(path):
+            with open(path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+        if digest == sha1:
+            return entry["version"]
+    return None
+
+
+def save_version(model, info, models_dir=MODELS_DIR, deploy_path="gesture_classifier.pkl",
+                 parent=None):
+    """Write ``models/gesture_classifier-vNNNN.pkl``, record it in the manifest and deploy it.
+
+    ``info`` describes the data the version saw (path and row ranges), the
+    training mode and timing; it is stored alongside the version number, the
+    file's sha1, tree count (None for models that aren't ensembles), classes
+    and the parent version. ``parent`` is ``{"file", "sha1"}`` of the model
+    this one was grown from; its version is looked up by content, so a model
+    replaced outside the manifest gets no parent version. Models trained from
+    scratch have the previous version as parent.
+    """
+    os.makedirs(models_dir, exist_ok=True)
+    manifest = load_manifest(models_dir)
+    last = manifest["versions"][-1]["version"] if manifest["versions"] else None
+    version = (last or 0) + 1
+    filename = f"gesture_classifier-v{version:04d}.pkl"
+    blob = pickle.dumps(model)
+    with open(os.path.join(models_dir, filename), "wb") as f:
+        f.write(blob)
+
+    entry = {
+        "version": version,
+        "file": filename,
+        "sha1": hashlib.sha1(blob).hexdigest(),
+        "parent": last,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "n_estimators": len(getattr(model, "estimators_", [])) or None,
+        "classes": [str(c) for c in model.classes_],
+    }
+    if parent is not None:
+        entry["parent"] = find_version(manifest, parent["sha1"], models_dir)
+        entry["parent_file"] = parent["file"]
+        entry["parent_sha1"] = parent["sha1"]
+        if entry["parent"] is None:
+            print(f"⚠️ {parent['file']} is not a recorded version; v{version} has no parent version")
+    entry.update(info)
+    manifest["versions"].append(entry)
+    tmp = os.path.join(models_dir, MANIFEST + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(models_dir, MANIFEST))
+
+    if deploy_path:
+        shutil.copyfile(os.path.join(models_dir, filename), deploy_path)
+    return entry
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -0,0 +1,72 @@
+import numpy as np
+
+NUM_LANDMARKS = 21
+NUM_FEATURES = NUM_LANDMARKS * 3  # x, y, z per landmark
+WRIST = 0
+MIDDLE_MCP = 9
+
+
+def _landmark_list(hand):
+    # Accept a MediaPipe NormalizedLandmarkList (handLms) or its .landmark list
+    return getattr(hand, "landmark", hand)
+
+
+def extract_into(hand, out):
+    """Write the 63 features of one hand into ``out`` (any float array of 63 elements).
+
+    Same layout as ``feature_extractor.extract_features`` (x0, y0, z0, x1, ...),
+    but no intermediate array and no reshape: ``out`` is typically a row of a
+    buffer allocated once at startup. A ``(21, 3)`` ndarray (e.g. from a
+    recording) is copied without going through Python objects.
+    """
+    if isinstance(hand, np.ndarray):
+        np.copyto(out.reshape(NUM_LANDMARKS, 3), hand.reshape(NUM_LANDMARKS, 3), casting="same_kind")
+    else:
+        out[:] = [c for lm in _landmark_list(hand) for c in (lm.x, lm.y, lm.z)]
+    return out
+
+
+def extract_batch(hands, out=None, normalized=False):
+    """Stack the features of N hands (or N frames) into one ``(N, 63)`` float32 array.
+
+    Pass a preallocated ``out`` with at least N rows to avoid allocating; the
+    returned array is a view of its first N rows, ready for a single
+    ``model.predict`` call.
+    """
+    n = len(hands)
+    if out is None:
+        out = np.empty((n, NUM_FEATURES), dtype=np.float32)
+    elif out.shape[0] < n:
+        raise ValueError(f"Output buffer has {out.shape[0]} rows, need {n}")
+    rows = out[:n]
+    if n and isinstance(hands, np.ndarray):
+        np.copyto(rows, hands.reshape(n, NUM_FEATURES), casting="same_kind")
+    elif n:
+        rows[:] = [[c for lm in _landmark_list(hand) for c in (lm.x, lm.y, lm.z)]
+                   for hand in hands]
+    if normalized:
+        normalize(rows, out=rows)
+    return rows
+
+
+def normalize(features, out=None):
+    """Wrist-relative, scale-normalized features for a ``(N, 63)`` (or ``(63,)``) array.
+
+    Every landmark is translated so the wrist is at the origin and divided by
+    the wrist → middle-finger MCP distance, which makes the features invariant
+    to where the hand is in the frame and how far it is from the camera.
+    Works in place when ``out is features``.
+    """
+    features = np.asarray(features)
+    if out is None:
+        out = np.empty(features.shape, dtype=np.float32)
+    pts = features.reshape(-1, NUM_LANDMARKS, 3)
+    dst = out.reshape(-1, NUM_LANDMARKS, 3)
+
+    wrist = pts[:, WRIST:WRIST + 1, :].copy()
+    scale = np.linalg.norm(pts[:, MIDDLE_MCP, :] - wrist[:, 0, :], axis=1)
+    scale[scale == 0] = 1.0
+
+    np.subtract(pts, wrist, out=dst)
+    dst /= scale[:, None, None]
+    return out
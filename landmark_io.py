@@ -0,0 +1,193 @@
+import struct
+
+import numpy as np
+
+# File layout (little-endian):
+#   header:  b"SVLM" | uint16 version | uint16 landmarks per hand
+#   record:  float64 timestamp | uint8 key | uint8 n_hands
+#            n_hands × (uint8 handedness | float32[21 * 3] x, y, z)
+MAGIC = b"SVLM"
+VERSION = 1
+NUM_LANDMARKS = 21
+NO_KEY = 255  # what cv2.waitKey(1) & 0xFF returns when nothing was pressed
+
+_HEADER = struct.Struct("<4sHH")
+_RECORD = struct.Struct("<dBB")
+_HAND_SIZE = 1 + NUM_LANDMARKS * 3 * 4
+_HANDEDNESS = {"Left": 0, "Right": 1}
+_HANDEDNESS_LABELS = {0: "Left", 1: "Right"}
+
+
+# === MediaPipe-shaped result objects ===
+# Replayed results expose the attributes the scripts use from
+# hands.process(): result.multi_hand_landmarks[i].landmark[j].x/.y/.z and
+# result.multi_handedness[i].classification[0].label.
+class ReplayLandmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class ReplayHand:
+    """One hand: ``.landmark`` list like a NormalizedLandmarkList, plus ``.points`` (21, 3)."""
+
+    def __init__(self, points):
+        self.points = points
+        self.landmark = [ReplayLandmark(float(x), float(y), float(z)) for x, y, z in points]
+
+
+class _Classification:
+    def __init__(self, label):
+        self.label = label
+        self.score = 1.0
+
+
+class ReplayHandedness:
+    def __init__(self, label):
+        self.classification = [_Classification(label)]
+
+
+class ReplayResult:
+    def __init__(self, hands=None, handedness=None):
+        # MediaPipe reports None (not an empty list) when no hand is found
+        self.multi_hand_landmarks = hands or None
+        self.multi_handedness = handedness or None
+
+
+def result_points(result):
+    """``(n_hands, 21, 3)`` float32 array and handedness labels of a hands.process() result."""
+    hands = result.multi_hand_landmarks if result is not None else None
+    if not hands:
+        return np.empty((0, NUM_LANDMARKS, 3), dtype=np.float32), []
+    points = np.empty((len(hands), NUM_LANDMARKS, 3), dtype=np.float32)
+    for i, handLms in enumerate(hands):
+        if hasattr(handLms, "points"):
+            points[i] = handLms.points
+        else:
+            points[i] = [(lm.x, lm.y, lm.z) for lm in handLms.landmark]
+    return points, [_label(result, i) for i in range(len(hands))]
+
+
+def _label(result, i):
+    try:
+        return result.multi_handedness[i].classification[0].label
+    except (AttributeError, IndexError, TypeError):
+        return None
+
+
+def hand_sides(result):
+    """``"Left"``/``"Right"`` for each hand in ``result.multi_hand_landmarks``, in the same order.
+
+    MediaPipe's handedness label is used as is. When it is missing, or both
+    hands got the same label (it happens when hands cross), the hand whose
+    wrist is further left in the image is taken as "Left".
+    """
+    hands = result.multi_hand_landmarks if result is not None else None
+    if not hands:
+        return []
+    labels = [_label(result, i) for i in range(len(hands))]
+    if len(hands) == 1:
+        return [labels[0] or "Right"]
+    if len(set(labels)) < len(labels) or None in labels:
+        order = sorted(range(len(hands)), key=lambda i: hands[i].landmark[0].x)
+        labels = [None] * len(hands)
+        for rank, i in enumerate(order):
+            labels[i] = "Left" if rank == 0 else "Right"
+    return labels
+
+
+def make_result(points, labels=None):
+    """Build a ReplayResult from a ``(n_hands, 21, 3)`` array."""
+    if len(points) == 0:
+        return ReplayResult()
+    labels = labels or [None] * len(points)
+    hands = [ReplayHand(p) for p in points]
+    handedness = [ReplayHandedness(label) for label in labels] if any(labels) else None
+    return ReplayResult(hands, handedness)
+
+
+# === Writer ===
+def encode_header():
+    return _HEADER.pack(MAGIC, VERSION, NUM_LANDMARKS)
+
+
+def encode_record(timestamp, result, key=NO_KEY):
+    """One frame in .svlm record layout (also the sign_server landmark stream format)."""
+    points, labels = result_points(result)
+    key = NO_KEY if key is None else key & 0xFF
+    parts = [_RECORD.pack(timestamp, key, len(points))]
+    for p, label in zip(points, labels):
+        parts.append(bytes((_HANDEDNESS.get(label, 255),)))
+        parts.append(p.astype("<f4", copy=False).tobytes())
+    return b"".join(parts)
+
+
+class LandmarkRecorder:
+    """Append timestamped hands.process() results (and key presses) to a .svlm file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._f = open(path, "wb")
+        self._f.write(encode_header())
+        self.frames = 0
+
+    def write(self, timestamp, result, key=NO_KEY):
+        self._f.write(encode_record(timestamp, result, key))
+        self.frames += 1
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# === Reader ===
+def read_header(f, name="stream"):
+    """Read and check the .svlm header from a binary file-like object."""
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{name} is not a SilentVoice landmark recording")
+    magic, version, n_landmarks = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError(f"{name} is not a SilentVoice landmark recording")
+    if version != VERSION or n_landmarks != NUM_LANDMARKS:
+        raise ValueError(f"Unsupported recording format (version {version}, "
+                         f"{n_landmarks} landmarks)")
+
+
+def read_records(f):
+    """Yield ``(timestamp, key, points, labels)`` for every record after the header.
+
+    ``f`` is any binary file-like object (a file, or ``socket.makefile("rb")``).
+    """
+    while True:
+        head = f.read(_RECORD.size)
+        if len(head) < _RECORD.size:
+            return
+        timestamp, key, n_hands = _RECORD.unpack(head)
+        body = f.read(n_hands * _HAND_SIZE)
+        if len(body) < n_hands * _HAND_SIZE:
+            return  # truncated last frame (recording was interrupted)
+        points = np.empty((n_hands, NUM_LANDMARKS, 3), dtype=np.float32)
+        labels = []
+        for i in range(n_hands):
+            chunk = body[i * _HAND_SIZE:(i + 1) * _HAND_SIZE]
+            labels.append(_HANDEDNESS_LABELS.get(chunk[0]))
+            points[i] = np.frombuffer(chunk, dtype="<f4", offset=1).reshape(NUM_LANDMARKS, 3)
+        yield timestamp, key, points, labels
+
+
+def read_landmarks(path):
+    """Yield ``(timestamp, key, result)`` for every frame of a .svlm recording."""
+    with open(path, "rb") as f:
+        read_header(f, path)
+        for timestamp, key, points, labels in read_records(f):
+            yield timestamp, key, make_result(points, labels)
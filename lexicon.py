@@ -0,0 +1,227 @@
+"""Memory-mapped prefix trie for word completion in word and phrase modes.
+
+A lexicon file (``lexicon.svlx``) holds a trie over A–Z whose nodes are
+numbered breadth-first, so the children of a node are one contiguous run.
+Every node stores the ids of the ``top_k`` most frequent words below it, and
+word ids are frequency ranks, so completing a prefix is one walk down the
+trie plus reading a precomputed list: no search, no sorting, a few
+microseconds. The file is memory-mapped and used in place.
+
+Layout (little-endian):
+    header   b"SVLX" | uint16 version | uint16 top_k | uint32 nodes | uint32 words | uint32 blob bytes
+    first    int32[nodes + 1]    children of node i are nodes first[i] .. first[i + 1] - 1
+    chars    uint8[nodes]        letter on the edge into each node (padded to 4 bytes)
+    top      int32[nodes * top_k] most frequent word ids below each node, -1 padded
+    offsets  uint32[words + 1]   word i is blob[offsets[i]:offsets[i + 1]]
+    blob     ASCII words, most frequent first
+
+    python lexicon.py build lexicon_words.txt lexicon.svlx
+    python lexicon.py complete lexicon.svlx HEL
+"""
+import argparse
+import mmap
+import struct
+
+MAGIC = b"SVLX"
+VERSION = 1
+TOP_K = 16
+_HEADER = struct.Struct("<4sHHIII")
+
+
+def read_words(path):
+    """Words ranked by frequency from a text file.
+
+    One word per line, most frequent first, or ``word count`` lines in any
+    order. Words with anything but letters are skipped; case is ignored.
+    """
+    counts = {}
+    with open(path) as f:
+        for line_no, line in enumerate(f):
+            parts = line.split()
+            if not parts or not parts[0].isascii() or not parts[0].isalpha():
+                continue
+            word = parts[0].upper()
+            weight = float(parts[1]) if len(parts) > 1 else -line_no
+            counts[word] = max(weight, counts.get(word, weight))
+    return sorted(counts, key=lambda w: -counts[w])
+
+
+def build_lexicon(words, path, top_k=TOP_K):
+    """Write ``words`` (most frequent first) as a lexicon file. Returns the node count."""
+    # Dict trie: node = [children dict, word id or None]
+    root = [{}, None]
+    for word_id, word in enumerate(words):
+        node = root
+        for ch in word:
+            node = node[0].setdefault(ch, [{}, None])
+        if node[1] is None:
+            node[1] = word_id
+
+    # Breadth-first numbering: each node's children become a contiguous run
+    order = [root]
+    chars = [0]
+    first = []
+    for node in order:
+        first.append(len(order))
+        for ch in sorted(node[0]):
+            order.append(node[0][ch])
+            chars.append(ord(ch))
+    first.append(len(order))
+
+    # Top-k word ids below every node, children before parents
+    top = [None] * len(order)
+    for i in range(len(order) - 1, -1, -1):
+        ids = [] if order[i][1] is None else [order[i][1]]
+        for child in range(first[i], first[i + 1]):
+            ids.extend(top[child])
+        top[i] = sorted(ids)[:top_k]
+
+    blob = "".join(words).encode("ascii")
+    offsets = [0]
+    for word in words:
+        offsets.append(offsets[-1] + len(word))
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, top_k, len(order), len(words), len(blob)))
+        f.write(struct.pack(f"<{len(first)}i", *first))
+        f.write(bytes(chars) + bytes(-len(chars) % 4))
+        flat = [w for ids in top for w in ids + [-1] * (top_k - len(ids))]
+        f.write(struct.pack(f"<{len(flat)}i", *flat))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        f.write(blob)
+    return len(order)
+
+
+class Lexicon:
+    """Read-only view of a lexicon file; ``complete`` returns the top-k words for a prefix."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.top_k, self.n_nodes, self.n_words, blob_len = \
+            _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a SilentVoice lexicon")
+        if version != VERSION:
+            raise ValueError(f"Unsupported lexicon version in {path}: {version}")
+        view = memoryview(self._mm)
+        offset = _HEADER.size
+        self._first = view[offset:offset + 4 * (self.n_nodes + 1)].cast("i")
+        offset += 4 * (self.n_nodes + 1)
+        self._chars_at = offset  # searched with mmap.find, no copy
+        offset += self.n_nodes + (-self.n_nodes % 4)
+        self._top = view[offset:offset + 4 * self.n_nodes * self.top_k].cast("i")
+        offset += 4 * self.n_nodes * self.top_k
+        self._offsets = view[offset:offset + 4 * (self.n_words + 1)].cast("I")
+        offset += 4 * (self.n_words + 1)
+        self._blob_at = offset
+
+    def _node(self, prefix):
+        node = 0
+        for ch in prefix.upper().encode("ascii", "replace"):
+            start = self._chars_at + self._first[node]
+            end = self._chars_at + self._first[node + 1]
+            at = self._mm.find(bytes((ch,)), start, end)
+            if at < 0:
+                return -1
+            node = at - self._chars_at
+        return node
+
+    def word(self, word_id):
+        start = self._blob_at + self._offsets[word_id]
+        return self._mm[start:start + self._offsets[word_id + 1] - self._offsets[word_id]].decode()
+
+    def complete(self, prefix, k=3, length=None):
+        """Up to ``k`` most frequent words starting with ``prefix`` (the prefix itself included).
+
+        With ``length`` only words of exactly that many letters are returned;
+        they come from the node's stored top ``top_k``, so rare words of the
+        right length may be missing.
+        """
+        node = self._node(prefix)
+        if node < 0:
+            return []
+        words = []
+        base = node * self.top_k
+        for word_id in self._top[base:base + self.top_k]:
+            if word_id < 0:
+                break
+            word = self.word(word_id)
+            if length is None or len(word) == length:
+                words.append(word)
+                if len(words) == k:
+                    break
+        return words
+
+    def next_letters(self, prefix):
+        """``(letter, weight)`` for every letter that can follow ``prefix``, most likely first.
+
+        The weight of a letter sums 1 / rank over the top words below it, a
+        Zipf estimate of how often the words through that letter are used.
+        """
+        node = self._node(prefix)
+        if node < 0:
+            return []
+        letters = []
+        for child in range(self._first[node], self._first[node + 1]):
+            base = child * self.top_k
+            weight = sum(1.0 / (word_id + 1) for word_id in self._top[base:base + self.top_k]
+                         if word_id >= 0)
+            letters.append((chr(self._mm[self._chars_at + child]), weight))
+        letters.sort(key=lambda lw: -lw[1])
+        return letters
+
+    def close(self):
+        self._first.release()
+        self._top.release()
+        self._offsets.release()
+        self._mm.close()
+
+
+def add_lexicon_args(parser):
+    """Word prediction options shared by the letter-spelling scripts."""
+    parser.add_argument("--lexicon", default="lexicon.svlx",
+                        help="word list for completions in word/phrase mode (see lexicon.py)")
+    parser.add_argument("--suggestions", type=int, default=3, choices=range(0, 4),
+                        help="completions offered after each letter (0 turns prediction off)")
+
+
+def open_lexicon(args):
+    """The lexicon selected by ``args``, or None when nothing uses it or there is none."""
+    if not args.suggestions and getattr(args, "scan", None) != "predictive":
+        return None
+    try:
+        return Lexicon(args.lexicon)
+    except FileNotFoundError:
+        print(f"⚠️ No lexicon at {args.lexicon}; word prediction is off "
+              f"(build one with lexicon.py build)")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="build a lexicon from a word list")
+    build.add_argument("words", help="one word per line (most frequent first) or 'word count' lines")
+    build.add_argument("lexicon")
+    build.add_argument("--top-k", type=int, default=TOP_K, help="completions stored per prefix")
+    complete = sub.add_parser("complete", help="show completions of a prefix")
+    complete.add_argument("lexicon")
+    complete.add_argument("prefix")
+    complete.add_argument("-k", type=int, default=5)
+    complete.add_argument("--length", type=int)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        words = read_words(args.words)
+        nodes = build_lexicon(words, args.lexicon, args.top_k)
+        print(f"✅ {args.lexicon}: {len(words)} words, {nodes} trie nodes")
+    else:
+        lexicon = Lexicon(args.lexicon)
+        print(" ".join(lexicon.complete(args.prefix, args.k, args.length)) or "(no completions)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Runtime metrics and trace spans for the recognition loops.
+
+Off unless asked for. FrameIO then keeps ``metrics = None`` and every hook
+in the loops sits behind one ``is not None`` check, so a run without these
+flags does no extra work.
+
+    --metrics-port 9108      http://127.0.0.1:9108/metrics (Prometheus text) and /metrics.json
+    --metrics-file m.json    JSON snapshot rewritten every --metrics-interval seconds
+    --trace trace.json       every timed stage as a span, Chrome trace format
+                             (open in chrome://tracing or ui.perfetto.dev)
+
+Recorded: per-stage timers (capture, detect, classify, session, display)
+as rolling histograms of the last ``window`` samples, FPS, the share of
+frames with a hand, prediction confidence and confirmation counts per kind
+(letter, gesture, completion, row). ``python -m benchmarks.bench_metrics``
+measures what it costs.
+"""
+import json
+import os
+import threading
+import time
+
+import numpy as np
+
+
+class Histogram:
+    """Rolling window of the last ``size`` samples plus all-time count and sum.
+
+    ``add`` is one store into a preallocated ring; percentiles are only
+    computed when a snapshot is taken.
+    """
+
+    def __init__(self, size=1024):
+        self.values = np.zeros(size)
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value):
+        self.values[self.count % self.size] = value
+        self.count += 1
+        self.total += value
+
+    def snapshot(self):
+        window = self.values[:min(self.count, self.size)]
+        if not len(window):
+            return {"count": 0}
+        p50, p90, p99 = np.percentile(window, [50, 90, 99])
+        return {"count": self.count, "sum": self.total, "mean": float(window.mean()),
+                "p50": float(p50), "p90": float(p90), "p99": float(p99), "max": float(window.max())}
+
+
+class Metrics:
+    """Counters, gauges and rolling histograms, plus span hooks for tracing.
+
+    Histograms named ``stage.*`` hold seconds. Each histogram is only written
+    by the thread that owns its stage, so recording takes no lock.
+    """
+
+    def __init__(self, window=1024):
+        self.window = window
+        self.histograms = {}
+        self.counters = {}
+        self.span_hooks = []
+        self.started = time.time()
+        self._last_frame = None
+
+    def _histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms.setdefault(name, Histogram(self.window))
+        return histogram
+
+    def observe(self, name, value):
+        self._histogram(name).add(value)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def timed(self, stage, start, **attrs):
+        """Close a stage timer started with ``time.perf_counter()``; returns the end time."""
+        end = time.perf_counter()
+        self._histogram("stage." + stage).add(end - start)
+        for hook in self.span_hooks:
+            hook(stage, start, end, attrs)
+        return end
+
+    def frame(self, hands, latency=None):
+        """One processed frame: FPS, hand presence and (live camera) capture → display latency."""
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            self._histogram("frame_interval").add(now - self._last_frame)
+        self._last_frame = now
+        self.count("frames")
+        if hands:
+            self.count("frames_with_hands")
+        if latency is not None:
+            self._histogram("latency").add(latency)
+
+    def event(self, kind, value=None):
+        """SignSession observer: a letter, gesture, completion or row was selected."""
+        self.count("confirmations." + kind)
+
+    def add_span_hook(self, hook):
+        """``hook(name, start, end, attrs)`` is called for every timed stage (perf_counter seconds)."""
+        self.span_hooks.append(hook)
+
+    def snapshot(self):
+        frames = self.counters.get("frames", 0)
+        interval = self.histograms.get("frame_interval")
+        fps = None
+        if interval is not None and interval.count:
+            fps = round(1.0 / interval.snapshot()["mean"], 2)
+        return {
+            "uptime_s": round(time.time() - self.started, 3),
+            "fps": fps,
+            "hand_present_ratio": round(self.counters.get("frames_with_hands", 0) / frames, 4)
+            if frames else None,
+            "counters": dict(self.counters),
+            "histograms": {name: h.snapshot() for name, h in list(self.histograms.items())},
+        }
+
+    def prometheus(self):
+        """The snapshot in Prometheus text format (histograms as summaries over the window)."""
+        snap = self.snapshot()
+        lines = []
+        for key in ("fps", "hand_present_ratio", "uptime_s"):
+            if snap[key] is not None:
+                lines.append(f"silentvoice_{key} {snap[key]}")
+        for name, value in sorted(snap["counters"].items()):
+            lines.append(f"silentvoice_{name.replace('.', '_')}_total {value}")
+        for name, h in sorted(snap["histograms"].items()):
+            metric = "silentvoice_" + name.replace(".", "_")
+            if not h["count"]:
+                continue
+            for q in ("p50", "p90", "p99"):
+                lines.append(f'{metric}{{quantile="0.{q[1:]}"}} {h[q]:.9g}')
+            lines.append(f"{metric}_sum {h['sum']:.9g}")
+            lines.append(f"{metric}_count {h['count']}")
+        return "\n".join(lines) + "\n"
+
+
+# === Exporters ===
+class MetricsFile:
+    """Rewrite a JSON snapshot every ``interval`` seconds (atomically, via a temp file)."""
+
+    def __init__(self, metrics, path, interval=5.0):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-file", daemon=True)
+        self._thread.start()
+
+    def flush(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.metrics.snapshot(), f, indent=2)
+        os.replace(tmp, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(1.0)
+        self.flush()
+
+
+def serve_metrics(metrics, port, host="127.0.0.1"):
+    """Serve ``/metrics`` (Prometheus text) and ``/metrics.json`` on a daemon thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body, kind = metrics.prometheus().encode(), "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body, kind = json.dumps(metrics.snapshot()).encode(), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", kind)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # no per-request lines in the console
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+class TraceWriter:
+    """Span hook writing Chrome trace events, one per line as they happen."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "w")
+        self._file.write("[\n")
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def __call__(self, name, start, end, attrs):
+        event = {"name": name, "ph": "X", "ts": round(start * 1e6, 1),
+                 "dur": round((end - start) * 1e6, 1), "pid": self._pid,
+                 "tid": threading.get_ident(), "args": attrs}
+        line = json.dumps(event) + ",\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            self._file.write("{}]\n")
+            self._file.close()
+
+
+class MetricsRuntime:
+    """The ``Metrics`` of a run with its exporters, started from the command-line flags."""
+
+    def __init__(self, args):
+        self.metrics = Metrics(args.metrics_window)
+        self.file = MetricsFile(self.metrics, args.metrics_file, args.metrics_interval) \
+            if args.metrics_file else None
+        self.server = serve_metrics(self.metrics, args.metrics_port) if args.metrics_port else None
+        self.trace = TraceWriter(args.trace) if args.trace else None
+        if self.trace is not None:
+            self.metrics.add_span_hook(self.trace)
+        if self.server is not None:
+            print(f"📈 Metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+        if self.server is not None:
+            self.server.shutdown()
+        if self.trace is not None:
+            self.trace.close()
+
+
+def add_metrics_args(parser):
+    parser.add_argument("--metrics-port", type=int, help="serve metrics over HTTP on this port")
+    parser.add_argument("--metrics-file", help="write a metrics snapshot (JSON) to this file")
+    parser.add_argument("--metrics-interval", type=float, default=5.0,
+                        help="seconds between --metrics-file writes (default 5)")
+    parser.add_argument("--metrics-window", type=int, default=1024,
+                        help="samples kept per latency histogram (default 1024)")
+    parser.add_argument("--trace", help="write timed stages as Chrome trace events to this file")
+
+
+def create_metrics(args):
+    """A MetricsRuntime when any metrics flag is set, else None."""
+    if getattr(args, "metrics_port", None) or getattr(args, "metrics_file", None) \
+            or getattr(args, "trace", None):
+        return MetricsRuntime(args)
+    return None
@@ -0,0 +1,266 @@
+"""Hot model reload: watch a model, load and validate new versions in the background, swap between frames.
+
+    python sign_to_speech.py --mode gesture --reload                 # watch gesture_classifier.npz/.pkl
+    python sign_to_speech.py --mode gesture --reload models/         # newest version in models/manifest.json
+    python fist_based_input.py --reload --reload-check letters.svds  # reject versions below --reload-min-accuracy
+
+A watcher thread checks the watched file's size and mtime every
+``interval`` seconds. Once they have changed and then held still for one
+interval (so a half-written file is never read), it loads and validates the
+new version off the frame loop: the model must predict on a probe batch (which
+also warms it up) and pass the optional ``check``. A version that passes
+waits in ``pending`` until the loop calls ``poll()`` between frames, which
+swaps it in with one assignment. A version that fails never goes live: the
+current model keeps running, i.e. the deploy is rolled back, and the
+version is retried only after the file changes again. ``rollback()`` goes
+back to the previously used model on demand.
+
+Loaded models stay in a small LRU cache keyed by file content, so switching
+back to a recent version (re-deploying it, or ``use(path)`` for per-user
+models) swaps it in without loading anything.
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+MODEL_EXTENSIONS = (".pkl", ".npz")
+
+
+def load_model_file(path):
+    """A model from a ``.npz`` flat-array export or a pickle."""
+    if path.endswith(".npz"):
+        from compiled_forest import CompiledForest
+        return CompiledForest.load(path)
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def resolve_model_path(target):
+    """The model file ``target`` currently stands for, or None.
+
+    ``target`` is a model file; a directory with a ``manifest.json`` (its
+    newest version, see incremental_training.py) or with model files (the
+    newest by mtime); or a name such as ``gesture_classifier``, resolved by
+    ``compiled_forest.classifier_path`` exactly as ``load_classifier`` does.
+    """
+    if os.path.isfile(target):
+        return target
+    if os.path.isdir(target):
+        from incremental_training import MANIFEST, load_manifest
+        if os.path.exists(os.path.join(target, MANIFEST)):
+            versions = load_manifest(target)["versions"]
+            return os.path.join(target, versions[-1]["file"]) if versions else None
+        files = [os.path.join(target, name) for name in os.listdir(target)
+                 if name.endswith(MODEL_EXTENSIONS)]
+        return max(files, key=os.path.getmtime) if files else None
+    from compiled_forest import classifier_path
+    return classifier_path(target)
+
+
+def _digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def accuracy_check(X, y, min_accuracy):
+    """A ``check`` rejecting models below ``min_accuracy`` on ``(X, y)``."""
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y).astype(str)
+
+    def check(model):
+        accuracy = float((np.asarray(model.predict(X)).astype(str) == y).mean())
+        if accuracy < min_accuracy:
+            return f"accuracy {accuracy:.3f} on the check set is below {min_accuracy:.3f}"
+        return None
+    return check
+
+
+class ModelRegistry:
+    """The live model of a frame loop plus the machinery to replace it without stopping.
+
+    ``model`` is read by the loop; only ``poll`` (called by the thread that
+    uses the model, between frames) changes it. ``prepare(model)`` may wrap
+    a freshly loaded model (e.g. in a cascade) and ``check(model)`` returns
+    None or the reason to reject it; both run on the watcher thread.
+    """
+
+    def __init__(self, model, source, n_features, load=load_model_file, prepare=None, check=None,
+                 cache_size=4, interval=1.0):
+        self.model = model
+        self.source = source
+        self.n_features = n_features
+        self.load = load
+        self.prepare = prepare
+        self.check = check
+        self.cache_size = cache_size
+        self.interval = interval
+        self.previous = None
+        self.swaps = 0
+        self.rejected = 0
+        self._cache = OrderedDict()  # content digest -> prepared model
+        self._pending = None
+        self._requested = None  # target handed over by use(), applied by the watcher thread
+        self._lock = threading.Lock()
+        # Only the watcher thread touches these (and _cache) once it runs
+        self._target = None
+        self._seen = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    def watch(self, target):
+        """Start watching ``target`` (see ``resolve_model_path``) on a background thread."""
+        if self._thread is not None:
+            self.use(target)
+            return self
+        self._target = target
+        path = resolve_model_path(target)
+        self._seen = self._stat(path)
+        if path is not None and self.model is not None:
+            self._remember(_digest(path), self.model)
+        self._thread = threading.Thread(target=self._run, name="model-watch", daemon=True)
+        self._thread.start()
+        return self
+
+    def use(self, target):
+        """Switch to another model (e.g. a per-user one): instant if it is cached, else loaded first."""
+        with self._lock:
+            self._requested = target
+        self._wake.set()
+
+    def rollback(self):
+        """Swap the previously used model back in at the next ``poll``."""
+        with self._lock:
+            if self.previous is not None:
+                self._pending = self.previous
+
+    def poll(self):
+        """Between frames: make a waiting validated model live. Returns True if the model changed."""
+        if self._pending is None:
+            return False
+        with self._lock:
+            if self._pending is None:
+                return False
+            (model, source), self._pending = self._pending, None
+            self.previous = (self.model, self.source)
+            self.model, self.source = model, source
+            self.swaps += 1
+        print(f"🔄 Now using {source}")
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {"source": self.source, "swaps": self.swaps, "rejected": self.rejected,
+                    "cached": len(self._cache)}
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+
+    # === Watcher thread ===
+    @staticmethod
+    def _stat(path):
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return path, st.st_mtime_ns, st.st_size
+
+    def _remember(self, digest, model):
+        self._cache[digest] = model
+        self._cache.move_to_end(digest)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _run(self):
+        candidate = None
+        switched = False
+        while not self._stop.is_set():
+            with self._lock:
+                requested, self._requested = self._requested, None
+            if requested is not None:
+                self._target, self._seen, candidate, switched = requested, None, None, True
+            try:
+                seen = self._stat(resolve_model_path(self._target))
+            except (OSError, ValueError):
+                seen = None  # e.g. a file replaced while the directory was listed
+            if seen is None:
+                switched = False  # a target that shows up later must settle first
+            if seen is not None and seen != self._seen:
+                # Load once size and mtime held still for a whole interval (not mid-write),
+                # or right away after use()
+                if seen == candidate or switched:
+                    self._seen = seen
+                    switched = False
+                    self._offer(seen[0])
+                candidate = seen
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def _offer(self, path):
+        try:
+            digest = _digest(path)
+            model = self._cache.get(digest)
+            if model is None:
+                model = self._validate(path)
+        except Exception as exc:
+            with self._lock:
+                self.rejected += 1
+                source = self.source
+            print(f"❌ Rejected {path}: {exc}; still using {source}")
+            return
+        self._remember(digest, model)
+        with self._lock:
+            if model is not self.model:
+                self._pending = (model, path)
+
+    def _validate(self, path):
+        start = time.perf_counter()
+        model = self.load(path)
+        if self.prepare is not None:
+            model = self.prepare(model)
+        # The probe also pays the first-call allocations, off the frame loop
+        labels = model.predict(np.zeros((2, self.n_features), dtype=np.float32))
+        if len(labels) != 2:
+            raise ValueError(f"predict returned {len(labels)} labels for 2 rows")
+        reason = self.check(model) if self.check is not None else None
+        if reason:
+            raise ValueError(reason)
+        print(f"📦 Loaded and validated {path} in {time.perf_counter() - start:.2f}s")
+        return model
+
+
+def add_reload_args(parser):
+    parser.add_argument("--reload", nargs="?", const="", metavar="PATH",
+                        help="swap in new model versions while running; watches the loaded model, "
+                             "or PATH (a model file or a models/ directory)")
+    parser.add_argument("--reload-interval", type=float, default=1.0,
+                        help="seconds between checks for a new model (default 1)")
+    parser.add_argument("--reload-check", metavar="DATA",
+                        help="feature store or CSV a new model must classify before it goes live")
+    parser.add_argument("--reload-min-accuracy", type=float, default=0.9,
+                        help="accuracy required on --reload-check data (default 0.9)")
+
+
+def create_registry(args, model, default_target, n_features, prepare=None):
+    """A watching ModelRegistry when ``--reload`` was given, else None."""
+    if args.reload is None:
+        return None
+    check = None
+    if args.reload_check:
+        from feature_store import load_dataset
+        check = accuracy_check(*load_dataset(args.reload_check), args.reload_min_accuracy)
+    target = args.reload or default_target
+    registry = ModelRegistry(model, resolve_model_path(target), n_features, prepare=prepare,
+                             check=check, interval=args.reload_interval)
+    print(f"👀 Watching {target} for new model versions")
+    return registry.watch(target)
@@ -0,0 +1,207 @@
+"""Search model families for the best accuracy / per-frame cost trade-off.
+
+    python model_search.py [--data gesture_data.svds] [--folds 5] [--workers 4] [--out search.json]
+    python model_search.py --no-save        # report only, keep the current model
+
+Every candidate is cross-validated and refit on all the data in a process
+pool. Once the pool has finished, single-row ``predict`` latency (p50) is
+timed one candidate at a time in the main process, so timings don't depend
+on ``--workers`` or on other candidates training on the same cores. Random
+forests also report the latency of their compiled flat-array form, which is
+what sign_to_speech runs. The
+accuracy/latency Pareto front is printed. The fastest candidate within
+``--tolerance`` of the best accuracy is saved as gesture_classifier.pkl, as a
+new version in models/.
+"""
+import argparse
+import json
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from feature_store import load_dataset
+
+FOREST_GRID = [{"n_estimators": n, "max_depth": d}
+               for n in (5, 10, 25, 50, 100) for d in (None, 6, 10)]
+CANDIDATES = (
+    [("random_forest", p) for p in FOREST_GRID]
+    + [("extra_trees", {"n_estimators": n}) for n in (10, 50)]
+    + [("logistic_regression", {"C": c}) for c in (0.1, 1.0, 10.0)]
+    + [("knn", {"n_neighbors": k}) for k in (1, 5)]
+    + [("nearest_centroid", {})]
+)
+
+_data = {}
+
+
+def build(family, params):
+    if family == "random_forest":
+        from sklearn.ensemble import RandomForestClassifier
+        return RandomForestClassifier(random_state=42, **params)
+    if family == "extra_trees":
+        from sklearn.ensemble import ExtraTreesClassifier
+        return ExtraTreesClassifier(random_state=42, **params)
+    if family == "logistic_regression":
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=2000, **params))
+    if family == "knn":
+        from sklearn.neighbors import KNeighborsClassifier
+        return KNeighborsClassifier(**params)
+    if family == "nearest_centroid":
+        from sklearn.neighbors import NearestCentroid
+        return NearestCentroid(**params)
+    raise ValueError(f"Unknown model family: {family}")
+
+
+def _load(data_path):
+    if data_path not in _data:
+        X, y = load_dataset(data_path)
+        _data[data_path] = (np.asarray(X, dtype=np.float32), np.asarray(y).astype(str))
+    return _data[data_path]
+
+
+def single_row_latency(predict, X, repeat):
+    times = np.empty(repeat)
+    for i in range(repeat):
+        row = X[i % len(X)].reshape(1, -1)
+        start = time.perf_counter()
+        predict(row)
+        times[i] = time.perf_counter() - start
+    return float(np.percentile(times, 50) * 1e6)
+
+
+def evaluate(job):
+    """Cross-validate and refit one candidate (runs in a worker process).
+
+    Returns the result and the pickled refit model; latency is timed later by ``time_candidate``.
+    """
+    family, params, data_path, folds = job
+    from sklearn.model_selection import StratifiedKFold, cross_val_score
+
+    X, y = _load(data_path)
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=0)
+    start = time.perf_counter()
+    scores = cross_val_score(build(family, params), X, y, cv=cv)
+    model = build(family, params).fit(X, y)
+    fit_s = time.perf_counter() - start
+
+    blob = pickle.dumps(model)
+    result = {
+        "family": family,
+        "params": params,
+        "cv_accuracy": round(float(scores.mean()), 4),
+        "cv_std": round(float(scores.std()), 4),
+        "size_kib": round(len(blob) / 1024, 1),
+        "cv_seconds": round(fit_s, 2),
+    }
+    return result, blob
+
+
+def time_candidate(result, model, X, repeat):
+    """Add single-row latencies to ``result``; run sequentially, with no other work on the cores."""
+    result["latency_us"] = round(single_row_latency(model.predict, X, repeat), 1)
+    if result["family"] == "random_forest":
+        from forest_compiler import compile_forest
+        compiled = compile_forest(model)
+        result["compiled_latency_us"] = round(single_row_latency(compiled.predict, X, repeat), 1)
+    return result
+
+
+def runtime_latency(result):
+    """Per-frame cost as deployed (compiled form for forests)."""
+    return result.get("compiled_latency_us", result["latency_us"])
+
+
+def pareto_front(results):
+    """Candidates not beaten on both accuracy and latency by any other."""
+    front = []
+    for r in sorted(results, key=lambda r: (runtime_latency(r), -r["cv_accuracy"])):
+        if not front or r["cv_accuracy"] > front[-1]["cv_accuracy"]:
+            front.append(r)
+    return front
+
+
+def choose(results, tolerance):
+    best = max(r["cv_accuracy"] for r in results)
+    eligible = [r for r in results if r["cv_accuracy"] >= best - tolerance]
+    return min(eligible, key=lambda r: (runtime_latency(r), r["size_kib"]))
+
+
+def describe(r):
+    params = ", ".join(f"{k}={v}" for k, v in r["params"].items())
+    return f"{r['family']}({params})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--data", help="feature store or CSV "
+                                       "(default gesture_data.svds if present, else gesture_data.csv)")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--repeat", type=int, default=300, help="timed single-row predictions")
+    parser.add_argument("--tolerance", type=float, default=0.005,
+                        help="accept candidates this close to the best CV accuracy (default 0.005)")
+    parser.add_argument("--out", help="write all results as JSON")
+    parser.add_argument("--no-save", action="store_true", help="don't replace gesture_classifier.pkl")
+    args = parser.parse_args()
+    data_path = args.data or ("gesture_data.svds" if os.path.isdir("gesture_data.svds")
+                              else "gesture_data.csv")
+
+    jobs = [(family, params, data_path, args.folds) for family, params in CANDIDATES]
+    print(f"🔎 Evaluating {len(jobs)} candidates on {data_path} with {args.workers} workers")
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        evaluated = list(pool.map(evaluate, jobs))
+
+    # Time after the pool is gone so no candidate is timed against another one's training
+    print(f"⏱️ Timing single-row predict ({args.repeat} rows per candidate)")
+    X, y = _load(data_path)
+    results, models = [], []
+    for result, blob in evaluated:
+        model = pickle.loads(blob)
+        results.append(time_candidate(result, model, X, args.repeat))
+        models.append(model)
+
+    print(f"\n{'candidate':<52} {'cv acc':>7} {'µs/row':>9} {'compiled':>9} {'KiB':>8}")
+    for r in sorted(results, key=lambda r: -r["cv_accuracy"]):
+        compiled = r.get("compiled_latency_us")
+        print(f"{describe(r):<52} {r['cv_accuracy']:>7.3f} {r['latency_us']:>9.1f} "
+              f"{compiled if compiled is not None else '-':>9} {r['size_kib']:>8.1f}")
+
+    front = pareto_front(results)
+    print("\n📈 Accuracy / latency Pareto front:")
+    for r in front:
+        print(f"  {describe(r):<50} acc {r['cv_accuracy']:.3f}  {runtime_latency(r):.1f} µs")
+
+    chosen = choose(results, args.tolerance)
+    print(f"\n🏆 Chosen: {describe(chosen)} (acc {chosen['cv_accuracy']:.3f}, "
+          f"{runtime_latency(chosen):.1f} µs/frame)")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"data": data_path, "results": results, "pareto": front,
+                       "chosen": chosen}, f, indent=2)
+        print(f"💾 Saved {args.out}")
+
+    if not args.no_save:
+        from incremental_training import save_version
+        model = models[results.index(chosen)]  # already refit on all the data
+        entry = save_version(model, {"mode": "search", "data": data_path, "rows": [0, len(y)],
+                                     "search": {k: chosen[k] for k in ("family", "params",
+                                                                       "cv_accuracy")}})
+        if os.path.exists("gesture_classifier.npz"):
+            if chosen["family"] == "random_forest":
+                from forest_compiler import compile_forest
+                compile_forest(model).save("gesture_classifier.npz")
+            else:
+                os.remove("gesture_classifier.npz")  # stale export of the previous forest
+        print(f"✅ Saved as gesture_classifier.pkl (models/{entry['file']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import numpy as np
+
+
+class MotionGate:
+    """Skip classification while the hand holds still.
+
+    ``lookup`` compares the new ``(N, 63)`` feature batch with the batch that
+    was last classified. If no coordinate moved by more than ``threshold``
+    (in normalized image units, so 0.01 is 1% of the frame) and the cached
+    prediction is younger than ``max_age`` seconds, the cached predictions are
+    returned and the classifier is not called. A change in the number of
+    hands always forces a re-evaluation.
+
+        predictions = gate.lookup(features, now)
+        if predictions is None:
+            predictions = model.predict(features)
+            gate.store(features, predictions, now)
+    """
+
+    def __init__(self, threshold=0.01, max_age=0.5):
+        self.threshold = threshold
+        self.max_age = max_age
+        self._features = None
+        self._scratch = None
+        self._predictions = None
+        self._time = None
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, features, now):
+        cached = self._features
+        if (cached is None or cached.shape != features.shape
+                or now - self._time > self.max_age):
+            self.misses += 1
+            return None
+        np.subtract(features, cached, out=self._scratch)
+        np.abs(self._scratch, out=self._scratch)
+        if self._scratch.max() > self.threshold:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._predictions
+
+    def store(self, features, predictions, now):
+        if self._features is None or self._features.shape != features.shape:
+            self._features = np.empty_like(features)
+            self._scratch = np.empty_like(features)
+        np.copyto(self._features, features)
+        self._predictions = predictions
+        self._time = now
+
+    def predict(self, model, features, now, predict=None):
+        """``model.predict(features)`` (or ``predict(features)``), or the cached result if the hand hasn't moved."""
+        predictions = self.lookup(features, now)
+        if predictions is None:
+            predictions = list((predict or model.predict)(features))
+            self.store(features, predictions, now)
+        return predictions
+
+    def reset(self):
+        self._features = None
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hit_rate, 3)}
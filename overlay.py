@@ -0,0 +1,132 @@
+import collections
+import threading
+
+import numpy as np
+
+from landmark_io import NO_KEY
+from pipeline import LatestQueue
+
+# Same edges and colors as mp.solutions.hands.HAND_CONNECTIONS / drawing_utils defaults
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8), (5, 9), (9, 10),
+    (10, 11), (11, 12), (9, 13), (13, 14), (14, 15), (15, 16), (13, 17), (0, 17),
+    (17, 18), (18, 19), (19, 20)])
+CONNECTION_COLOR = (224, 224, 224)
+LANDMARK_COLOR = (0, 0, 255)
+
+
+def draw_hand(frame, handLms):
+    """Draw one hand's skeleton: all 21 connections in one ``polylines`` call."""
+    import cv2
+    height, width = frame.shape[:2]
+    points = getattr(handLms, "points", None)
+    if points is None:
+        points = [(lm.x, lm.y) for lm in handLms.landmark]
+    pixels = (np.asarray(points, dtype=np.float32)[:, :2] * (width, height)).astype(np.int32)
+    cv2.polylines(frame, pixels[HAND_CONNECTIONS], False, CONNECTION_COLOR, 2)
+    for x, y in pixels:
+        cv2.circle(frame, (int(x), int(y)), 2, LANDMARK_COLOR, 2)
+
+
+class TextLayer:
+    """Pre-rendered HUD text, rebuilt only when its lines change.
+
+    ``lines`` is a list of ``(text, (x, y), scale, color, thickness)`` as
+    passed to ``cv2.putText``. The text is rendered once into a small layer
+    covering just its bounding box, with a mask of the drawn pixels. Each
+    frame then costs one masked copy (``cv2.copyTo``) instead of one
+    ``putText`` per line.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._layer = None
+        self._mask = None
+        self._box = None
+        self.rebuilds = 0
+
+    def draw(self, frame, lines):
+        import cv2
+        key = (frame.shape, tuple(lines))
+        if key != self._key:
+            self._build(frame.shape, lines)
+            self._key = key
+        if self._layer is not None:
+            y0, y1, x0, x1 = self._box
+            cv2.copyTo(self._layer, self._mask, frame[y0:y1, x0:x1])
+
+    def _build(self, shape, lines):
+        import cv2
+        self.rebuilds += 1
+        self._layer = None
+        boxes = []
+        for text, (x, y), scale, color, thickness in lines:
+            (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+            boxes.append((y - h - thickness, y + baseline + thickness, x - thickness, x + w + thickness))
+        if not boxes:
+            return
+        y0, y1, x0, x1 = np.array(boxes).T
+        y0, x0 = max(int(y0.min()), 0), max(int(x0.min()), 0)
+        y1, x1 = min(int(y1.max()), shape[0]), min(int(x1.max()), shape[1])
+        if y1 <= y0 or x1 <= x0:
+            return
+        canvas = np.zeros((y1 - y0, x1 - x0) + tuple(shape[2:]), dtype=np.uint8)
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        for text, (x, y), scale, color, thickness in lines:
+            org = (x - x0, y - y0)
+            cv2.putText(canvas, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+            cv2.putText(mask, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness)
+        self._box = (y0, y1, x0, x1)
+        self._layer = canvas
+        self._mask = mask
+
+
+class DisplayThread:
+    """``cv2.imshow`` and ``cv2.waitKey`` on their own thread.
+
+    ``show`` only hands the newest frame over (older undisplayed frames are
+    dropped), so a slow window system never holds back recognition. Key
+    presses are collected by the display thread and read with ``poll_key``.
+    All HighGUI calls for the window happen on this thread. macOS only allows
+    HighGUI on the main thread; use ``--render main`` there.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.frames = LatestQueue(1)
+        self.keys = collections.deque()
+        self.shown = 0
+        self._thread = threading.Thread(target=self._run, name="display", daemon=True)
+        self._thread.start()
+
+    def show(self, frame):
+        self.frames.put(frame)
+
+    def poll_key(self):
+        try:
+            return self.keys.popleft()
+        except IndexError:
+            return NO_KEY
+
+    @property
+    def dropped(self):
+        return self.frames.dropped
+
+    def _run(self):
+        import cv2
+        while True:
+            frame = self.frames.get(timeout=0.03)
+            if frame is not None:
+                cv2.imshow(self.window, frame)
+                self.shown += 1
+            elif self.frames.closed:
+                break
+            # waitKey also keeps the window responsive between frames
+            key = cv2.waitKey(1) & 0xFF
+            if key != NO_KEY:
+                self.keys.append(key)
+        cv2.destroyAllWindows()
+
+    def close(self, timeout=1.0):
+        self.frames.close()
+        self._thread.join(timeout)
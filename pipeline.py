@@ -0,0 +1,194 @@
+import collections
+import threading
+import time
+
+from landmark_io import hand_sides
+
+
+class LatestQueue:
+    """Bounded hand-off between pipeline stages.
+
+    When the queue is full, ``put`` discards the oldest item instead of
+    blocking, so a slow consumer always sees the most recent frame
+    ("latest frame wins") and stale frames never pile up.
+    """
+
+    def __init__(self, maxsize=1):
+        self._items = collections.deque(maxlen=maxsize)
+        self._cond = threading.Condition()
+        self.closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return the next item, or None once the queue is closed and drained."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self.closed, timeout):
+                return None
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class FramePacket:
+    """One camera frame as it moves through the pipeline."""
+
+    __slots__ = ("seq", "t_capture", "frame", "result", "predictions", "t_done", "key")
+
+    def __init__(self, seq, frame, t_capture=None):
+        self.seq = seq
+        self.frame = frame
+        self.t_capture = time.time() if t_capture is None else t_capture
+        self.result = None
+        self.predictions = None
+        self.t_done = None
+        self.key = None
+
+    @property
+    def hands(self):
+        if self.result is None or not self.result.multi_hand_landmarks:
+            return []
+        return self.result.multi_hand_landmarks
+
+    @property
+    def sides(self):
+        """Handedness ("Left"/"Right") of each hand in ``hands``."""
+        return hand_sides(self.result)
+
+
+class Stage(threading.Thread):
+    """Worker thread: take from ``inbox``, apply ``fn``, put on ``outbox``.
+
+    A stage without an inbox is a source: ``fn()`` is called repeatedly and
+    returning None ends the stream. Closing propagates downstream.
+    """
+
+    def __init__(self, name, fn, inbox, outbox):
+        super().__init__(name=name, daemon=True)
+        self.fn = fn
+        self.inbox = inbox
+        self.outbox = outbox
+        self.busy_time = 0.0
+        self.processed = 0
+        self.error = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            while not self._stop_event.is_set():
+                if self.inbox is None:
+                    start = time.perf_counter()
+                    out = self.fn()
+                    if out is None:
+                        break
+                else:
+                    item = self.inbox.get(timeout=0.1)
+                    if item is None:
+                        if self.inbox.closed:
+                            break
+                        continue
+                    start = time.perf_counter()
+                    out = self.fn(item)
+                self.busy_time += time.perf_counter() - start
+                if out is not None:
+                    self.processed += 1
+                    self.outbox.put(out)
+        except Exception as e:
+            self.error = e
+            print(f"❌ Pipeline stage '{self.name}' failed: {e}")
+        finally:
+            self.outbox.close()
+
+    def stop(self):
+        self._stop_event.set()
+
+
+class Pipeline:
+    """capture → landmark → classify stages, each on its own thread.
+
+    ``capture()`` returns a new FramePacket (or None at end of stream),
+    ``detect(packet)`` fills ``packet.result`` and ``classify(packet)``
+    fills ``packet.predictions``. The render/mode loop on the main thread
+    iterates over the pipeline to receive finished packets.
+
+    With ``threaded=False`` the same stages run one after another on the
+    caller's thread and no frame is ever dropped — used for replays and
+    video files, where results must be deterministic.
+    """
+
+    def __init__(self, capture, detect, classify=None, depth=1, threaded=True):
+        self.threaded = threaded
+
+        def detect_stage(packet):
+            detect(packet)
+            return packet
+
+        def classify_stage(packet):
+            if classify is not None:
+                classify(packet)
+            packet.t_done = time.time()
+            return packet
+
+        self.frames = LatestQueue(depth)
+        self.landmarks = LatestQueue(depth)
+        self.output = LatestQueue(depth)
+        self.stages = [
+            Stage("capture", capture, None, self.frames),
+            Stage("landmark", detect_stage, self.frames, self.landmarks),
+            Stage("classify", classify_stage, self.landmarks, self.output),
+        ]
+
+    def start(self):
+        if self.threaded:
+            for stage in self.stages:
+                stage.start()
+        return self
+
+    def __iter__(self):
+        if not self.threaded:
+            yield from self._run_inline()
+            return
+        while True:
+            packet = self.output.get(timeout=0.5)
+            if packet is None:
+                if self.output.closed:
+                    return
+                continue
+            yield packet
+
+    def _run_inline(self):
+        capture, detect, classify = (stage.fn for stage in self.stages)
+        while True:
+            packet = capture()
+            if packet is None:
+                return
+            yield classify(detect(packet))
+
+    def stop(self, timeout=1.0):
+        if not self.threaded:
+            return
+        for stage in self.stages:
+            stage.stop()
+        for q in (self.frames, self.landmarks, self.output):
+            q.close()
+        for stage in self.stages:
+            stage.join(timeout)
+
+    def stats(self):
+        return {
+            "stages": {s.name: {"processed": s.processed, "busy_s": round(s.busy_time, 3)}
+                       for s in self.stages},
+            "dropped": {"frames": self.frames.dropped, "landmarks": self.landmarks.dropped,
+                        "output": self.output.dropped},
+        }
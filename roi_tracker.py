@@ -0,0 +1,139 @@
+import time
+
+import cv2
+
+
+class RoiHandInput:
+    """Feed MediaPipe a small crop around the hand instead of the full frame.
+
+    After a frame with hands, the next frame is cropped to a square region of
+    interest around the landmarks (padded by ``padding`` × the hand size) and
+    downscaled so its longest side is at most ``work_size`` pixels. Without a
+    previous hand — or when the crop loses it — the whole frame is searched,
+    downscaled to at most ``search_size``. Every ``full_frame_interval``
+    frames a full-frame search also runs so a second hand entering the
+    picture is found.
+
+    ``hands`` runs in tracking mode and keeps its own hand ROI from frame to
+    frame in image coordinates, so the crop stays where it is while the hand
+    stays inside it (away from the border by ``margin`` × the crop size) and
+    does not shrink to less than a quarter of it. Only then does the graph
+    skip palm detection and just follow the hand. Full-frame searches go to
+    ``search_hands`` (a ``static_image_mode=True`` graph) so they never
+    disturb that tracking.
+
+    Landmarks are mapped back to full-frame normalized coordinates in place,
+    so ``extract_features``, the pose checks and ``draw_landmarks`` see exactly
+    what they would without cropping.
+    """
+
+    def __init__(self, hands, search_hands=None, work_size=256, search_size=640, padding=0.35,
+                 margin=0.1, full_frame_interval=30):
+        self.hands = hands
+        self.search_hands = search_hands if search_hands is not None else hands
+        self.work_size = work_size
+        self.search_size = search_size
+        self.padding = padding
+        self.margin = margin
+        self.full_frame_interval = full_frame_interval
+        self.roi = None  # (x0, y0, x1, y1) in pixels
+        self._since_full = 0
+        self._tracking = False  # the last crop frame found a hand in the current crop
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.fallbacks = 0
+        self.moves = 0
+        self.palm_skips = 0
+        self._seconds = {"tracked": 0.0, "detected": 0.0}
+
+    def process(self, frame):
+        """``hands.process`` for a BGR frame, with ROI tracking."""
+        height, width = frame.shape[:2]
+        self._since_full += 1
+        result = None
+
+        if self.roi is not None and self._since_full < self.full_frame_interval:
+            self.roi_frames += 1
+            tracked = self._tracking
+            start = time.perf_counter()
+            result = self._run(self.hands, frame, self.roi, self.work_size)
+            self._seconds["tracked" if tracked else "detected"] += time.perf_counter() - start
+            self.palm_skips += tracked
+            self._tracking = bool(result.multi_hand_landmarks)
+            if not self._tracking:
+                self.fallbacks += 1  # tracking lost: search the whole frame below
+                result = None
+
+        if result is None:
+            self.full_frames += 1
+            self._since_full = 0
+            result = self._run(self.search_hands, frame, (0, 0, width, height), self.search_size)
+
+        roi = self._next_roi(result, width, height)
+        if roi != self.roi:
+            if roi is not None and self.roi is not None:
+                self.moves += 1
+            self.roi = roi
+            self._tracking = False  # new crop geometry: the graph must detect again
+        return result
+
+    def _run(self, hands, frame, roi, max_side):
+        x0, y0, x1, y1 = roi
+        crop = frame[y0:y1, x0:x1]
+        crop_w, crop_h = x1 - x0, y1 - y0
+        scale = max_side / max(crop_w, crop_h)
+        if scale < 1.0:
+            crop = cv2.resize(crop, (max(1, round(crop_w * scale)), max(1, round(crop_h * scale))),
+                              interpolation=cv2.INTER_AREA)
+        result = hands.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+        if result.multi_hand_landmarks and (x0, y0, x1, y1) != (0, 0, frame.shape[1], frame.shape[0]):
+            self._to_full_frame(result, roi, frame.shape[1], frame.shape[0])
+        return result
+
+    @staticmethod
+    def _to_full_frame(result, roi, width, height):
+        x0, y0, x1, y1 = roi
+        sx, sy = (x1 - x0) / width, (y1 - y0) / height
+        ox, oy = x0 / width, y0 / height
+        for handLms in result.multi_hand_landmarks:
+            for lm in handLms.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+                lm.z = lm.z * sx  # MediaPipe z uses the same scale as x
+
+    def _next_roi(self, result, width, height):
+        hands = result.multi_hand_landmarks
+        if not hands:
+            return None
+        xs = [lm.x for handLms in hands for lm in handLms.landmark]
+        ys = [lm.y for handLms in hands for lm in handLms.landmark]
+        min_x, max_x = min(xs) * width, max(xs) * width
+        min_y, max_y = min(ys) * height, max(ys) * height
+        hand = max(max_x - min_x, max_y - min_y)
+        if self.roi is not None:
+            x0, y0, x1, y1 = self.roi
+            inset = self.margin * (x1 - x0)
+            if (x0 + inset <= min_x and max_x <= x1 - inset and y0 + inset <= min_y
+                    and max_y <= y1 - inset and 4 * hand >= x1 - x0):
+                return self.roi  # keep the crop still so the graph keeps tracking
+        size = hand * (1 + 2 * self.padding)
+        size = min(max(size, 32), max(width, height))
+        cx, cy = (min_x + max_x) / 2, (min_y + max_y) / 2
+        x0 = int(max(0, min(width - size, cx - size / 2)))
+        y0 = int(max(0, min(height - size, cy - size / 2)))
+        x1 = int(min(width, x0 + size))
+        y1 = int(min(height, y0 + size))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None
+        return x0, y0, x1, y1
+
+    def stats(self):
+        # palm_skips: crop frames tracked from the previous one instead of detected;
+        # tracked_ms/detected_ms are the measured MediaPipe times of both kinds
+        detected = self.roi_frames - self.palm_skips
+        return {"roi_frames": self.roi_frames, "full_frames": self.full_frames,
+                "fallbacks": self.fallbacks, "moves": self.moves, "palm_skips": self.palm_skips,
+                "tracked_ms": round(1000 * self._seconds["tracked"] / self.palm_skips, 2)
+                if self.palm_skips else None,
+                "detected_ms": round(1000 * self._seconds["detected"] / detected, 2)
+                if detected else None}
@@ -0,0 +1,144 @@
+"""Letter scanning orders for the fist-confirm selector.
+
+A scanner highlights one candidate per scroll step and a fist selects it.
+``alphabet`` is the original A–Z loop. ``frequency`` starts every letter at
+E, T, A, O, ... so common letters come up first. ``predictive`` orders the
+letters by how likely they are to follow the word typed so far (from the
+lexicon) and puts the remaining letters in frequency order after them. With
+``--scan-groups N`` the order is cut into rows of N letters: the scan first
+steps through the rows, a fist picks one, then it steps through that row's
+letters (row-column scanning).
+
+    python -m benchmarks.bench_scanning     # mean time per word for every strategy
+"""
+LETTERS = [chr(i) for i in range(65, 91)]
+# English letter frequency, most common first
+LETTER_FREQUENCY = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+STRATEGIES = ("alphabet", "frequency", "predictive")
+
+
+def alphabet_order(prefix=""):
+    return LETTERS
+
+
+def frequency_order(prefix=""):
+    return list(LETTER_FREQUENCY)
+
+
+class PredictiveOrder:
+    """Letters that can follow ``prefix`` in the lexicon, most likely first, then the rest."""
+
+    def __init__(self, lexicon):
+        self.lexicon = lexicon
+
+    def __call__(self, prefix=""):
+        likely = [letter for letter, weight in self.lexicon.next_letters(prefix)]
+        return likely + [letter for letter in LETTER_FREQUENCY if letter not in likely]
+
+
+class LinearScanner:
+    """One candidate at a time in ``order_for(prefix)``.
+
+    With ``restart`` every new letter starts again from the first candidate
+    (and the session resumes scrolling by itself after a selection);
+    without it the scan carries on from where it stopped, as the original
+    A–Z loop did.
+    """
+
+    def __init__(self, order_for=alphabet_order, restart=True):
+        self.order_for = order_for
+        self.restart = restart
+        self.direction = 1
+        self.order = order_for("")
+        self.index = 0
+
+    def begin(self, prefix=""):
+        """A new letter is to be chosen after ``prefix``."""
+        current = self.order[self.index]
+        self.order = self.order_for(prefix)
+        self.index = 0 if self.restart else self.order.index(current)
+
+    @property
+    def label(self):
+        return self.order[self.index]
+
+    def step(self):
+        self.index = (self.index + self.direction) % len(self.order)
+
+    def select(self):
+        """The highlighted letter."""
+        return self.order[self.index]
+
+    def reverse(self):
+        self.direction *= -1
+
+
+class GroupScanner:
+    """Row-column scanning: step through rows of ``group_size`` letters, then through the row.
+
+    Both follow ``direction``: reversed, a row is entered at its last letter.
+    A row that is scanned through once without a selection is left again,
+    so picking the wrong row costs one pass.
+    """
+
+    restart = True
+
+    def __init__(self, order_for=frequency_order, group_size=6):
+        self.order_for = order_for
+        self.group_size = group_size
+        self.direction = 1
+        self.begin("")
+
+    def begin(self, prefix=""):
+        order = self.order_for(prefix)
+        self.groups = [order[i:i + self.group_size] for i in range(0, len(order), self.group_size)]
+        self.group = None
+        self.index = 0
+
+    @property
+    def label(self):
+        if self.group is None:
+            return "".join(self.groups[self.index])
+        return self.group[self.index]
+
+    def step(self):
+        if self.group is None:
+            self.index = (self.index + self.direction) % len(self.groups)
+            return
+        self.index += self.direction
+        if not 0 <= self.index < len(self.group):
+            self.group = None
+            self.index = 0
+
+    def select(self):
+        """The highlighted letter, or None when a row was entered."""
+        if self.group is None:
+            self.group = self.groups[self.index]
+            self.index = 0 if self.direction > 0 else len(self.group) - 1
+            return None
+        return self.group[self.index]
+
+    def reverse(self):
+        self.direction *= -1
+
+
+def make_scanner(strategy="alphabet", lexicon=None, group_size=0):
+    """Scanner for ``strategy``; ``predictive`` needs a lexicon and falls back to ``frequency``."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown scanning strategy: {strategy}")
+    if strategy == "predictive" and lexicon is None:
+        print("⚠️ Predictive scanning needs a lexicon; scanning by letter frequency instead")
+        strategy = "frequency"
+    order_for = {"alphabet": alphabet_order, "frequency": frequency_order}.get(strategy) \
+        or PredictiveOrder(lexicon)
+    if group_size:
+        return GroupScanner(order_for, group_size)
+    return LinearScanner(order_for, restart=strategy != "alphabet")
+
+
+def add_scan_args(parser):
+    parser.add_argument("--scan", choices=STRATEGIES, default="alphabet",
+                        help="letter order: A-Z (default), by letter frequency, or by the "
+                             "letters most likely to come next (needs the lexicon)")
+    parser.add_argument("--scan-groups", type=int, default=0, metavar="N",
+                        help="row-column scanning with rows of N letters (0 = one letter at a time)")
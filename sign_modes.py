@@ -0,0 +1,331 @@
+import time
+
+from hand_pose import DEFAULT_POSES, FIST, PoseEngine, hand_points, is_fist
+from scanning import LinearScanner, alphabet_order
+# Holding up 2, 3 or 4 fingers accepts word suggestion 1, 2 or 3
+ACCEPT_POSES = ("victory", "three", "four")
+_ACCEPT = PoseEngine({name: DEFAULT_POSES[name] for name in ACCEPT_POSES})
+
+
+class SignSession:
+    """State for one letter/word/phrase/gesture session, advanced one frame at a time.
+
+    The session never touches the camera, the window or the clock itself:
+    callers pass ``now`` in, and spoken output goes through
+    ``speak(text, urgent=False)`` (normally ``SpeechQueue.say``).
+    That keeps the same logic usable from the live loop, the pipeline and
+    headless runs.
+    """
+
+    def __init__(self, mode, count=0, speak=None, scroll_interval=1.0,
+                 confirm_cooldown=1.5, gesture_delay=2, now=None, confirm_hand=None,
+                 two_hand_signs=None, lexicon=None, suggestion_count=3, accept_hold=0.6,
+                 scanner=None, observer=None):
+        if mode not in ("letter", "word", "phrase", "gesture"):
+            raise ValueError(f"Invalid mode: {mode}")
+        self.mode = mode
+        self.count = count
+        self.speak = speak or (lambda text, urgent=False: None)
+        # ``observer(kind, value)`` hears every selection (e.g. ``Metrics.event``)
+        self.observer = observer
+        self.scroll_interval = scroll_interval
+        self.confirm_cooldown = confirm_cooldown
+        self.gesture_delay = gesture_delay
+        # Two hands: only ``confirm_hand`` ("Left"/"Right") confirms with a fist;
+        # in gesture mode the other hand selects the gesture it confirms.
+        # ``two_hand_signs`` maps "left+right" label pairs to one sign.
+        self.confirm_hand = confirm_hand
+        self.two_hand_signs = two_hand_signs or {}
+        # Word prediction (word/phrase modes): after each letter ``suggestions``
+        # holds the top completions from ``lexicon`` (see lexicon.py); keys 1-3
+        # or an accept pose held for ``accept_hold`` seconds take one.
+        self.lexicon = lexicon if mode in ("word", "phrase") and suggestion_count else None
+        self.suggestion_count = suggestion_count
+        self.accept_hold = accept_hold
+        self.suggestions = []
+        self._accept_pose = (None, 0)
+
+        # Letter scan (scanning.py); the default is the A–Z loop
+        self.scanner = scanner or LinearScanner(alphabet_order, restart=False)
+        self.last_switch_time = now  # None: start the scroll clock on the first frame
+        self.auto_scroll = True
+        self._resume_at = None
+
+        # Confirmation / gesture state
+        self.last_confirm_time = 0
+        self.last_spoken = ""
+        self._spoken_by_hand = {}
+        self.frame_gestures = []
+        self.hand_fists = {}
+        self.selected_gesture = None
+
+        # Results
+        self.full_result = ""
+        self.letters_remaining = count
+        self.phrase_result = []
+        self.current_word = ""
+        self.words_remaining = count
+        self.finished = False
+        self.final_text = None
+        self.confirmed = []
+
+    # === Per-frame ===
+    def begin_frame(self, now):
+        """Advance the auto-scroll and clear per-frame gesture labels."""
+        self.frame_gestures = []
+        self.hand_fists = {}
+        if self.last_switch_time is None:
+            self.last_switch_time = now
+        if self._resume_at is not None and now >= self._resume_at:
+            self.auto_scroll = True
+            self.last_switch_time = now
+            self._resume_at = None
+        if (self.mode != "gesture" and self.auto_scroll
+                and now - self.last_switch_time >= self.scroll_interval):
+            self.scanner.step()
+            self.last_switch_time = now
+
+    @property
+    def current_letter(self):
+        """The highlighted letter (or row of letters, in row-column scanning)."""
+        return self.scanner.label
+
+    @property
+    def scroll_direction(self):
+        return self.scanner.direction
+
+    def on_hands(self, hands, predictions, sides, now=None, fists=None):
+        """Handle every hand of a frame (``packet.hands``, ``packet.predictions``, ``packet.sides``).
+
+        A left/right prediction pair listed in ``two_hand_signs`` counts as
+        one sign; otherwise each hand goes through ``on_hand``. The fist pose
+        of all hands is evaluated in one batch, unless the caller passes
+        ``fists`` (one bool per hand) it already computed.
+        """
+        predictions = predictions or [None] * len(hands)
+        if self.mode == "gesture" and len(hands) == 2 and self.two_hand_signs:
+            by_side = dict(zip(sides, predictions))
+            sign = self.two_hand_signs.get(f"{by_side.get('Left')}+{by_side.get('Right')}")
+            if sign is not None:
+                self.on_hand(hands[0].landmark, sign, now)
+                return
+        if fists is None:
+            needs_fist = hands and (self.mode != "gesture" or self.confirm_hand is not None)
+            fists = FIST.matrix(hand_points(hands))[:, 0] if needs_fist else [None] * len(hands)
+        for handLms, prediction, side, fist in zip(hands, predictions, sides, fists):
+            self.on_hand(handLms.landmark, prediction, now, fist=fist, hand=side)
+        if self.suggestions and not self.finished:
+            self._check_accept(hands, sides, now)
+
+    def _check_accept(self, hands, sides, now):
+        poses = _ACCEPT.classify(hand_points(hands)) if hands else []
+        pose = next((p for p, side in zip(poses, sides)
+                     if p and self.confirm_hand in (None, side)), None)
+        if pose != self._accept_pose[0]:
+            self._accept_pose = (pose, now)
+        elif (pose is not None and now - self._accept_pose[1] >= self.accept_hold
+                and now - self.last_confirm_time > self.confirm_cooldown):
+            self._accept_pose = (None, now)
+            self.accept_suggestion(ACCEPT_POSES.index(pose), now)
+
+    def on_hand(self, landmarks, prediction=None, now=None, fist=None, hand=None):
+        """Handle one detected hand.
+
+        ``landmarks`` is the MediaPipe ``handLms.landmark`` list, ``prediction``
+        the gesture label for that hand (gesture mode only) and ``hand`` its
+        side ("Left"/"Right", see ``landmark_io.hand_sides``). ``fist`` may be
+        passed in when the caller has already evaluated the pose.
+        """
+        if self.finished:
+            return
+        now = time.time() if now is None else now
+        two_handed = self.confirm_hand is not None and hand is not None
+
+        if self.mode == "gesture" and two_handed:
+            if hand != self.confirm_hand:
+                if prediction is not None:
+                    self.selected_gesture = prediction
+                    self.frame_gestures.append(prediction)
+                return
+            fist = is_fist(landmarks) if fist is None else bool(fist)
+            self.hand_fists[hand] = fist
+            if (fist and self.selected_gesture is not None
+                    and now - self.last_confirm_time > self.confirm_cooldown):
+                print(f"✊ Confirmed: {self.selected_gesture}")
+                self.speak(self.selected_gesture)
+                self.confirmed.append(self.selected_gesture)
+                if self.observer is not None:
+                    self.observer("gesture", self.selected_gesture)
+                self.last_confirm_time = now
+            return
+
+        if self.mode == "gesture":
+            if prediction is None:
+                return
+            self.frame_gestures.append(prediction)
+            # Repeats are held back per hand, so two hands don't re-trigger each other
+            last, last_time = self._spoken_by_hand.get(hand, ("", 0))
+            if prediction != last or now - last_time > self.gesture_delay:
+                print(f"🗣️ {prediction}")
+                self.speak(prediction)
+                self.confirmed.append(prediction)
+                if self.observer is not None:
+                    self.observer("gesture", prediction)
+                self._spoken_by_hand[hand] = (prediction, now)
+                self.last_spoken = prediction
+                self.last_confirm_time = now
+            return
+
+        fist = is_fist(landmarks) if fist is None else bool(fist)
+        if hand is not None:
+            self.hand_fists[hand] = fist
+        if two_handed and hand != self.confirm_hand:
+            return  # the other hand is free to sign without confirming
+        if fist and now - self.last_confirm_time > self.confirm_cooldown:
+            self.select(now)
+
+    def select(self, now):
+        """Fist on the highlighted item: confirm a letter, or enter a row of letters."""
+        highlighted = self.current_letter
+        letter = self.scanner.select()
+        if letter is None:
+            print(f"👉 Row: {highlighted}")
+            if self.observer is not None:
+                self.observer("row", highlighted)
+            self.last_confirm_time = now
+            self._pause(now)
+            return
+        self.confirm_letter(now, letter)
+
+    def _pause(self, now):
+        # Hold the scan after a selection; scanners that restart resume by themselves
+        self.auto_scroll = False
+        if self.scanner.restart:
+            self._resume_at = now + self.confirm_cooldown
+
+    def confirm_letter(self, now, letter=None):
+        letter = letter or self.current_letter
+        print(f"✊ Confirmed: {letter}")
+        self.speak(letter)
+        self.confirmed.append(letter)
+        if self.observer is not None:
+            self.observer("letter", letter)
+        self.last_confirm_time = now
+        self._pause(now)
+
+        if self.mode == "letter":
+            self.full_result += letter
+
+        elif self.mode == "word":
+            self.full_result += letter
+            self.letters_remaining -= 1
+            if self.letters_remaining == 0:
+                self._finish_word()
+
+        elif self.mode == "phrase":
+            self.current_word += letter
+        self.next_letter()
+
+    def _finish_word(self):
+        print(f"✅ Final Word: {self.full_result}")
+        self.speak("Final word is " + self.full_result, urgent=True)
+        self.final_text = self.full_result
+        self.finished = True
+
+    def next_letter(self):
+        """The typed word changed: restart the scan and refresh the suggestions."""
+        self.scanner.begin(self.prefix)
+        self.update_suggestions()
+
+    @property
+    def prefix(self):
+        """The word typed so far."""
+        return self.current_word if self.mode == "phrase" else self.full_result
+
+    # === Word prediction ===
+    def update_suggestions(self):
+        """Refresh ``suggestions`` for the word typed so far (word mode: words of ``count`` letters)."""
+        if self.lexicon is None:
+            return
+        length = self.count if self.mode == "word" else None
+        self.suggestions = self.lexicon.complete(self.prefix, self.suggestion_count, length) \
+            if self.prefix and not self.finished else []
+
+    def accept_suggestion(self, index, now=None):
+        """Complete the current word with ``suggestions[index]``."""
+        if index >= len(self.suggestions):
+            return
+        now = time.time() if now is None else now
+        word = self.suggestions[index]
+        print(f"✨ Completed: {word}")
+        self.speak(word)
+        self.confirmed.append(word)
+        if self.observer is not None:
+            self.observer("completion", word)
+        self.last_confirm_time = now
+        if self.mode == "word":
+            self.full_result = word
+            self.letters_remaining = 0
+            self._finish_word()
+        else:
+            self.current_word = word
+            self.next_word()
+        self.next_letter()
+
+    # === Keyboard ===
+    def on_key(self, key, now=None):
+        """Apply a keyboard command. Returns False when the user asked to quit."""
+        now = time.time() if now is None else now
+        if key == ord('q'):
+            return False
+        elif key == ord('c'):
+            self.auto_scroll = True
+            self.last_switch_time = now
+            self._resume_at = None
+        elif key == ord('r'):
+            self.scanner.reverse()
+        elif key == ord('d'):
+            if self.mode == "word" and self.full_result:
+                self.full_result = self.full_result[:-1]
+                self.letters_remaining += 1
+            elif self.mode == "letter" and self.full_result:
+                self.full_result = self.full_result[:-1]
+            elif self.mode == "phrase" and self.current_word:
+                self.current_word = self.current_word[:-1]
+        elif key == ord('n') and self.mode == "phrase":
+            self.next_word()
+        elif key == ord('x'):
+            self.reset()
+        elif key in (ord('1'), ord('2'), ord('3')):
+            self.accept_suggestion(key - ord('1'), now)
+        if key in (ord('d'), ord('n'), ord('x')):
+            self.next_letter()
+        return True
+
+    def next_word(self):
+        if not self.current_word:
+            return
+        self.phrase_result.append(self.current_word)
+        self.words_remaining -= 1
+        self.current_word = ""
+        if self.words_remaining == 0:
+            final_phrase = ' '.join(self.phrase_result)
+            print(f"✅ Final Phrase: {final_phrase}")
+            self.speak("Final phrase is " + final_phrase, urgent=True)
+            self.final_text = final_phrase
+            self.finished = True
+
+    def reset(self):
+        if self.mode == "word":
+            self.full_result = ""
+            self.letters_remaining = self.count
+        elif self.mode == "letter":
+            self.full_result = ""
+        elif self.mode == "phrase":
+            self.phrase_result = []
+            self.current_word = ""
+            self.words_remaining = self.count
+
+    # === Display helpers ===
+    def phrase_text(self):
+        return ' '.join(self.phrase_result + ([self.current_word] if self.current_word else []))
@@ -0,0 +1,487 @@
+"""Serve several kiosk cameras from one process.
+
+    python sign_server.py --port 8765                                   # socket sessions
+    python sign_server.py --video cam1.mp4 --video cam2.mp4 --mode word --count 3
+    python sign_server.py --replay a.svlm --replay b.svlm --mode gesture
+
+All sessions share one model and one pool of landmark workers:
+
+- MediaPipe runs in ``--workers`` processes (default: one per core). Each
+  session is pinned to one worker, which keeps a tracking-mode graph for it,
+  so a session's frames are processed in order.
+- Finished frames from every session are gathered for up to
+  ``--batch-wait-ms`` and classified with a single ``predict`` call.
+- Each session has its own SignSession, so word/phrase/gesture state never
+  mixes between cameras.
+
+Socket protocol (TCP): the client sends one JSON line, e.g.
+``{"mode": "word", "count": 3, "kind": "landmarks", "ack": false}``, then
+
+- ``"kind": "landmarks"``: a .svlm stream (header + records, i.e. the bytes
+  of a recording file; see landmark_io.encode_record);
+- ``"kind": "frames"``: ``<dBI`` records (timestamp, key, JPEG length), each
+  followed by the JPEG bytes.
+
+The server answers with JSON lines: ``{"event": "speak", "text", "urgent"}``
+for everything a local session would say, ``{"event": "suggestions", "words"}``
+when the word completions change, ``{"event": "ack", "seq"}`` after each
+frame when ``ack`` is set, and ``{"event": "closed", ...}`` with the results
+when the session ends.
+"""
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+import numpy as np
+
+from cascade import GestureCascade, add_cascade_args, wrap_model
+from hand_pose import FIST
+from landmark_features import NUM_FEATURES, NUM_LANDMARKS
+from landmark_io import NO_KEY, hand_sides, make_result, read_header, read_records, result_points
+from lexicon import add_lexicon_args, open_lexicon
+from sign_modes import SignSession
+
+FRAME_RECORD = struct.Struct("<dBI")
+
+
+# === Landmark workers ===
+def _landmark_worker(inbox, outbox, max_num_hands):
+    import cv2
+    from frame_io import create_hands
+    graphs = {}
+    while True:
+        msg = inbox.get()
+        if msg is None:
+            break
+        sid, seq, t, key, frame = msg
+        if seq is None:
+            # End of session: free its graph, then let the dispatcher know
+            graph = graphs.pop(sid, None)
+            if graph is not None:
+                graph.close()
+            outbox.put((sid, None, None, None, None, None))
+            continue
+        if isinstance(frame, (bytes, bytearray)):
+            frame = cv2.imdecode(np.frombuffer(frame, dtype=np.uint8), cv2.IMREAD_COLOR)
+        result = None
+        if frame is not None:
+            graph = graphs.get(sid)
+            if graph is None:
+                graph = graphs[sid] = create_hands(max_num_hands)[0]
+            result = graph.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        points, labels = result_points(result)
+        outbox.put((sid, seq, t, key, points, labels))
+
+
+class LandmarkPool:
+    """MediaPipe in worker processes; every session is pinned to one worker."""
+
+    def __init__(self, results, workers=None, max_num_hands=1):
+        import multiprocessing as mp
+        ctx = mp.get_context("spawn")  # the server is threaded; don't fork it
+        self.workers = workers or os.cpu_count() or 1
+        self.outbox = ctx.Queue()
+        self.inboxes = [ctx.Queue() for _ in range(self.workers)]
+        self.processes = [ctx.Process(target=_landmark_worker, args=(q, self.outbox, max_num_hands),
+                                      name=f"landmarks-{i}", daemon=True)
+                          for i, q in enumerate(self.inboxes)]
+        for p in self.processes:
+            p.start()
+        # Move worker output onto the dispatcher's (thread) queue
+        self._forwarder = threading.Thread(target=self._forward, args=(results,),
+                                           name="landmark-results", daemon=True)
+        self._forwarder.start()
+
+    def _forward(self, results):
+        while True:
+            item = self.outbox.get()
+            if item is None:
+                return
+            results.put(item)
+
+    def submit(self, sid, seq, t, key, frame):
+        self.inboxes[sid % self.workers].put((sid, seq, t, key, frame))
+
+    def end_session(self, sid):
+        self.inboxes[sid % self.workers].put((sid, None, None, None, None))
+
+    def close(self):
+        for q in self.inboxes:
+            q.put(None)
+        for p in self.processes:
+            p.join(timeout=2)
+        self.outbox.put(None)
+
+
+# === Sessions ===
+class Session:
+    """One camera: its own SignSession, frame counter and back-pressure."""
+
+    def __init__(self, sid, mode, count=0, send=None, ack=False, depth=2, name=None, lexicon=None,
+                 suggestion_count=3):
+        self.sid = sid
+        self.mode = mode
+        self.name = name or f"session-{sid}"
+        self.send = send or (lambda event: None)
+        self.ack = ack
+        self.sign = SignSession(mode, count, speak=self._speak, lexicon=lexicon,
+                                suggestion_count=suggestion_count)
+        self._suggestions = []
+        self.inflight = threading.BoundedSemaphore(depth)
+        self.uses_pool = False
+        self.quit = False
+        self.seq = 0
+        self.frames = 0
+        self.latencies = []
+        self._submitted = {}
+        self.done = threading.Event()
+
+    @property
+    def active(self):
+        return not (self.quit or self.sign.finished)
+
+    def _speak(self, text, urgent=False):
+        self.send({"event": "speak", "session": self.sid, "text": text, "urgent": urgent})
+
+    def next_seq(self):
+        self.inflight.acquire()  # at most ``depth`` frames of this session in flight
+        self.seq += 1
+        self._submitted[self.seq] = time.perf_counter()
+        return self.seq
+
+    def handle(self, seq, t, key, result, predictions, fists=None):
+        """Advance the session by one frame (dispatcher thread only)."""
+        if self.active:
+            hands = result.multi_hand_landmarks or []
+            self.sign.begin_frame(t)
+            self.sign.on_hands(hands, predictions, hand_sides(result), t, fists)
+            if key != NO_KEY and not self.sign.on_key(key, t):
+                self.quit = True
+            if self.sign.suggestions != self._suggestions:
+                self._suggestions = self.sign.suggestions
+                self.send({"event": "suggestions", "session": self.sid, "words": self._suggestions})
+        self.frames += 1
+        self.latencies.append(time.perf_counter() - self._submitted.pop(seq))
+        if self.ack:
+            self.send({"event": "ack", "seq": seq})
+        self.inflight.release()
+
+    def results(self):
+        sign = self.sign
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {
+            "session": self.sid,
+            "name": self.name,
+            "mode": self.mode,
+            "frames": self.frames,
+            "confirmed": sign.confirmed,
+            "result": sign.phrase_text() if self.mode == "phrase" else sign.full_result,
+            "final": sign.final_text,
+            "latency_ms": {"p50": round(float(np.percentile(latencies, 50)), 3),
+                           "p95": round(float(np.percentile(latencies, 95)), 3)},
+        }
+
+
+class RecognitionServer:
+    """Sessions, the shared landmark pool and the batching dispatcher.
+
+    Sources (socket handlers, video/replay threads) call ``submit_landmarks``
+    or ``submit_frame`` and finally ``end_session``; ``run()`` (on one thread)
+    classifies everything that is ready in one ``predict`` call per batch and
+    feeds each session its frames in order.
+    """
+
+    def __init__(self, model=None, workers=None, max_num_hands=1, max_batch=64,
+                 batch_wait=0.002, lexicon=None, suggestion_count=3):
+        self.model = model
+        self.lexicon = lexicon  # one memory-mapped lexicon shared by every session
+        self.suggestion_count = suggestion_count
+        self.workers = workers
+        self.max_num_hands = max_num_hands
+        self.max_batch = max_batch
+        self.batch_wait = batch_wait
+        self.results = queue.Queue()
+        self.sessions = {}
+        self._pool = None
+        self._lock = threading.Lock()
+        self._next_sid = 0
+        self._stop = threading.Event()
+        self.finished = []
+        self.frames = 0
+        self.batches = 0
+        self.predict_calls = 0
+        self.predicted_rows = 0
+
+    @property
+    def pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = LandmarkPool(self.results, self.workers, self.max_num_hands)
+            return self._pool
+
+    def open_session(self, mode, count=0, send=None, ack=False, name=None):
+        if mode == "gesture" and self.model is None:
+            raise ValueError("gesture mode needs a trained gesture_classifier")
+        with self._lock:
+            sid = self._next_sid
+            self._next_sid += 1
+            session = Session(sid, mode, count or 0, send, ack, name=name, lexicon=self.lexicon,
+                              suggestion_count=self.suggestion_count)
+            self.sessions[sid] = session
+        return session
+
+    def submit_landmarks(self, session, t, key, points, labels):
+        self.results.put((session.sid, session.next_seq(), t, key, points, labels))
+
+    def submit_frame(self, session, t, key, frame):
+        """``frame`` is a BGR ndarray or JPEG bytes; MediaPipe runs in the pool."""
+        session.uses_pool = True
+        self.pool.submit(session.sid, session.next_seq(), t, key, frame)
+
+    def end_session(self, session):
+        # Goes through the same path as the session's frames, so it arrives last
+        if session.uses_pool:
+            self.pool.end_session(session.sid)
+        else:
+            self.results.put((session.sid, None, None, None, None, None))
+
+    # === Dispatcher ===
+    def run(self, stop_when_idle=False):
+        while not self._stop.is_set():
+            if stop_when_idle and not self.sessions:
+                break
+            try:
+                batch = [self.results.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.perf_counter() + self.batch_wait
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self.results.get(timeout=max(0.0, deadline - time.perf_counter())))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        frames, rows, hand_rows, ended = [], [], [], []
+        n_rows = n_hands = 0
+        for sid, seq, t, key, points, labels in batch:
+            session = self.sessions.get(sid)
+            if session is None:
+                continue
+            if seq is None:
+                ended.append(session)
+                continue
+            start = None
+            if session.mode == "gesture" and session.active and len(points):
+                start = n_rows
+                rows.append(points.reshape(-1, NUM_FEATURES))
+                n_rows += len(points)
+            hand_rows.append(points.reshape(-1, NUM_LANDMARKS, 3))
+            frames.append((session, seq, t, key, make_result(points, labels), start, n_hands,
+                           len(points)))
+            n_hands += len(points)
+
+        # One classifier call for every hand of every session in this batch
+        predictions = None
+        if rows:
+            predictions = self.model.predict(np.concatenate(rows))
+            self.predict_calls += 1
+            self.predicted_rows += n_rows
+        # ... and one fist evaluation for every hand of every session
+        fists = FIST.matrix(np.concatenate(hand_rows))[:, 0] if n_hands else None
+
+        for session, seq, t, key, result, start, first, n in frames:
+            session_predictions = predictions[start:start + n].tolist() if start is not None else None
+            session.handle(seq, t, key, result, session_predictions, fists[first:first + n] if n else [])
+        for session in ended:
+            self._finish(session)
+        self.frames += len(frames)
+        self.batches += 1
+
+    def _finish(self, session):
+        with self._lock:
+            self.sessions.pop(session.sid, None)
+        results = session.results()
+        self.finished.append(results)
+        session.send(dict(results, event="closed"))
+        session.done.set()
+
+    def stop(self):
+        self._stop.set()
+        if self._pool is not None:
+            self._pool.close()
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "batches": self.batches,
+            "frames_per_batch": round(self.frames / self.batches, 2) if self.batches else None,
+            "predict_calls": self.predict_calls,
+            "rows_per_predict": round(self.predicted_rows / self.predict_calls, 2)
+            if self.predict_calls else None,
+            "workers": self._pool.workers if self._pool is not None else 0,
+        }
+
+
+# === Sources ===
+def replay_source(server, session, path):
+    with open(path, "rb") as f:
+        read_header(f, path)
+        for t, key, points, labels in read_records(f):
+            if not session.active:
+                break
+            server.submit_landmarks(session, t, key, points, labels)
+    server.end_session(session)
+
+
+def video_source(server, session, path):
+    import cv2
+    cap = cv2.VideoCapture(path)
+    while session.active:
+        success, frame = cap.read()
+        if not success:
+            break
+        server.submit_frame(session, cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0, NO_KEY, frame)
+    cap.release()
+    server.end_session(session)
+
+
+class _SessionHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        super().setup()
+        # Small per-frame records and events: don't let Nagle batch them
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        server = self.server.recognizer
+        write_lock = threading.Lock()
+
+        def send(event):
+            data = (json.dumps(event) + "\n").encode()
+            with write_lock:
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    pass  # client went away; the session ends when its stream does
+
+        try:
+            hello = json.loads(self.rfile.readline() or b"{}")
+            session = server.open_session(hello.get("mode"), hello.get("count", 0), send,
+                                          ack=bool(hello.get("ack")), name=hello.get("name"))
+        except ValueError as e:
+            send({"event": "error", "error": str(e)})
+            return
+
+        try:
+            if hello.get("kind", "landmarks") == "frames":
+                while session.active:
+                    head = self.rfile.read(FRAME_RECORD.size)
+                    if len(head) < FRAME_RECORD.size:
+                        break
+                    t, key, size = FRAME_RECORD.unpack(head)
+                    jpeg = self.rfile.read(size)
+                    if len(jpeg) < size:
+                        break
+                    server.submit_frame(session, t, key, jpeg)
+            else:
+                read_header(self.rfile, session.name)
+                for t, key, points, labels in read_records(self.rfile):
+                    if not session.active:
+                        break
+                    server.submit_landmarks(session, t, key, points, labels)
+        except (OSError, ValueError) as e:
+            send({"event": "error", "error": str(e)})
+        finally:
+            server.end_session(session)
+            session.done.wait(timeout=30)
+
+
+def serve_socket(server, host="127.0.0.1", port=8765):
+    """Accept socket sessions on a background thread; returns the TCP server."""
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    tcp = socketserver.ThreadingTCPServer((host, port), _SessionHandler)
+    tcp.daemon_threads = True
+    tcp.recognizer = server
+    threading.Thread(target=tcp.serve_forever, name="sign-server", daemon=True).start()
+    return tcp
+
+
+def main():
+    from compiled_forest import load_classifier
+
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="accept socket sessions on this port")
+    parser.add_argument("--video", action="append", default=[], help="video file session (repeatable)")
+    parser.add_argument("--replay", action="append", default=[],
+                        help="landmark recording session (repeatable)")
+    parser.add_argument("--mode", choices=["letter", "word", "phrase", "gesture"], default="word",
+                        help="mode for --video/--replay sessions (default word)")
+    parser.add_argument("--count", type=int, default=3,
+                        help="letters/words for --video/--replay sessions (default 3)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="MediaPipe worker processes (default: one per core)")
+    parser.add_argument("--hands", type=int, choices=[1, 2], default=1)
+    parser.add_argument("--batch-max", type=int, default=64, help="frames per dispatch batch")
+    parser.add_argument("--batch-wait-ms", type=float, default=2.0,
+                        help="how long to gather frames from other sessions before classifying")
+    parser.add_argument("--summary", help="write per-session results and server stats as JSON")
+    add_cascade_args(parser)
+    add_lexicon_args(parser)
+    args = parser.parse_args()
+
+    model, source = load_classifier()
+    if model is not None:
+        print(f"✅ {source} loaded.")
+    model = wrap_model(model, args)
+    server = RecognitionServer(model, args.workers, args.hands, args.batch_max,
+                               args.batch_wait_ms / 1000.0, open_lexicon(args), args.suggestions)
+
+    sources = [(path, replay_source) for path in args.replay] + \
+              [(path, video_source) for path in args.video]
+    for path, source_fn in sources:
+        session = server.open_session(args.mode, args.count, name=os.path.basename(path))
+        threading.Thread(target=source_fn, args=(server, session, path), daemon=True).start()
+
+    tcp = None
+    if args.port:
+        tcp = serve_socket(server, args.host, args.port)
+        print(f"🛰️ Listening on {args.host}:{args.port} (Ctrl+C to stop)")
+
+    start = time.perf_counter()
+    try:
+        server.run(stop_when_idle=tcp is None)
+    except KeyboardInterrupt:
+        pass
+    elapsed = time.perf_counter() - start
+    if tcp is not None:
+        tcp.shutdown()
+    server.stop()
+
+    for results in server.finished:
+        print(f"📺 {results['name']}: {results['frames']} frames, "
+              f"{len(results['confirmed'])} confirmed → "
+              f"{results['final'] or results['result'] or ' '.join(results['confirmed'][-5:])}")
+    stats = server.stats()
+    print(f"📊 {stats['frames']} frames in {elapsed:.2f}s ({stats['frames'] / elapsed:.1f} FPS), "
+          f"{stats['frames_per_batch']} frames per batch")
+    if isinstance(model, GestureCascade):
+        stats["cascade"] = model.stats()
+        print(f"🪜 Cascade: {model.fallthrough_rate:.0%} of hands needed the forest")
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump({"stats": stats, "seconds": round(elapsed, 3), "sessions": server.finished},
+                      f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,204 +1,279 @@
-import cv2
-import pickle
-import pyttsx3
-import mediapipe as mp
-import numpy as np
+import argparse
 import time
-import os
-from feature_extractor import extract_features
+from startup import Startup
+
+startup = Startup()
+
+import numpy as np
+from cascade import GestureCascade, add_cascade_args, wrap_model
+from compiled_forest import load_classifier
+from frame_io import FrameIO, add_source_args, create_warm_hands
+from landmark_features import NUM_FEATURES, extract_batch
+from lexicon import add_lexicon_args, open_lexicon
+from scanning import add_scan_args, make_scanner
+from model_registry import add_reload_args, create_registry
+from motion_gate import MotionGate
+from overlay import TextLayer
+from pipeline import Pipeline
+from sign_modes import SignSession
+from speech_queue import SpeechQueue
+from temporal_features import WINDOW_FEATURES, HandWindows
+
+startup.mark("imports")
+
+parser = argparse.ArgumentParser(description="SilentVoice - sign language to speech")
+parser.add_argument("--mode", choices=["letter", "word", "phrase", "gesture"],
+                    help="skip the mode prompt")
+parser.add_argument("--count", type=int, help="letters in the word / words in the phrase")
+parser.add_argument("--motion-threshold", type=float, default=0.01,
+                    help="gesture mode: reuse the last prediction while no landmark moves more "
+                         "than this (normalized units, 0 disables; default 0.01)")
+parser.add_argument("--motion-max-age", type=float, default=0.5,
+                    help="gesture mode: re-classify at least this often, in seconds (default 0.5)")
+parser.add_argument("--window", type=int, default=0,
+                    help="gesture mode: classify motion over this many frames with "
+                         "gesture_sequence_classifier (see collect_sequence_data.py; 0 = per frame)")
+parser.add_argument("--confirm-hand", choices=["Left", "Right"],
+                    help="with --hands 2: only this hand confirms with a fist; in gesture mode "
+                         "the other hand selects the gesture")
+parser.add_argument("--two-hand-signs", metavar="JSON",
+                    help="gesture mode: file mapping \"left+right\" label pairs to one sign")
+parser.add_argument("--startup-times", action="store_true",
+                    help="print how long each startup step took, once the first frame is shown")
+add_cascade_args(parser)
+add_reload_args(parser)
+add_lexicon_args(parser)
+add_scan_args(parser)
+add_source_args(parser)
+args = parser.parse_args()
+
 
 # === Load Gesture Classifier ===
-gesture_model = None
-if os.path.exists("gesture_classifier.pkl"):
-    with open("gesture_classifier.pkl", "rb") as f:
-        gesture_model = pickle.load(f)
-        print("✅ Gesture classifier loaded.")
+def load_gesture_model(name, n_features):
+    model, source = load_classifier(name)
+    if model is not None:
+        # First predict pays for lazy allocations; do it now on a dummy row
+        model.predict(np.zeros((1, n_features), dtype=np.float32))
+    return model, source
+
+
+# === Background Startup ===
+# The model, the camera (cv2), MediaPipe and the TTS engine load in parallel
+# while the user picks a mode. MediaPipe and the model are warmed up on dummy
+# input so the first real frame doesn't pay for graph/allocation setup.
+if args.window:
+    startup.start("model", load_gesture_model, "gesture_sequence_classifier", WINDOW_FEATURES)
 else:
-    print("⚠️ Warning: gesture_classifier.pkl not found!")
+    startup.start("model", load_gesture_model, "gesture_classifier", NUM_FEATURES)
+startup.start("camera", FrameIO, args, "SilentVoice - Full Version")
+if not args.replay:
+    startup.start("mediapipe", create_warm_hands, args.hands)
 
-# === TTS Setup ===
-engine = pyttsx3.init()
-engine.setProperty('rate', 150)
+# Speech runs on its own thread; the frame loop only enqueues utterances.
+# Headless runs (replays, CI) stay silent.
+speech = None if (args.headless or args.replay) else SpeechQueue(rate=150)
+if speech:
+    startup.start("pyttsx3", speech.wait_ready)
 
-# === MediaPipe Setup ===
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(static_image_mode=False, max_num_hands=1)
-mp_draw = mp.solutions.drawing_utils
+# === Mode Selection ===
+mode = args.mode or input("Select mode (letter/word/phrase/gesture): ").strip().lower()
+count = args.count or 0
+if mode == "word":
+    count = count or int(input("How many letters in the word? "))
+elif mode == "phrase":
+    count = count or int(input("How many words in the phrase? "))
+elif mode not in ("letter", "gesture"):
+    print("❌ Invalid mode.")
+    exit()
+startup.mark("mode chosen")
 
-# === Camera Setup ===
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
+# === Camera / Replay Setup ===
+io = startup.get("camera")
+if not io.isOpened():
     print("❌ Error: Cannot open camera.")
     exit()
 else:
-    print("✅ Camera opened.")
+    print("✅ Camera opened." if io.live else "✅ Input opened.")
+if "mediapipe" in startup.steps:
+    io.attach_hands(*startup.get("mediapipe"))
 
-# === Mode Selection ===
-mode = input("Select mode (letter/word/phrase/gesture): ").strip().lower()
-if mode == "word":
-    num_letters = int(input("How many letters in the word? "))
-    full_result = ""
-    letters_remaining = num_letters
-elif mode == "phrase":
-    num_words = int(input("How many words in the phrase? "))
-    phrase_result = []
-    current_word = ""
-    words_remaining = num_words
-elif mode == "letter":
-    full_result = ""
-elif mode == "gesture":
+# Only gesture mode waits for the classifier
+gesture_model = None
+models = None  # ModelRegistry with --reload
+if mode == "gesture":
+    gesture_model, source = startup.get("model")
     if gesture_model is None:
-        print("❌ Gesture mode requires a trained gesture_classifier.pkl")
-        cap.release()
+        print("❌ Gesture mode requires a trained "
+              f"{'gesture_sequence_classifier' if args.window else 'gesture_classifier'}.pkl")
+        io.close()
         exit()
-else:
-    print("❌ Invalid mode.")
-    cap.release()
-    exit()
+    print(f"✅ {source} loaded.")
+    if not args.window:
+        gesture_model = wrap_model(gesture_model, args)
+    models = create_registry(
+        args, gesture_model, "gesture_sequence_classifier" if args.window else "gesture_classifier",
+        WINDOW_FEATURES if args.window else NUM_FEATURES,
+        prepare=None if args.window else (lambda model: wrap_model(model, args)))
 
-# === A–Z Setup ===
-letters = [chr(i) for i in range(65, 91)]
-letter_index = 0
-current_letter = letters[letter_index]
-last_switch_time = time.time()
-auto_scroll = True
-scroll_direction = 1
-last_confirm_time = 0
-last_spoken = ""
-gesture_delay = 2
-
-# === Fist Detection ===
-def is_fist(landmarks):
-    tips_ids = [4, 8, 12, 16, 20]
-    folded = 0
-    for i in range(1, 5):
-        if landmarks[tips_ids[i]].y > landmarks[tips_ids[i] - 2].y:
-            folded += 1
-    if landmarks[4].x < landmarks[3].x:
-        folded += 1
-    return folded >= 4
+two_hand_signs = None
+if args.two_hand_signs:
+    import json
+    with open(args.two_hand_signs) as f:
+        two_hand_signs = json.load(f)
+lexicon = open_lexicon(args) if mode in ("word", "phrase") else None
+session = SignSession(mode, count, speak=speech.say if speech else None,
+                      confirm_hand=args.confirm_hand, two_hand_signs=two_hand_signs,
+                      lexicon=lexicon, suggestion_count=args.suggestions,
+                      scanner=make_scanner(args.scan, lexicon, args.scan_groups),
+                      observer=io.metrics.event if io.metrics is not None else None)
 
-print("\n🔁 Press 'c' to continue scrolling letters")
-print("🔁 Press 'r' to reverse letter scroll direction")
-print("⌫ Press 'd' to delete")
-print("➡️ Press 'n' for next word (phrase mode)")
-print("🗑 Press 'x' to reset")
-print("❌ Press 'q' to quit\n")
 
-while True:
-    success, frame = cap.read()
-    if not success:
-        break
+# === Pipeline Stages ===
+# From a camera, capture, MediaPipe and classification each run on their own
+# thread and hand frames over through single-slot queues, so a slow stage
+# drops stale frames instead of delaying the newest one. Video files and
+# replays run the same stages inline so every frame is processed. Mode logic
+# and display stay on the main thread (OpenCV windows must be driven from it).
 
-    img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    result_hands = hands.process(img_rgb)
-
-    # Letter scrolling (not in gesture mode)
-    if mode != "gesture" and auto_scroll and time.time() - last_switch_time >= 1.0:
-        letter_index = (letter_index + scroll_direction) % len(letters)
-        current_letter = letters[letter_index]
-        last_switch_time = time.time()
-
-    if result_hands.multi_hand_landmarks:
-        for handLms in result_hands.multi_hand_landmarks:
-            mp_draw.draw_landmarks(frame, handLms, mp_hands.HAND_CONNECTIONS)
-            features = extract_features(handLms).reshape(1, -1)
-
-            if mode == "gesture":
-                prediction = gesture_model.predict(features)[0]
-                cv2.putText(frame, f"Gesture: {prediction}", (10, 60),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 2)
-
-                if prediction != last_spoken or time.time() - last_confirm_time > gesture_delay:
-                    print(f"🗣️ {prediction}")
-                    engine.say(prediction)
-                    engine.runAndWait()
-                    last_spoken = prediction
-                    last_confirm_time = time.time()
-
-            elif is_fist(handLms.landmark) and time.time() - last_confirm_time > 1.5:
-                print(f"✊ Confirmed: {current_letter}")
-                engine.say(current_letter)
-                engine.runAndWait()
-                last_confirm_time = time.time()
-                auto_scroll = False
-
-                if mode == "letter":
-                    full_result += current_letter
-
-                elif mode == "word":
-                    full_result += current_letter
-                    letters_remaining -= 1
-                    if letters_remaining == 0:
-                        print(f"✅ Final Word: {full_result}")
-                        engine.say("Final word is " + full_result)
-                        engine.runAndWait()
-                        time.sleep(2)
-                        cap.release()
-                        cv2.destroyAllWindows()
-                        exit()
-
-                elif mode == "phrase":
-                    current_word += current_letter
+# Reused every frame by the classify stage (the only thread that touches them).
+# All hands of a frame are stacked into one batch and classified in one call.
+feature_buf = np.empty((max(2, args.hands), NUM_FEATURES), dtype=np.float32)
+motion_gate = MotionGate(args.motion_threshold, args.motion_max_age) \
+    if args.motion_threshold > 0 and not args.window else None
+# Moving gestures: per-hand ring buffers updated in O(1) per frame
+hand_windows = HandWindows(args.window, max(2, args.hands)) if args.window else None
+
+
+def classify_hands(packet):
+    if mode != "gesture":
+        return
+    if models is not None and models.poll():
+        use_model(models.model)
+    if io.metrics is None:
+        run_classifier(packet)
+        return
+    start = time.perf_counter()
+    run_classifier(packet)
+    io.metrics.timed("classify", start, seq=packet.seq)
+
+
+def use_model(model):
+    """Switch to a reloaded model between frames; cached predictions belong to the old one."""
+    global gesture_model
+    gesture_model = model
+    if motion_gate is not None:
+        motion_gate.reset()
+
+
+def run_classifier(packet):
+    if hand_windows is not None:
+        classify_windows(packet)
+        return
+    if not packet.hands:
+        return
+    features = extract_batch(packet.hands, out=feature_buf)
+    predict = predict_observed if io.metrics is not None else None
+    if motion_gate is not None:
+        packet.predictions = motion_gate.predict(gesture_model, features, packet.t_capture,
+                                                 predict=predict)
+    else:
+        packet.predictions = list((predict or gesture_model.predict)(features))
+
+
+def predict_observed(features):
+    """``gesture_model.predict`` via ``predict_proba``, recording the winning probability."""
+    proba = gesture_model.predict_proba(features)
+    best = proba.argmax(axis=1)
+    for p in proba[np.arange(len(best)), best]:
+        io.metrics.observe("confidence", p)
+    return gesture_model.classes_[best]
+
+
+def classify_windows(packet):
+    features = extract_batch(packet.hands, out=feature_buf)
+    window_rows, ready = hand_windows.update(features, packet.t_capture, packet.sides)
+    if not ready.any():
+        return  # still filling the window
+    predict = predict_observed if io.metrics is not None else gesture_model.predict
+    predictions = iter(predict(window_rows[ready]))
+    packet.predictions = [next(predictions) if r else None for r in ready]
+
+
+hud = TextLayer()
+
+
+def draw_overlay(frame):
+    """HUD text for the session state; re-rendered only when that text changes."""
+    lines = [(f"Gesture: {prediction}", (10, 60 + 50 * i), 1.5, (0, 255, 0), 2)
+             for i, prediction in enumerate(session.frame_gestures)]
 
-    # === Display
     if mode != "gesture":
-        cv2.putText(frame, f"Current: {current_letter}", (10, 60),
-                    cv2.FONT_HERSHEY_SIMPLEX, 2, (0, 255, 0), 2)
+        lines.append((f"Current: {session.current_letter}", (10, 60), 2, (0, 255, 0), 2))
 
     if mode == "word":
-        cv2.putText(frame, f"Word: {full_result}", (10, 130),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 0), 2)
+        lines.append((f"Word: {session.full_result}", (10, 130), 1.2, (255, 255, 0), 2))
     elif mode == "letter":
-        cv2.putText(frame, f"Result: {full_result}", (10, 130),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 0), 2)
+        lines.append((f"Result: {session.full_result}", (10, 130), 1.2, (255, 255, 0), 2))
     elif mode == "phrase":
-        phrase_str = ' '.join(phrase_result + ([current_word] if current_word else []))
-        cv2.putText(frame, f"Phrase: {phrase_str}", (10, 130),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 0), 2)
+        lines.append((f"Phrase: {session.phrase_text()}", (10, 130), 1.2, (255, 255, 0), 2))
+    if session.suggestions:
+        lines.append(("  ".join(f"{i}:{w}" for i, w in enumerate(session.suggestions, 1)),
+                      (10, 180), 1, (255, 200, 100), 2))
+    hud.draw(frame, lines)
+
+
+print("\n🔁 Press 'c' to continue scrolling letters")
+print("🔁 Press 'r' to reverse letter scroll direction")
+print("⌫ Press 'd' to delete")
+print("➡️ Press 'n' for next word (phrase mode)")
+if session.lexicon:
+    print("✨ Hold up 2/3/4 fingers (or press 1/2/3) to take a suggested word")
+print("🗑 Press 'x' to reset")
+print("❌ Press 'q' to quit\n")
+
+pipeline = Pipeline(io.capture, io.detect, classify_hands, threaded=io.live).start()
 
-    cv2.imshow("SilentVoice - Full Version", frame)
+for packet in pipeline:
+    if args.startup_times and "first frame" not in startup.marks:
+        startup.mark("first frame")
+        startup.report()
+    frame = packet.frame
+    now = packet.t_capture
+    start = time.perf_counter() if io.metrics is not None else None
+    session.begin_frame(now)
 
-    key = cv2.waitKey(1) & 0xFF
-    if key == ord('q'):
+    for handLms in packet.hands:
+        io.draw_landmarks(frame, handLms)
+    session.on_hands(packet.hands, packet.predictions, packet.sides, now)
+    if start is not None:
+        io.metrics.timed("session", start, seq=packet.seq)
+
+    # === Display
+    if not io.headless:
+        draw_overlay(frame)
+    key = io.show(packet)
+    if not session.on_key(key, now) or session.finished:
         break
-    elif key == ord('c'):
-        auto_scroll = True
-        last_switch_time = time.time()
-    elif key == ord('r'):
-        scroll_direction *= -1
-    elif key == ord('d'):
-        if mode == "word" and full_result:
-            full_result = full_result[:-1]
-            letters_remaining += 1
-        elif mode == "letter" and full_result:
-            full_result = full_result[:-1]
-        elif mode == "phrase" and current_word:
-            current_word = current_word[:-1]
-    elif key == ord('n') and mode == "phrase":
-        if current_word:
-            phrase_result.append(current_word)
-            words_remaining -= 1
-            current_word = ""
-            if words_remaining == 0:
-                final_phrase = ' '.join(phrase_result)
-                print(f"✅ Final Phrase: {final_phrase}")
-                engine.say("Final phrase is " + final_phrase)
-                engine.runAndWait()
-                time.sleep(2)
-                cap.release()
-                cv2.destroyAllWindows()
-                exit()
-    elif key == ord('x'):
-        if mode == "word":
-            full_result = ""
-            letters_remaining = num_letters
-        elif mode == "letter":
-            full_result = ""
-        elif mode == "phrase":
-            phrase_result = []
-            current_word = ""
-            words_remaining = num_words
-
-cap.release()
-cv2.destroyAllWindows()
+
+pipeline.stop()
+if models is not None:
+    models.close()
+if mode == "gesture" and motion_gate is not None:
+    print(f"🧊 Motion gate: {motion_gate.hits} of {motion_gate.hits + motion_gate.misses} "
+          f"predictions reused ({motion_gate.hit_rate:.0%})")
+cascade = gesture_model if isinstance(gesture_model, GestureCascade) else None
+if cascade is not None:
+    print(f"🪜 Cascade: {cascade.fallthrough} of {cascade.frames} hands needed the forest "
+          f"({cascade.fallthrough_rate:.0%})")
+io.close({
+    "mode": mode,
+    "motion_gate": motion_gate.stats() if motion_gate is not None else None,
+    "cascade": cascade.stats() if cascade is not None else None,
+    "model": models.stats() if models is not None else None,
+    "confirmed": session.confirmed,
+    "result": session.phrase_text() if mode == "phrase" else session.full_result,
+    "final": session.final_text,
+    "startup": startup.stats(),
+})
+if speech:
+    speech.close()  # let the final word/phrase finish speaking
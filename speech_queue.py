@@ -0,0 +1,135 @@
+import collections
+import threading
+import time
+
+
+def _default_engine(rate):
+    import pyttsx3
+    engine = pyttsx3.init()
+    if rate is not None:
+        engine.setProperty('rate', rate)
+    return engine
+
+
+class SpeechQueue:
+    """Text-to-speech on a background thread so the frame loop never waits for audio.
+
+    The worker thread creates and owns the pyttsx3 engine (pyttsx3 engines are
+    not safe to share between threads). ``say`` only enqueues and returns
+    immediately.
+
+    - a text that is already waiting (or being spoken right now) is coalesced
+      instead of queued again, so a held gesture is announced once;
+    - normal utterances older than ``max_age`` seconds are dropped when they
+      reach the front, and at most ``max_pending`` are kept (oldest dropped);
+    - ``urgent=True`` (e.g. "Final word is ...") discards everything pending
+      that is not urgent and goes to the front of the queue.
+    """
+
+    def __init__(self, engine_factory=None, rate=None, max_age=3.0, max_pending=3):
+        self._engine_factory = engine_factory or (lambda: _default_engine(rate))
+        self.max_age = max_age
+        self.max_pending = max_pending
+        self._urgent = collections.deque()
+        self._pending = collections.deque()
+        self._cond = threading.Condition()
+        self._speaking = None
+        self._closed = False
+        self.spoken = []
+        self.coalesced = 0
+        self.dropped = 0
+        self.error = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="speech", daemon=True)
+        self._thread.start()
+
+    def say(self, text, urgent=False):
+        """Queue ``text`` for speaking. Never blocks on audio."""
+        now = time.monotonic()
+        with self._cond:
+            if self._closed:
+                return False
+            if urgent:
+                self.dropped += len(self._pending)
+                self._pending.clear()
+                self._urgent.append((text, now))
+            else:
+                if text == self._speaking or any(t == text for t, _ in self._pending):
+                    self.coalesced += 1
+                    return False
+                if len(self._pending) >= self.max_pending:
+                    self._pending.popleft()
+                    self.dropped += 1
+                self._pending.append((text, now))
+            self._cond.notify()
+        return True
+
+    def wait_ready(self, timeout=None):
+        """Block until the engine is initialized (or failed to)."""
+        return self._ready.wait(timeout)
+
+    def pending(self):
+        with self._cond:
+            return len(self._urgent) + len(self._pending)
+
+    def wait(self, timeout=None):
+        """Block until everything queued so far has been spoken (or dropped)."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not (self._urgent or self._pending or self._speaking)
+                or not self._thread.is_alive(), timeout)
+
+    def close(self, wait=True, timeout=10.0):
+        """Stop the worker, by default after the queue has drained."""
+        if wait:
+            self.wait(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _next(self):
+        """Pop the next utterance to speak, skipping stale ones. Call with the lock held."""
+        while self._urgent or self._pending:
+            if self._urgent:
+                return self._urgent.popleft()[0]
+            text, queued_at = self._pending.popleft()
+            if self.max_age is not None and time.monotonic() - queued_at > self.max_age:
+                self.dropped += 1
+                continue
+            return text
+        return None
+
+    def _run(self):
+        try:
+            engine = self._engine_factory()
+        except Exception as e:
+            self.error = e
+            print(f"⚠️ Speech disabled: {e}")
+            with self._cond:
+                self._closed = True
+                self._cond.notify_all()
+            return
+        finally:
+            self._ready.set()
+
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._urgent or self._pending or self._closed)
+                text = self._next()
+                if text is None:
+                    if self._closed:
+                        break
+                    continue
+                self._speaking = text
+            try:
+                engine.say(text)
+                engine.runAndWait()
+            except Exception as e:
+                self.error = e
+                print(f"⚠️ Speech failed: {e}")
+            with self._cond:
+                self.spoken.append(text)
+                self._speaking = None
+                self._cond.notify_all()
+
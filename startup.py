@@ -0,0 +1,75 @@
+import threading
+import time
+
+
+class Startup:
+    """Load heavy subsystems on background threads and time each step.
+
+        startup = Startup()
+        startup.start("model", load_model, path)    # runs now, in the background
+        ...                                         # e.g. prompt for the mode meanwhile
+        model = startup.get("model")                # waits only if still loading
+        startup.report()
+
+    ``get`` re-raises an exception from the step on the calling thread. The
+    report lists when each step started and how long it ran, relative to the
+    creation of the Startup, and how long the main thread blocked waiting for
+    it (0 means the step was fully hidden behind other work).
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.steps = {}
+        self.marks = {}
+
+    def start(self, name, fn, *args, **kwargs):
+        step = {"started": time.perf_counter() - self.t0, "seconds": None, "waited": 0.0,
+                "result": None, "error": None}
+
+        def run():
+            begin = time.perf_counter()
+            try:
+                step["result"] = fn(*args, **kwargs)
+            except Exception as e:
+                step["error"] = e
+            step["seconds"] = time.perf_counter() - begin
+
+        step["thread"] = threading.Thread(target=run, name=f"startup-{name}", daemon=True)
+        self.steps[name] = step
+        step["thread"].start()
+
+    def get(self, name, timeout=None):
+        step = self.steps[name]
+        begin = time.perf_counter()
+        step["thread"].join(timeout)
+        step["waited"] += time.perf_counter() - begin
+        if step["error"] is not None:
+            raise step["error"]
+        return step["result"]
+
+    def mark(self, name):
+        """Record a point in time (e.g. "mode selected", "first frame")."""
+        self.marks[name] = time.perf_counter() - self.t0
+
+    def report(self):
+        print("⏱️ Startup breakdown:")
+        for name, step in self.steps.items():
+            if step["seconds"] is None:
+                print(f"  {name:<12} started {step['started'] * 1000:7.1f} ms  still running")
+                continue
+            status = "  failed" if step["error"] is not None else ""
+            print(f"  {name:<12} started {step['started'] * 1000:7.1f} ms  "
+                  f"took {step['seconds'] * 1000:7.1f} ms  "
+                  f"waited {step['waited'] * 1000:7.1f} ms{status}")
+        for name, at in self.marks.items():
+            print(f"  {name:<12} at {at * 1000:7.1f} ms")
+
+    def stats(self):
+        return {
+            "steps": {name: {"started": round(step["started"], 4),
+                             "seconds": round(step["seconds"], 4)
+                             if step["seconds"] is not None else None,
+                             "waited": round(step["waited"], 4)}
+                      for name, step in self.steps.items()},
+            "marks": {name: round(at, 4) for name, at in self.marks.items()},
+        }
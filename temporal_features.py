@@ -0,0 +1,174 @@
+import numpy as np
+
+from landmark_features import NUM_FEATURES
+
+WINDOW_FEATURES = 4 * NUM_FEATURES  # current, velocity, std, path
+
+
+class WindowFeatures:
+    """Motion features over the last ``window`` frames of one hand, updated in O(1) per frame.
+
+    Frames go into a fixed ``(window, 63)`` ring buffer. Running sums are
+    updated with the incoming frame and the one it evicts, so a push costs
+    the same however long the window is. ``features()`` returns 252 values:
+
+      current    the newest frame (the same 63 values the static classifier sees)
+      velocity   (newest - oldest) / elapsed seconds, i.e. mean velocity over the window
+      std        per-coordinate standard deviation over the window
+      path       per-coordinate sum of |frame-to-frame change| inside the window
+
+    Running sums are recomputed from the buffer every ``refresh_every``
+    pushes so floating-point drift can't build up on long sessions.
+    """
+
+    def __init__(self, window=15, n_features=NUM_FEATURES, refresh_every=1024):
+        if window < 2:
+            raise ValueError("window must hold at least 2 frames")
+        self.window = window
+        self.n_features = n_features
+        self.refresh_every = refresh_every
+        self.frames = np.zeros((window, n_features))
+        self.steps = np.zeros((window, n_features))  # |change| into each frame from the one before
+        self.times = np.zeros(window)
+        self._sum = np.zeros(n_features)
+        self._sumsq = np.zeros(n_features)
+        self._path = np.zeros(n_features)
+        self._scratch = np.empty(n_features)
+        self._head = 0  # slot the next frame goes into
+        self._pushes = 0
+        self.count = 0
+
+    @property
+    def ready(self):
+        return self.count == self.window
+
+    def reset(self):
+        """Forget the window (e.g. when the hand leaves the frame)."""
+        self._sum[:] = 0
+        self._sumsq[:] = 0
+        self._path[:] = 0
+        self._head = 0
+        self.count = 0
+
+    def push(self, features, t):
+        """Add one frame of 63 features captured at time ``t`` (seconds)."""
+        w = self.window
+        slot = self._head
+        tmp = self._scratch
+        if self.count == w:
+            # Evict the oldest frame; the next one becomes the oldest and its
+            # incoming step no longer lies inside the window
+            old = self.frames[slot]
+            self._sum -= old
+            np.multiply(old, old, out=tmp)
+            self._sumsq -= tmp
+            nxt = (slot + 1) % w
+            self._path -= self.steps[nxt]
+            self.steps[nxt] = 0
+        else:
+            self.count += 1
+
+        new = self.frames[slot]
+        new[:] = np.asarray(features).reshape(-1)
+        step = self.steps[slot]
+        if self.count > 1:
+            np.subtract(new, self.frames[slot - 1], out=step)  # slot - 1 wraps to the end
+            np.abs(step, out=step)
+            self._path += step
+        else:
+            step[:] = 0
+        self.times[slot] = t
+        self._sum += new
+        np.multiply(new, new, out=tmp)
+        self._sumsq += tmp
+        self._head = (slot + 1) % w
+
+        self._pushes += 1
+        if self._pushes % self.refresh_every == 0:
+            self._refresh()
+
+    def _refresh(self):
+        live = self._live_slots()
+        self._sum[:] = self.frames[live].sum(axis=0)
+        self._sumsq[:] = (self.frames[live] ** 2).sum(axis=0)
+        self._path[:] = self.steps[live].sum(axis=0)
+
+    def _live_slots(self):
+        return (self._head - self.count + np.arange(self.count)) % self.window
+
+    def features(self, out=None):
+        """The 252 window features as float32 (written into ``out`` if given)."""
+        if out is None:
+            out = np.empty(WINDOW_FEATURES, dtype=np.float32)
+        n = self.count
+        if n == 0:
+            out[:] = 0
+            return out
+        f = self.n_features
+        newest = (self._head - 1) % self.window
+        oldest = (self._head - n) % self.window
+        out[:f] = self.frames[newest]
+
+        elapsed = self.times[newest] - self.times[oldest]
+        if elapsed > 0:
+            np.subtract(self.frames[newest], self.frames[oldest], out=self._scratch)
+            out[f:2 * f] = self._scratch / elapsed
+        else:
+            out[f:2 * f] = 0
+
+        mean = self._scratch
+        np.divide(self._sum, n, out=mean)
+        var = self._sumsq / n - mean * mean
+        np.maximum(var, 0, out=var)
+        out[2 * f:3 * f] = np.sqrt(var)
+        out[3 * f:] = self._path
+        return out
+
+
+class HandWindows:
+    """One WindowFeatures per hand.
+
+    With ``sides`` (``packet.sides``) the left and right hand each keep their
+    own window even when MediaPipe reports them in a different order;
+    without, windows follow detection order and all reset when the hand
+    count changes. A hand that leaves the frame always loses its window.
+    """
+
+    def __init__(self, window=15, max_hands=2):
+        self.window = window
+        self.slots = [WindowFeatures(window) for _ in range(max_hands)]
+        self.out = np.empty((max_hands, WINDOW_FEATURES), dtype=np.float32)
+        self._hands = 0
+
+    def update(self, features, t, sides=None):
+        """Push ``(N, 63)`` features; return ``(N, 252)`` window features and a ready mask."""
+        n = min(len(features), len(self.slots))
+        if sides is not None and len(self.slots) >= 2:
+            used = [0 if side == "Left" else 1 for side in sides[:n]]
+        else:
+            if n != self._hands:
+                for slot in self.slots:
+                    slot.reset()
+            used = list(range(n))
+        self._hands = n
+        for k, slot in enumerate(self.slots):
+            if k not in used:
+                slot.reset()
+
+        ready = np.zeros(n, dtype=bool)
+        for i, k in enumerate(used):
+            slot = self.slots[k]
+            slot.push(features[i], t)
+            slot.features(out=self.out[i])
+            ready[i] = slot.ready
+        return self.out[:n], ready
+
+
+def window_features(frames, times):
+    """Reference (non-incremental) computation for a whole ``(window, 63)`` sequence."""
+    frames = np.asarray(frames, dtype=np.float64)
+    elapsed = times[-1] - times[0]
+    velocity = (frames[-1] - frames[0]) / elapsed if elapsed > 0 else np.zeros(frames.shape[1])
+    path = np.abs(np.diff(frames, axis=0)).sum(axis=0)
+    return np.concatenate([frames[-1], velocity, frames.std(axis=0), path]).astype(np.float32)
+
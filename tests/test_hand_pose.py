@@ -0,0 +1,34 @@
+import numpy as np
+
+from benchmarks.synthetic import random_hands, random_points
+from hand_pose import POSES, hand_points, is_fist
+
+
+def legacy_is_fist(landmarks):
+    """The original per-landmark test from fist_letter_selector.py."""
+    tips_ids = [4, 8, 12, 16, 20]
+    folded = sum(landmarks[tips_ids[i]].y > landmarks[tips_ids[i] - 2].y for i in range(1, 5))
+    return folded + (landmarks[4].x < landmarks[3].x) >= 4
+
+
+def test_fist_pose_matches_legacy_test():
+    hands = random_hands(5000)
+    expected = np.array([legacy_is_fist(h.landmark) for h in hands])
+    got = POSES.evaluate(hand_points(hands))["fist"]
+    assert expected.any() and not expected.all()
+    assert (got == expected).all(), f"{(got != expected).sum()} mismatches"
+
+
+def test_is_fist_accepts_every_input_kind():
+    points = random_points(200, seed=1)
+    hands = random_hands(200, seed=1)
+    for hand, pts in zip(hands, points):
+        expected = legacy_is_fist(hand.landmark)
+        assert is_fist(hand) == expected
+        assert is_fist(hand.landmark) == expected
+        assert is_fist(pts) == expected
+        assert is_fist(pts.reshape(63)) == expected
+
+
+def test_is_fist_on_zero_arrays():
+    assert is_fist(np.zeros((21, 3))) == is_fist(np.zeros(63))
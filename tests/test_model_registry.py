@@ -0,0 +1,125 @@
+import os
+import pickle
+import time
+
+import numpy as np
+from sklearn.dummy import DummyClassifier
+
+from model_registry import ModelRegistry, load_model_file
+
+N_FEATURES = 63
+
+
+def dummy(label):
+    X = np.zeros((2, N_FEATURES), dtype=np.float32)
+    return DummyClassifier(strategy="constant", constant=label).fit(X, [label, "other"])
+
+
+def save(path, model):
+    with open(path, "wb") as f:
+        pickle.dump(model, f)
+    return str(path)
+
+
+def label_of(model):
+    return model.predict(np.zeros((1, N_FEATURES), dtype=np.float32))[0]
+
+
+def wait_for(registry, condition, timeout=5.0):
+    """Poll like a frame loop until ``condition()`` holds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        registry.poll()
+        if condition():
+            return True
+        time.sleep(0.005)
+    return False
+
+
+class CountingLoader:
+    def __init__(self):
+        self.paths = []
+
+    def __call__(self, path):
+        self.paths.append(os.path.basename(path))
+        return load_model_file(path)
+
+
+def registry_for(path, **kwargs):
+    loader = CountingLoader()
+    registry = ModelRegistry(load_model_file(path), path, N_FEATURES, load=loader,
+                             interval=0.02, **kwargs)
+    return registry.watch(path), loader
+
+
+def test_use_swaps_models_and_reuses_the_cache(tmp_path):
+    a = save(tmp_path / "a.pkl", dummy("a"))
+    b = save(tmp_path / "b.pkl", dummy("b"))
+    registry, loader = registry_for(a)
+    try:
+        registry.use(b)
+        assert wait_for(registry, lambda: label_of(registry.model) == "b")
+        registry.use(a)
+        assert wait_for(registry, lambda: label_of(registry.model) == "a")
+        registry.use(b)
+        assert wait_for(registry, lambda: label_of(registry.model) == "b")
+    finally:
+        registry.close()
+    assert loader.paths == ["b.pkl"]  # "a" was cached by watch(), "b" on its first load
+    assert registry.stats()["swaps"] == 3
+
+
+def test_broken_files_are_rejected_and_the_model_stays(tmp_path):
+    path = save(tmp_path / "model.pkl", dummy("a"))
+    registry, _ = registry_for(path)
+    try:
+        blob = pickle.dumps(dummy("b"))
+        with open(path, "wb") as f:
+            f.write(blob[:len(blob) // 2])  # truncated
+        assert wait_for(registry, lambda: registry.stats()["rejected"] == 1)
+        with open(path, "wb") as f:
+            f.write(b"not a model at all")
+        assert wait_for(registry, lambda: registry.stats()["rejected"] == 2)
+        registry.poll()
+        assert label_of(registry.model) == "a"
+        assert registry.stats()["swaps"] == 0
+    finally:
+        registry.close()
+
+
+def test_failed_check_keeps_the_current_model(tmp_path):
+    path = save(tmp_path / "model.pkl", dummy("a"))
+    registry, _ = registry_for(path, check=lambda m: None if label_of(m) == "a" else "wrong label")
+    try:
+        save(path, dummy("b"))
+        assert wait_for(registry, lambda: registry.stats()["rejected"] == 1)
+        assert label_of(registry.model) == "a"
+    finally:
+        registry.close()
+
+
+def test_rewritten_file_is_picked_up_after_it_settles(tmp_path):
+    path = save(tmp_path / "model.pkl", dummy("a"))
+    registry, loader = registry_for(path)
+    try:
+        save(path, dummy("b"))
+        assert wait_for(registry, lambda: label_of(registry.model) == "b")
+        assert registry.source == path
+        assert loader.paths == ["model.pkl"]
+    finally:
+        registry.close()
+
+
+def test_rollback_restores_the_previous_model(tmp_path):
+    a = save(tmp_path / "a.pkl", dummy("a"))
+    b = save(tmp_path / "b.pkl", dummy("b"))
+    registry, _ = registry_for(a)
+    try:
+        registry.use(b)
+        assert wait_for(registry, lambda: label_of(registry.model) == "b")
+        registry.rollback()
+        assert registry.poll()
+        assert label_of(registry.model) == "a"
+        assert registry.source == a
+    finally:
+        registry.close()
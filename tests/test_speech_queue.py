@@ -0,0 +1,75 @@
+import time
+
+from speech_queue import SpeechQueue
+
+
+class StubEngine:
+    """pyttsx3 stand-in: records what was said, takes ``delay`` seconds per utterance."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.said = []
+
+    def say(self, text):
+        self.said.append(text)
+
+    def runAndWait(self):
+        time.sleep(self.delay)
+
+
+def started(delay=0.05, **kwargs):
+    stub = StubEngine(delay)
+    speech = SpeechQueue(engine_factory=lambda: stub, **kwargs)
+    assert speech.wait_ready(5)
+    return stub, speech
+
+
+def wait_for_speaking(stub):
+    while not stub.said:
+        time.sleep(0.001)
+
+
+def test_say_never_blocks_and_coalesces_repeats():
+    stub, speech = started()
+    start = time.perf_counter()
+    for _ in range(20):
+        speech.say("hello")
+    assert time.perf_counter() - start < 0.05
+    speech.close()
+    assert stub.said == ["hello"]
+    assert speech.coalesced == 19
+
+
+def test_urgent_discards_pending_and_goes_first():
+    stub, speech = started(max_age=1.0)
+    speech.say("hello")
+    wait_for_speaking(stub)
+    speech.say("ok")
+    speech.say("stop")
+    speech.say("Final word is CAT", urgent=True)
+    speech.close()
+    assert stub.said == ["hello", "Final word is CAT"]
+    assert speech.dropped == 2
+
+
+def test_stale_and_excess_utterances_are_dropped():
+    stub, speech = started(delay=0.2, max_age=0.1, max_pending=2)
+    speech.say("hello")
+    wait_for_speaking(stub)
+    for text in ("a", "b", "c"):
+        speech.say(text)
+    speech.close()
+    # "a" is pushed out by max_pending, "b" and "c" are too old once "hello" ends
+    assert stub.said == ["hello"]
+    assert speech.dropped == 3
+
+
+def test_engine_failure_disables_speech():
+    def broken():
+        raise RuntimeError("no audio device")
+
+    speech = SpeechQueue(engine_factory=broken)
+    assert speech.wait_ready(5)
+    speech.close()
+    assert isinstance(speech.error, RuntimeError)
+    assert not speech.say("hello")
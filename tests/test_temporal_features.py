@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from landmark_features import NUM_FEATURES
+from temporal_features import HandWindows, WindowFeatures, window_features
+
+
+def stream(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.random((n, NUM_FEATURES)), np.cumsum(rng.uniform(0.02, 0.05, n))
+
+
+def test_incremental_features_match_full_recomputation():
+    frames, times = stream(500)
+    win = WindowFeatures(window=15, refresh_every=97)
+    for i in range(len(frames)):
+        win.push(frames[i], times[i])
+        lo = max(0, i - 14)
+        assert win.ready == (i >= 14)
+        np.testing.assert_allclose(win.features(), window_features(frames[lo:i + 1], times[lo:i + 1]),
+                                   rtol=1e-4, atol=1e-5)
+
+
+def test_reset_starts_a_new_window():
+    frames, times = stream(40)
+    win = WindowFeatures(window=10)
+    for i in range(25):
+        win.push(frames[i], times[i])
+    win.reset()
+    assert not win.ready
+    for i in range(25, 40):
+        win.push(frames[i], times[i])
+    np.testing.assert_allclose(win.features(), window_features(frames[30:40], times[30:40]),
+                               rtol=1e-4, atol=1e-5)
+
+
+def test_window_needs_two_frames():
+    with pytest.raises(ValueError):
+        WindowFeatures(window=1)
+
+
+def test_hand_windows_follow_sides_not_detection_order():
+    left, times = stream(20, seed=1)
+    right, _ = stream(20, seed=2)
+    hands = HandWindows(window=5)
+    for i in range(20):
+        # MediaPipe reports the hands in a different order on odd frames
+        if i % 2:
+            out, ready = hands.update(np.stack([right[i], left[i]]), times[i], ["Right", "Left"])
+            got_left, got_right = out[1], out[0]
+        else:
+            out, ready = hands.update(np.stack([left[i], right[i]]), times[i], ["Left", "Right"])
+            got_left, got_right = out[0], out[1]
+        assert ready.tolist() == [i >= 4, i >= 4]
+    lo = 20 - 5
+    np.testing.assert_allclose(got_left, window_features(left[lo:], times[lo:]), rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(got_right, window_features(right[lo:], times[lo:]), rtol=1e-4, atol=1e-5)
+
+
+def test_hand_windows_reset_when_a_hand_leaves():
+    frames, times = stream(12)
+    hands = HandWindows(window=5)
+    for i in range(6):
+        hands.update(np.stack([frames[i], frames[i]]), times[i])
+    hands.update(frames[6:7], times[6])  # one hand left: windows follow detection order again
+    _, ready = hands.update(frames[7:8], times[7])
+    assert ready.tolist() == [False]
@@ -1,20 +1,100 @@
-import pandas as pd
+import argparse
+import hashlib
+import os
+import shutil
 from sklearn.ensemble import RandomForestClassifier
 import pickle
+from feature_store import FeatureStore, FeatureStoreWriter, convert_csv, load_dataset
+from augmentation import add_augment_args, augment_store, create_augmenter
+from incremental_training import grow_forest, save_version, timed
 
-# Load collected gesture data
-df = pd.read_csv('gesture_data.csv')
+parser = argparse.ArgumentParser(description="Train the gesture classifier")
+parser.add_argument("--data", help="feature store or CSV "
+                                   "(default gesture_data.svds if present, else gesture_data.csv)")
+parser.add_argument("--incremental", metavar="NEW_DATA",
+                    help="append these samples (store or CSV) to the dataset and grow the "
+                         "current gesture_classifier.pkl instead of retraining from scratch. Fine for "
+                         "known gestures; a new gesture similar to a known one is recognized far "
+                         "less reliably than after a full retrain (benchmarks/bench_incremental.py)")
+parser.add_argument("--add-trees", type=int, default=20,
+                    help="trees added per incremental update (default 20)")
+parser.add_argument("--augment", type=int, default=0, metavar="COPIES",
+                    help="also train on COPIES randomly transformed variants of every sample, "
+                         "streamed to <data>.aug.svds (rebuilt on every run)")
+add_augment_args(parser)
+args = parser.parse_args()
+if args.augment and args.incremental:
+    parser.error("--augment applies to full training only")
+data_path = args.data or ("gesture_data.svds" if os.path.isdir("gesture_data.svds")
+                          else "gesture_data.csv")
 
-# Split into features and labels
-X = df.drop('label', axis=1)
-y = df['label']
+if args.incremental:
+    # Incremental updates need the append-only store; convert the CSV once
+    if not os.path.isdir(data_path):
+        store_path = os.path.splitext(data_path)[0] + ".svds"
+        if not os.path.isdir(store_path):
+            print(f"📦 Converting {data_path} to {store_path}")
+            convert_csv(data_path, store_path)
+        data_path = store_path
 
-# Train model
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X, y)
+    # Keep the digest of the exact bytes loaded so the new version's parent is this model
+    with open("gesture_classifier.pkl", "rb") as f:
+        blob = f.read()
+    model = pickle.loads(blob)
+    parent = {"file": "gesture_classifier.pkl", "sha1": hashlib.sha1(blob).hexdigest()}
+    if not isinstance(model, RandomForestClassifier):
+        print("❌ Incremental training needs a RandomForestClassifier in gesture_classifier.pkl")
+        exit()
 
-# Save model
-with open("gesture_classifier.pkl", "wb") as f:
-    pickle.dump(model, f)
+    X_new, y_new = load_dataset(args.incremental)
+    unseen = sorted(set(map(str, y_new)) - set(map(str, model.classes_)))
+    if unseen:
+        print(f"⚠️ New gestures {unseen} are learned mostly by the {args.add_trees} added trees; "
+              f"use more --add-trees or a full retrain if they are missed")
+    old = FeatureStore(data_path)
+    rows_before = len(old)
+
+    # Grow the model with the new samples, then append them to the dataset
+    model, seconds = timed(grow_forest, model, old.features, old.labels, X_new, y_new,
+                           n_trees=args.add_trees)
+    with FeatureStoreWriter(data_path) as writer:
+        writer.append_batch(X_new, y_new)
+        rows_after = writer.total_rows
+
+    entry = save_version(model, {"mode": "incremental", "data": data_path,
+                                 "rows": [0, rows_after], "new_rows": [rows_before, rows_after],
+                                 "new_data": args.incremental, "seconds": round(seconds, 3)},
+                         parent=parent)
+    print(f"✅ Added {len(y_new)} samples and {args.add_trees} trees in {seconds:.2f}s "
+          f"→ v{entry['version']} ({entry['n_estimators']} trees)")
+else:
+    # Load collected gesture data (memory-mapped for feature stores)
+    X, y = load_dataset(data_path)
+    print(f"📂 Loaded {len(y)} samples from {data_path}")
+    info = {"mode": "full", "data": data_path, "rows": [0, len(y)]}
+
+    if args.augment:
+        # Augmented chunks go straight to disk; the forest reads them memory-mapped
+        aug_path = os.path.splitext(data_path)[0] + ".aug.svds"
+        if os.path.isdir(aug_path):
+            shutil.rmtree(aug_path)
+        rows, seconds = augment_store(X, y, aug_path, args.augment,
+                                      create_augmenter(args, seed=42), args.chunk_rows)
+        print(f"🔀 {rows} samples ({args.augment} augmented copies each) in {aug_path}, "
+              f"{rows / seconds:,.0f} samples/s")
+        X, y = load_dataset(aug_path)
+        info.update({"augmented": aug_path, "copies": args.augment, "rows": [0, len(y)]})
+
+    # Train model
+    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    _, seconds = timed(model.fit, X, y)
+
+    entry = save_version(model, dict(info, seconds=round(seconds, 3)))
+    print(f"📝 Recorded as models/{entry['file']}")
+
+# Save model (save_version copies the new version to gesture_classifier.pkl)
+if os.path.exists("gesture_classifier.npz"):
+    from forest_compiler import compile_forest
+    compile_forest(model).save("gesture_classifier.npz")
 
 print("✅ Gesture model trained and saved as gesture_classifier.pkl")
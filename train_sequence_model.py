@@ -0,0 +1,29 @@
+import argparse
+import pickle
+from sklearn.ensemble import RandomForestClassifier
+from feature_store import load_dataset
+from forest_compiler import compile_forest
+from temporal_features import WINDOW_FEATURES
+
+parser = argparse.ArgumentParser(description="Train the moving-gesture (window) classifier")
+parser.add_argument("--data", default="sequence_data.svds",
+                    help="window samples from collect_sequence_data.py (default sequence_data.svds)")
+args = parser.parse_args()
+
+# Load window samples (memory-mapped for feature stores)
+X, y = load_dataset(args.data)
+if X.shape[1] != WINDOW_FEATURES:
+    print(f"❌ {args.data} has {X.shape[1]} features per row, expected {WINDOW_FEATURES}")
+    exit()
+print(f"📂 Loaded {len(y)} windows from {args.data}")
+
+# Train model
+model = RandomForestClassifier(n_estimators=100, random_state=42)
+model.fit(X, y)
+
+# Save model, plus the flat-array export sign_to_speech.py runs per frame
+with open("gesture_sequence_classifier.pkl", "wb") as f:
+    pickle.dump(model, f)
+compile_forest(model).save("gesture_sequence_classifier.npz")
+
+print("✅ Sequence model trained and saved as gesture_sequence_classifier.pkl")